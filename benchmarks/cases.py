@@ -0,0 +1,200 @@
+# BEGIN OF LICENSE NOTE
+# This file is part of Pyoints.
+# Copyright (c) 2018, Sebastian Lamprecht, Trier University,
+# lamprecht@uni-trier.de
+#
+# Pyoints is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyoints is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pyoints. If not, see <https://www.gnu.org/licenses/>.
+# END OF LICENSE NOTE
+"""Benchmark cases covering the performance critical parts of Pyoints.
+
+Each case is a function registered by the `benchmark` decorator. It receives
+a synthetic point cloud and returns a callable performing the operation to
+measure. Preparations done by the case function itself are not measured.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from pyoints import (
+    IndexKD,
+    filters,
+    grid,
+    normals,
+    registration,
+    storage,
+    transformation,
+)
+from pyoints.storage.misc import create_random_GeoRecords
+
+
+BENCHMARKS = OrderedDict()
+
+# number of points used for query based benchmarks
+QUERY_SIZE = 10000
+
+
+def benchmark(name):
+    """Registers a benchmark case.
+
+    Parameters
+    ----------
+    name : str
+        Unique name of the benchmark case.
+
+    """
+    def decorator(func):
+        if name in BENCHMARKS:
+            raise ValueError("benchmark '%s' already registered" % name)
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def create_cloud(n, seed=0):
+    """Creates a reproducible random point cloud of `n` points.
+
+    The extent grows with `n`, so the point density is about one point per
+    unit cube for each size. Thus, radius based operations touch a constant
+    number of neighbours per point.
+
+    Parameters
+    ----------
+    n : positive int
+        Number of points.
+    seed : optional, int
+        Seed of the random number generator.
+
+    Returns
+    -------
+    GeoRecords
+        Random point cloud.
+
+    """
+    scale = n ** (1.0 / 3)
+    return create_random_GeoRecords(n=n, scale=scale, seed=seed)
+
+
+def _tempfile(filename):
+    # Path of a temporary file, which is removed on exit.
+    outdir = tempfile.mkdtemp(prefix='pyoints_benchmark_')
+    atexit.register(shutil.rmtree, outdir, True)
+    return os.path.join(outdir, filename)
+
+
+def _query_ids(n, seed=0):
+    # Random subset of point indices used for queries.
+    rng = np.random.RandomState(seed)
+    return rng.choice(n, min(n, QUERY_SIZE), replace=False)
+
+
+@benchmark('IndexKD.build')
+def indexkd_build(geoRecords):
+    coords = geoRecords.coords
+
+    def run():
+        return IndexKD(coords).kd_tree
+    return run
+
+
+@benchmark('IndexKD.ball')
+def indexkd_ball(geoRecords):
+    indexKD = geoRecords.indexKD()
+    indexKD.kd_tree
+    query = indexKD.coords[_query_ids(len(indexKD)), :]
+
+    def run():
+        return indexKD.ball(query, 2)
+    return run
+
+
+@benchmark('IndexKD.knn')
+def indexkd_knn(geoRecords):
+    indexKD = geoRecords.indexKD()
+    indexKD.kd_tree
+    query = indexKD.coords[_query_ids(len(indexKD)), :]
+
+    def run():
+        return indexKD.knn(query, k=10)
+    return run
+
+
+@benchmark('filters.ball')
+def filters_ball(geoRecords):
+    indexKD = geoRecords.indexKD()
+    indexKD.kd_tree
+
+    def run():
+        return list(filters.ball(indexKD, 1.5))
+    return run
+
+
+@benchmark('normals.fit_normals')
+def normals_fit_normals(geoRecords):
+    coords = geoRecords.coords
+    indices = _query_ids(len(coords))
+
+    def run():
+        return normals.fit_normals(coords, k=10, indices=indices)
+    return run
+
+
+@benchmark('grid.voxelize')
+def grid_voxelize(geoRecords):
+    T = transformation.matrix(
+        t=geoRecords.extent().min_corner, s=[5, 5, 5])
+
+    def run():
+        return grid.voxelize(geoRecords, T, agg_func=len, dtype=int)
+    return run
+
+
+@benchmark('storage.writeLas')
+def storage_write_las(geoRecords):
+    outfile = _tempfile('benchmark.las')
+
+    def run():
+        return storage.writeLas(geoRecords, outfile)
+    return run
+
+
+@benchmark('storage.LasReader.load')
+def storage_las_load(geoRecords):
+    infile = _tempfile('benchmark.las')
+    storage.writeLas(geoRecords, infile)
+    reader = storage.LasReader(infile, proj=geoRecords.proj)
+
+    def run():
+        return reader.load()
+    return run
+
+
+@benchmark('registration.ICP')
+def registration_icp(geoRecords):
+    coords = geoRecords.coords
+    n = len(coords)
+    T = transformation.matrix(t=[0.3, -0.2, 0.1], r=[0, 0, 0.01])
+    coords_dict = {
+        'A': coords[:n // 2 + n // 4, :],
+        'B': T.to_local(coords[n // 4:, :]),
+    }
+    icp = registration.ICP([1.5, 1.5, 1.5], max_iter=10, k=1)
+
+    def run():
+        return icp(coords_dict)
+    return run
@@ -0,0 +1,288 @@
+# BEGIN OF LICENSE NOTE
+# This file is part of Pyoints.
+# Copyright (c) 2018, Sebastian Lamprecht, Trier University,
+# lamprecht@uni-trier.de
+#
+# Pyoints is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyoints is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pyoints. If not, see <https://www.gnu.org/licenses/>.
+# END OF LICENSE NOTE
+"""Run the benchmarks of Pyoints.
+
+Measures the run time and the peak memory of each benchmark case for point
+clouds of different sizes. The results can be saved as a baseline and
+compared with a previous baseline.
+
+Examples
+--------
+
+Run all benchmarks and save the results as a baseline.
+
+    python3 benchmarks/run.py --sizes 1e4 1e5 1e6 --save baseline.json
+
+Compare the current state with the baseline.
+
+    python3 benchmarks/run.py --sizes 1e4 1e5 1e6 --compare baseline.json
+
+Run selected benchmarks only.
+
+    python3 benchmarks/run.py --filter IndexKD filters.ball --sizes 1e7
+
+Notes
+-----
+The peak memory is measured with `tracemalloc` in a separate run, so the
+tracing overhead does not affect the timings. Only allocations done by Python
+and numpy are traced. Memory allocated by compiled extensions directly, like
+the nodes of a `cKDTree`, is not included.
+
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import scipy
+
+import pyoints
+
+from cases import BENCHMARKS, create_cloud
+
+
+def measure(func, repeat=3):
+    """Measures the run time and the peak memory of a function.
+
+    Parameters
+    ----------
+    func : callable
+        Function to measure.
+    repeat : optional, positive int
+        Number of timed runs.
+
+    Returns
+    -------
+    times : list of float
+        Run times in seconds.
+    peak_memory : int
+        Peak of traced memory in bytes.
+
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return times, peak_memory
+
+
+def run_benchmarks(sizes, names, repeat=3, seed=0):
+    """Runs the benchmark cases for each point cloud size.
+
+    Parameters
+    ----------
+    sizes : list of positive int
+        Numbers of points of the synthetic point clouds.
+    names : list of str
+        Names of the benchmark cases to run.
+    repeat : optional, positive int
+        Number of timed runs per benchmark case.
+    seed : optional, int
+        Seed used to create the point clouds.
+
+    Returns
+    -------
+    list of dict
+        Result of each benchmark case and size.
+
+    """
+    results = []
+    for n in sizes:
+        geoRecords = create_cloud(n, seed=seed)
+        for name in names:
+            func = BENCHMARKS[name](geoRecords)
+            times, peak_memory = measure(func, repeat=repeat)
+            result = {
+                'name': name,
+                'size': n,
+                'time': min(times),
+                'times': times,
+                'peak_memory': peak_memory,
+            }
+            results.append(result)
+            print_result(result)
+            sys.stdout.flush()
+        del geoRecords
+    return results
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Compares results with a baseline.
+
+    Parameters
+    ----------
+    results, baseline : list of dict
+        Benchmark results to compare.
+    tolerance : optional, Number
+        Relative increase of run time or peak memory tolerated.
+
+    Returns
+    -------
+    list of tuple
+        Regressions as tuples `(name, size, metric, ratio)`.
+
+    """
+    lookup = {(r['name'], r['size']): r for r in baseline}
+    regressions = []
+
+    print('')
+    print('%-28s %12s %10s %10s' % ('benchmark', 'size', 'time', 'memory'))
+    for result in results:
+        key = (result['name'], result['size'])
+        if key not in lookup:
+            continue
+        ratios = []
+        for metric in ('time', 'peak_memory'):
+            base = lookup[key][metric]
+            ratio = result[metric] / base if base > 0 else 1.0
+            ratios.append(ratio)
+            if ratio > 1 + tolerance:
+                regressions.append(key + (metric, ratio))
+        print('%-28s %12i %9.2fx %9.2fx' % (key + tuple(ratios)))
+
+    return regressions
+
+
+def print_result(result):
+    print('%-28s %12i %10.4f s %10.1f MiB' % (
+        result['name'],
+        result['size'],
+        result['time'],
+        result['peak_memory'] / 2.0**20
+    ))
+
+
+def environment():
+    # Information on the environment the benchmarks were run in.
+    return {
+        'date': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'pyoints': pyoints.__version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '--sizes',
+        nargs='+',
+        type=float,
+        default=[1e4, 1e5],
+        help='numbers of points of the synthetic point clouds'
+    )
+    parser.add_argument(
+        '--filter',
+        nargs='+',
+        default=None,
+        help='run benchmarks with names starting with one of these prefixes'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='number of timed runs per benchmark'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='seed used to create the point clouds'
+    )
+    parser.add_argument(
+        '--save',
+        default=None,
+        help='JSON file to save the results to'
+    )
+    parser.add_argument(
+        '--compare',
+        default=None,
+        help='JSON file of a baseline to compare the results with'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.2,
+        help='relative increase tolerated when comparing with the baseline'
+    )
+    parser.add_argument(
+        '--list',
+        action='store_true',
+        help='list the available benchmarks'
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+
+    names = list(BENCHMARKS.keys())
+    if args.filter is not None:
+        names = [n for n in names if n.startswith(tuple(args.filter))]
+    sizes = [int(n) for n in args.sizes]
+    if args.repeat < 1:
+        parser.error("'--repeat' needs to be a positive integer")
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+
+    results = run_benchmarks(sizes, names, repeat=args.repeat, seed=args.seed)
+
+    if args.save is not None:
+        with open(args.save, 'w') as f:
+            json.dump(
+                {'environment': environment(), 'results': results},
+                f,
+                indent=2
+            )
+
+    if baseline is not None:
+        regressions = compare(
+            results, baseline['results'], tolerance=args.tolerance)
+        if len(regressions) > 0:
+            print('')
+            for name, size, metric, ratio in regressions:
+                print('regression: %s (%i points) %s %.2fx' % (
+                    name, size, metric, ratio))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -28,16 +28,19 @@ from .surface import Surface
 from .georecords import (
     GeoRecords,
     LasRecords,
+    ColumnarGeoRecords,
 )
 from . import (
     assertion,
     assign,
+    change,
     classification,
     clustering,
     coords,
     distance,
     examples,
     extent,
+    features,
     filters,
     georecords,
     grid,
@@ -46,8 +49,11 @@ from . import (
     misc,
     normals,
     nptools,
+    octree,
     polar,
+    profiling,
     projection,
+    ransac,
     registration,
     smoothing,
     storage,
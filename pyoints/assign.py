@@ -221,15 +221,15 @@ class KnnMatcher(Matcher):
         mIndexKD = IndexKD(coords, self.rIndexKD.t)
         rIndexKD = self.rIndexKD
 
-        pairs = []
         mCoords = mIndexKD.coords
-        ball_gen = rIndexKD.knn_iter(mCoords, k, distance_upper_bound=1)
-        for mId, (dists, rIds) in enumerate(ball_gen):
-            if k == 1:
-                dists = [dists]
-                rIds = [rIds]
-            for dist, rId in zip(dists, rIds):
-                if dist <= 1:
-                    pairs.append((rId, mId))
+        if len(mCoords) == 0:
+            return np.zeros((0, 2), dtype=int)
 
-        return np.array(pairs, dtype=int)
+        # query all points at once, so the GIL is released while searching
+        dists, rIds = rIndexKD.knn(mCoords, k=k, distance_upper_bound=1)
+        dists = dists.reshape((len(mCoords), k))
+        rIds = rIds.reshape((len(mCoords), k))
+        mIds = np.repeat(np.arange(len(mCoords))[:, None], k, axis=1)
+
+        mask = dists <= 1
+        return np.vstack((rIds[mask], mIds[mask])).T.astype(int)
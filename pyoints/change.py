@@ -0,0 +1,573 @@
+# BEGIN OF LICENSE NOTE
+# This file is part of Pyoints.
+# Copyright (c) 2018, Sebastian Lamprecht, Trier University,
+# lamprecht@uni-trier.de
+#
+# Pyoints is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyoints is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pyoints. If not, see <https://www.gnu.org/licenses/>.
+# END OF LICENSE NOTE
+"""Detection of changes between point clouds of different epochs.
+"""
+
+import os
+import numpy as np
+from numbers import Number
+from concurrent.futures import ThreadPoolExecutor
+
+from . import (
+    assertion,
+    profiling,
+)
+from .extent import Extent
+from .georecords import GeoRecords
+from .indexkd import IndexKD
+from .normals import (
+    _ball_segments,
+    _segment_covariances,
+)
+from .misc import print_rounded
+
+
+@profiling.profile('change.c2c', points='compared')
+def c2c(
+        reference,
+        compared,
+        method='nearest',
+        k=6,
+        max_dist=np.inf,
+        tile_size=None,
+        bulk=100000,
+        n_jobs=1):
+    """Calculates cloud to cloud distances.
+
+    Parameters
+    ----------
+    reference : array_like(Number, shape=(n, k))
+        Represents `n` points of the reference epoch.
+    compared : array_like(Number, shape=(m, k))
+        Represents `m` points of the compared epoch.
+    method : optional, str
+        Either 'nearest' to calculate the distances to the nearest reference
+        points or 'plane' to calculate the distances to planes fitted to the
+        `k` nearest reference points.
+    k : optional, positive int
+        Number of reference points to fit a plane to.
+    max_dist : optional, positive Number
+        Maximum distance of reference points to consider.
+    tile_size : optional, positive Number
+        If provided, the points are processed in tiles of this size in the
+        first two coordinate dimensions. Each tile uses a spatial index of the
+        reference points within the tile and a margin of `max_dist`, so
+        `max_dist` needs to be finite.
+    bulk : optional, positive int
+        Number of points processed at once.
+    n_jobs : optional, int
+        Number of threads processing chunks or tiles in parallel. If -1, all
+        processors are used.
+
+    Returns
+    -------
+    np.ndarray(Number, shape=(m))
+        Distances of the compared points to the reference points. Set to
+        `np.nan`, if no reference point is within `max_dist`.
+
+    Notes
+    -----
+    If there are fewer reference points within `max_dist` than coordinate
+    dimensions, no plane is fitted and the distance to the nearest reference
+    point is used instead.
+
+    See Also
+    --------
+    m3c2, add_c2c
+
+    Examples
+    --------
+
+    Create two epochs of a surface, which has partly been lifted.
+
+    >>> x, y = np.meshgrid(np.arange(0, 10, 0.5), np.arange(0, 10, 0.5))
+    >>> x = x.ravel()
+    >>> y = y.ravel()
+    >>> reference = np.vstack((x, y, np.zeros(len(x)))).T
+    >>> compared = np.vstack((x + 0.25, y, np.where(x < 5, 0, 0.1))).T
+
+    Distances to the nearest points.
+
+    >>> dists = c2c(reference, compared)
+    >>> print_rounded(dists[[0, 19]], 2)
+    [ 0.25  0.27]
+
+    Distances to local planes.
+
+    >>> dists = c2c(reference, compared, method='plane', k=6)
+    >>> print_rounded(dists[[0, 19]], 2)
+    [ 0.   0.1]
+
+    Limit the distance and process the points in tiles.
+
+    >>> dists = c2c(reference, compared - [5, 0, 0], max_dist=1, tile_size=3)
+    >>> print_rounded(dists[[0, 19]], 2)
+    [  nan  0.27]
+
+    """
+    reference = assertion.ensure_coords(reference)
+    compared = assertion.ensure_coords(compared, dim=reference.shape[1])
+    if method not in ('nearest', 'plane'):
+        raise ValueError("'method' needs to be either 'nearest' or 'plane'")
+    if not (isinstance(k, int) and k > 0):
+        raise ValueError("'k' needs to be an integer greater zero")
+    if not (isinstance(max_dist, Number) and max_dist > 0):
+        raise ValueError("'max_dist' needs to be a number greater zero")
+
+    dists = np.full(len(compared), np.nan)
+
+    def process(ids, indexKD):
+        if indexKD is None:
+            return
+        if method == 'nearest':
+            d = indexKD.kd_tree.query(
+                compared[ids, :], k=1, distance_upper_bound=max_dist)[0]
+        else:
+            d = _plane_distances(indexKD, compared[ids, :], k, max_dist)
+        d[~np.isfinite(d)] = np.nan
+        dists[ids] = d
+
+    _run(process, compared, reference, max_dist, tile_size, bulk, n_jobs)
+    return dists
+
+
+@profiling.profile('change.m3c2', points=len)
+def m3c2(
+        reference,
+        compared,
+        d,
+        max_depth,
+        core_points=None,
+        normals=None,
+        normal_r=None,
+        preferred=(0, 0, 1),
+        registration_error=0.0,
+        tile_size=None,
+        bulk=100000,
+        n_jobs=1):
+    """Calculates distances between point clouds along local normals
+    similar to the M3C2 algorithm [1].
+
+    Parameters
+    ----------
+    reference : array_like(Number, shape=(n, 3))
+        Represents `n` points of the reference epoch.
+    compared : array_like(Number, shape=(m, 3))
+        Represents `m` points of the compared epoch.
+    d : positive Number
+        Diameter of the projection cylinders.
+    max_depth : positive Number
+        Maximum distance of points to the core points along the normals,
+        i.e. half of the height of the projection cylinders.
+    core_points : optional, array_like(Number, shape=(c, 3))
+        Points to calculate the distances at. If None, `reference` is used.
+    normals : optional, array_like(Number, shape=(c, 3))
+        Normals of the core points. If None, the normals are fitted to the
+        reference points within radius `normal_r`.
+    normal_r : optional, positive Number
+        Radius to fit the normals. Defaults to `d`.
+    preferred : optional, array_like(Number, shape=(3))
+        Preferred orientation of the fitted normals.
+    registration_error : optional, Number
+        Registration error of the epochs. It is added to the standard error
+        of the distance before scaling to the 95 % confidence level, i.e.
+        `lod = 1.96 * (sqrt(s1**2 / n1 + s2**2 / n2) + registration_error)`
+        [1].
+    tile_size, bulk, n_jobs : optional
+        See `c2c`.
+
+    Returns
+    -------
+    np.recarray(shape=(c, ))
+        Record array with the fields 'distance' (signed distance along the
+        normal), 'lod' (level of detection at 95 % confidence),
+        'significant', 'normal', 'num_reference', 'num_compared',
+        'std_reference' and 'std_compared'.
+
+    Notes
+    -----
+    The distance of a core point is the difference of the mean positions of
+    the compared and the reference points within the projection cylinder.
+    It is set to `np.nan`, if a cylinder is empty in an epoch. The level of
+    detection requires at least two points per epoch.
+
+    References
+    ----------
+
+    [1] D. Lague, N. Brodu, J. Leroux (2013): Accurate 3D comparison of
+    complex topography with terrestrial laser scanner: Application to the
+    Rangitikei canyon (N-Z). ISPRS Journal of Photogrammetry and Remote
+    Sensing, 82, pp. 10-26.
+
+    See Also
+    --------
+    c2c, add_m3c2
+
+    Examples
+    --------
+
+    Create two noisy epochs of a surface, which has partly been lifted.
+
+    >>> rs = np.random.RandomState(0)
+    >>> x, y = rs.rand(2, 4000) * 10
+    >>> reference = np.vstack((x, y, rs.randn(4000) * 0.01)).T
+    >>> x, y = rs.rand(2, 4000) * 10
+    >>> z = np.where(x < 5, 0, 0.1) + rs.randn(4000) * 0.01
+    >>> compared = np.vstack((x, y, z)).T
+
+    Calculate the distances at some core points.
+
+    >>> core_points = [(2, 5, 0), (8, 5, 0), (5, 20, 0)]
+    >>> rec = m3c2(reference, compared, 1, 1, core_points=core_points)
+    >>> print_rounded(rec.normal, 2)
+    [[ 0.  0.  1.]
+     [ 0.  0.  1.]
+     [ 0.  0.  0.]]
+    >>> print_rounded(rec.distance, 2)
+    [ 0.   0.1  nan]
+    >>> print(rec.lod < 0.01)
+    [ True  True False]
+    >>> print(rec.significant)
+    [False  True False]
+    >>> print(rec.num_reference > 20)
+    [ True  True False]
+
+    Consider a registration error.
+
+    >>> rec = m3c2(reference, compared, 1, 1, core_points=core_points,
+    ...            registration_error=0.05)
+    >>> print_rounded(rec.lod, 2)
+    [ 0.1  0.1  nan]
+    >>> print(rec.significant)
+    [False False False]
+
+    Tiled processing provides the same results.
+
+    >>> rec = m3c2(reference, compared, 1, 1)
+    >>> tiled_rec = m3c2(reference, compared, 1, 1, tile_size=2)
+    >>> print(np.array_equal(rec.significant, tiled_rec.significant))
+    True
+    >>> print(np.allclose(rec.distance, tiled_rec.distance, equal_nan=True))
+    True
+    >>> print_rounded(np.mean(rec.distance[reference[:, 0] > 5.5]), 2)
+    0.1
+
+    """
+    reference = assertion.ensure_coords(reference, dim=3)
+    compared = assertion.ensure_coords(compared, dim=3)
+    if core_points is None:
+        core_points = reference
+    core_points = assertion.ensure_coords(core_points, dim=3)
+    if not (isinstance(d, Number) and d > 0):
+        raise ValueError("'d' needs to be a number greater zero")
+    if not (isinstance(max_depth, Number) and max_depth > 0):
+        raise ValueError("'max_depth' needs to be a number greater zero")
+    if normal_r is None:
+        normal_r = d
+    if not (isinstance(normal_r, Number) and normal_r > 0):
+        raise ValueError("'normal_r' needs to be a number greater zero")
+    if normals is not None:
+        normals = assertion.ensure_coords(normals, dim=3)
+        if not len(normals) == len(core_points):
+            m = "'normals' needs to have the length of 'core_points'"
+            raise ValueError(m)
+    preferred = assertion.ensure_numvector(preferred, length=3)
+    if not assertion.isnumeric(registration_error, min_th=0):
+        m = "'registration_error' needs to be a number greater or equal zero"
+        raise ValueError(m)
+
+    dtype = [
+        ('distance', float),
+        ('lod', float),
+        ('significant', bool),
+        ('normal', float, 3),
+        ('num_reference', int),
+        ('num_compared', int),
+        ('std_reference', float),
+        ('std_compared', float),
+    ]
+    rec = np.recarray(len(core_points), dtype=dtype)
+    rec.fill((np.nan, np.nan, False, 0, 0, 0, np.nan, np.nan))
+    r = np.sqrt((0.5 * d) ** 2 + max_depth ** 2)
+    margin = max(r, normal_r)
+
+    def process(ids, indexKD_ref, indexKD_comp):
+        cp = core_points[ids, :]
+        if normals is None:
+            offsets, seg = _ball_offsets(indexKD_ref, cp, normal_r)
+            n = _fit_normals(offsets, seg, len(ids))[0]
+            n[np.dot(n, preferred) < 0] *= -1
+        else:
+            n = normals[ids, :] / np.linalg.norm(
+                normals[ids, :], axis=1)[:, None]
+        rec.normal[ids] = n
+
+        stats = []
+        for indexKD in (indexKD_ref, indexKD_comp):
+            offsets, seg = _ball_offsets(indexKD, cp, r)
+            axial = (offsets * n[seg, :]).sum(1)
+            radial = (offsets ** 2).sum(1) - axial ** 2
+            mask = (radial <= (0.5 * d) ** 2) & (np.abs(axial) <= max_depth)
+            stats.append(_axial_stats(axial[mask], seg[mask], len(ids)))
+        (n_ref, mean_ref, std_ref), (n_comp, mean_comp, std_comp) = stats
+
+        dist = mean_comp - mean_ref
+        with np.errstate(invalid='ignore', divide='ignore'):
+            lod = np.sqrt(std_ref ** 2 / n_ref + std_comp ** 2 / n_comp)
+        lod = 1.96 * (lod + registration_error)
+        missing = ~np.any(n != 0, axis=1)
+        dist[missing] = np.nan
+        lod[missing] = np.nan
+
+        rec.distance[ids] = dist
+        rec.lod[ids] = lod
+        with np.errstate(invalid='ignore'):
+            rec.significant[ids] = np.abs(dist) > lod
+        rec.num_reference[ids] = n_ref
+        rec.num_compared[ids] = n_comp
+        rec.std_reference[ids] = std_ref
+        rec.std_compared[ids] = std_comp
+
+    _run(process, core_points, [reference, compared], margin, tile_size,
+         bulk, n_jobs)
+    return rec
+
+
+def add_c2c(geoRecords, reference, field='c2c', **kwargs):
+    """Adds cloud to cloud distances to a point cloud as a field.
+
+    Parameters
+    ----------
+    geoRecords : GeoRecords
+        Points of the compared epoch.
+    reference : GeoRecords or array_like(Number, shape=(n, k))
+        Points of the reference epoch.
+    field : optional, str
+        Name of the new field.
+    \*\*kwargs : optional
+        Parameters passed to `c2c`.
+
+    Returns
+    -------
+    GeoRecords
+        Points with the additional field.
+
+    See Also
+    --------
+    c2c
+
+    Examples
+    --------
+
+    >>> from datetime import datetime
+    >>> reference = GeoRecords(
+    ...     None, {'coords': [(0, 0, 0), (1, 0, 0), (0, 1, 0)]},
+    ...     date=datetime(2018, 5, 1))
+    >>> geo = GeoRecords(
+    ...     None, {'coords': [(0, 0, 1), (1, 0, 0.5)]},
+    ...     date=datetime(2018, 9, 1))
+    >>> geo = add_c2c(geo, reference)
+    >>> print(geo.dtype.names)
+    ('coords', 'c2c')
+    >>> print_rounded(geo.c2c)
+    [ 1.   0.5]
+
+    """
+    if not isinstance(geoRecords, GeoRecords):
+        raise TypeError("'geoRecords' needs to be an instance of GeoRecords")
+    if isinstance(reference, GeoRecords):
+        reference = reference.coords
+    dists = c2c(reference, geoRecords.coords, **kwargs)
+    return geoRecords.add_fields([(field, float)], data=[dists])
+
+
+def add_m3c2(geoRecords, reference, compared, d, max_depth, prefix='m3c2_',
+             **kwargs):
+    """Adds M3C2 distances to core points as fields.
+
+    Parameters
+    ----------
+    geoRecords : GeoRecords
+        Core points to calculate the distances at.
+    reference, compared : GeoRecords or array_like(Number, shape=(n, 3))
+        Points of the reference and the compared epoch.
+    d, max_depth : positive Number
+        See `m3c2`.
+    prefix : optional, str
+        Prefix of the names of the new fields.
+    \*\*kwargs : optional
+        Parameters passed to `m3c2`.
+
+    Returns
+    -------
+    GeoRecords
+        Core points with additional fields. See `m3c2`.
+
+    See Also
+    --------
+    m3c2
+
+    Examples
+    --------
+
+    >>> x, y = np.meshgrid(np.arange(0, 5, 0.25), np.arange(0, 5, 0.25))
+    >>> reference = np.vstack((x.ravel(), y.ravel(), np.zeros(x.size))).T
+    >>> compared = reference + [0, 0, 0.2]
+    >>> geo = GeoRecords(None, {'coords': [(2, 2, 0), (3, 3, 0)]})
+
+    >>> geo = add_m3c2(geo, reference, compared, 1, 1)
+    >>> print(geo.dtype.names[:4])
+    ('coords', 'm3c2_distance', 'm3c2_lod', 'm3c2_significant')
+    >>> print_rounded(geo.m3c2_distance)
+    [ 0.2  0.2]
+
+    """
+    if not isinstance(geoRecords, GeoRecords):
+        raise TypeError("'geoRecords' needs to be an instance of GeoRecords")
+    if isinstance(reference, GeoRecords):
+        reference = reference.coords
+    if isinstance(compared, GeoRecords):
+        compared = compared.coords
+    rec = m3c2(reference, compared, d, max_depth,
+               core_points=geoRecords.coords, **kwargs)
+    dtypes = [(prefix + name, ) + dt[1:] for name, dt in
+              zip(rec.dtype.names, rec.dtype.descr)]
+    data = [rec[name] for name in rec.dtype.names]
+    return geoRecords.add_fields(dtypes, data=data)
+
+
+def _run(func, query, clouds, margin, tile_size, bulk, n_jobs):
+    # Applies `func` to chunks of query points. The spatial indices of the
+    # clouds are passed to `func`. If `tile_size` is provided, the points are
+    # processed tile by tile with spatial indices limited to each tile. The
+    # index of a cloud without points in a tile is None.
+    if isinstance(clouds, np.ndarray):
+        clouds = [clouds]
+    if not (isinstance(bulk, int) and bulk > 0):
+        raise ValueError("'bulk' needs to be an integer greater zero")
+    if not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+        raise ValueError("'n_jobs' needs to be a positive integer or -1")
+    n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+
+    if tile_size is None:
+        indices = [IndexKD(cloud, copy=False) for cloud in clouds]
+        for indexKD in indices:
+            indexKD.kd_tree
+
+        def process(i):
+            ids = np.arange(i, min(i + bulk, len(query)))
+            func(ids, *indices)
+        tasks = range(0, len(query), bulk)
+    else:
+        if not (isinstance(tile_size, Number) and tile_size > 0):
+            raise ValueError("'tile_size' needs to be a number greater zero")
+        if not np.isfinite(margin):
+            raise ValueError("tiling requires a finite search distance")
+
+        # assign the query points to tiles
+        keys = np.floor(query[:, :2] / tile_size).astype(np.int64)
+        tile_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        order = np.argsort(inverse, kind='mergesort')
+        tile_ptr = np.searchsorted(
+            inverse[order], np.arange(len(tile_keys) + 1))
+
+        # select the points of the clouds within the extended tiles
+        extents = np.hstack((
+            tile_keys * tile_size - margin,
+            (tile_keys + 1) * tile_size + margin
+        ))
+        memberships = [Extent.intersect_many(cloud[:, :2], extents)
+                       for cloud in clouds]
+
+        def process(t):
+            ids = order[tile_ptr[t]:tile_ptr[t + 1]]
+            indices = []
+            for cloud, (indptr, cIds) in zip(clouds, memberships):
+                tIds = cIds[indptr[t]:indptr[t + 1]]
+                if len(tIds) > 0:
+                    indices.append(IndexKD(cloud[tIds, :], copy=False))
+                else:
+                    indices.append(None)
+            for i in range(0, len(ids), bulk):
+                func(ids[i:i + bulk], *indices)
+        tasks = range(len(tile_keys))
+
+    if n_jobs == 1 or len(tasks) <= 1:
+        for task in tasks:
+            process(task)
+    else:
+        # the spatial queries release the GIL, so threads suffice and the
+        # coordinates are shared without copying
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(process, tasks))
+
+
+def _ball_offsets(indexKD, coords, r):
+    # Offsets of the neighbours within radius `r` to the points and the
+    # indices of the corresponding points.
+    if indexKD is None:
+        return np.zeros((0, coords.shape[1])), np.zeros(0, dtype=int)
+    nIds, seg = _ball_segments(indexKD, coords, r)
+    return indexKD.coords[nIds, :] - coords[seg, :], seg
+
+
+def _fit_normals(offsets, seg, n):
+    # Normals and centroids of segments of offsets. Normals are set to zero,
+    # if less than three points are available.
+    counts, means, cov = _segment_covariances(offsets, seg, n)
+    normals = np.zeros((n, offsets.shape[1]), dtype=float)
+    mask = counts >= 3
+    if np.any(mask):
+        normals[mask] = np.linalg.eigh(cov[mask])[1][:, :, 0]
+    return normals, means
+
+
+def _plane_distances(indexKD, coords, k, max_dist):
+    # Distances of points to planes fitted to the `k` nearest neighbours.
+    k = min(k, len(indexKD))
+    dists, nIds = indexKD.kd_tree.query(
+        coords, k=k, distance_upper_bound=max_dist)
+    dists = dists.reshape((len(coords), k))
+    nIds = nIds.reshape((len(coords), k))
+
+    valid = np.isfinite(dists)
+    seg = np.repeat(np.arange(len(coords)), k).reshape(nIds.shape)[valid]
+    offsets = indexKD.coords[nIds[valid], :] - coords[seg, :]
+    normals, centroids = _fit_normals(offsets, seg, len(coords))
+
+    # distance to the planes through the centroids of the neighbours
+    counts = valid.sum(1)
+    plane_dists = np.abs((centroids * normals).sum(1))
+
+    # fall back to the nearest neighbour, if no plane is available
+    mask = np.any(normals != 0, axis=1) & (counts >= coords.shape[1])
+    return np.where(mask, plane_dists, dists[:, 0])
+
+
+def _axial_stats(axial, seg, n):
+    # Number, mean and standard deviation of the axial distances per segment.
+    counts = np.bincount(seg, minlength=n)
+    sums = np.bincount(seg, weights=axial, minlength=n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+        sq_dev = np.bincount(
+            seg, weights=(axial - means[seg]) ** 2, minlength=n)
+        stds = np.sqrt(sq_dev / (counts - 1))
+    stds[counts < 2] = np.nan
+    return counts, means, stds
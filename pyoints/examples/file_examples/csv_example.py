@@ -49,4 +49,24 @@ Load the .csv-file again and check the characteristics.
 >>> print(sorted(geoRecords.dtype.names))
 ['classification', 'coords', 'index', 'intensity', 'keypoint', 'synthetic', 'values', 'withheld']
 
+Load selected fields of large files in chunks of common data type.
+
+>>> chunks = storage.loadCsv(
+...     outfile, usecols=['coords', 'intensity'], chunksize=300)
+>>> for chunk in chunks:
+...     print((chunk.shape, sorted(chunk.dtype.names)))
+((300,), ['coords', 'index', 'intensity'])
+((300,), ['coords', 'index', 'intensity'])
+((300,), ['coords', 'index', 'intensity'])
+((100,), ['coords', 'index', 'intensity'])
+
+Chunks can be written one by one.
+
+>>> chunks = storage.loadCsv(outfile, chunksize=300)
+>>> chunk_outfile = os.path.join(outpath, 'test_chunks.csv')
+>>> storage.writeCsv(chunks, chunk_outfile)
+>>> geoRecords = storage.loadCsv(chunk_outfile, header=True)
+>>> print(geoRecords.shape)
+(1000,)
+
 """
@@ -79,4 +79,12 @@ True
 >>> print(geoRecords.date.day)
 4
 
+Load the LAS-file chunk by chunk.
+
+>>> for chunk in lasReader.load_chunks(chunksize=400):
+...     print(chunk.shape)
+(400,)
+(400,)
+(200,)
+
 """
@@ -63,10 +63,7 @@ calculate the height above ground. We simply rasterize the point cloud by
 deriving the lowest z-coordinate of each cell.
 
 >>> T = transformation.matrix(t=las.t.origin[:2], s=[0.8, 0.8])
->>> def aggregate_function(ids):
-...     return las.coords[ids, 2].min() if len(ids) > 0 else np.nan
->>> dtype = [('z', float)]
->>> dem_grid = grid.voxelize(las, T, agg_func=aggregate_function, dtype=dtype)
+>>> dem_grid = grid.rasterize(las, T, field='z', stat='min')
 >>> print_rounded(dem_grid.shape)
 (9, 9)
 
@@ -105,9 +102,8 @@ with a point distance of at least 10 cm is kept.
 
 We only keep points with a lot of neighbors to reduce noise.
 
->>> count = las.indexKD().ball_count(0.3)
->>> mask = count > 10
->>> las = las[mask]
+>>> mask = filters.radius_outliers(las.indexKD(), 0.3, 10)
+>>> las = las[~mask]
 >>> print(len(las))
 8154
 
@@ -180,13 +176,14 @@ characteristics of the `Vector` object.
 
 
 Finally, we determinate the tree root coordinates using the previously derived
-digital elevation model.
-
->>> roots = []
->>> for tree_id in stems:
-...     stem = stems[tree_id]
-...     coord = vector.vector_surface_intersection(stem, dem)
-...     roots.append((tree_id, coord))
+digital elevation model. All stems are intersected with the surface at once.
+
+>>> tree_ids = list(stems.keys())
+>>> origins = [stems[tree_id].origin for tree_id in tree_ids]
+>>> vecs = [stems[tree_id].vec for tree_id in tree_ids]
+>>> root_coords, converged = vector.vectors_surface_intersection(
+...     origins, vecs, dem)
+>>> roots = list(zip(tree_ids, root_coords))
 
 >>> dtype = [('tree_id', int), ('coords', float, 3)]
 >>> roots = np.array(roots, dtype=dtype).view(np.recarray)
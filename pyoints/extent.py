@@ -271,3 +271,125 @@ class Extent(np.recarray, object):
             return len(indices) == 1
 
         return indices
+
+    @staticmethod
+    def intersect_many(coords, extents):
+        """Assigns coordinates to multiple extents at once. Instead of testing
+        each extent against all coordinates, the coordinates are sorted into
+        integer cells of a regular helper grid. Thus only the points of cells
+        overlapping an extent need to be tested.
+
+        Parameters
+        ----------
+        coords : array_like(Number, shape=(n, k))
+            Represents `n` data points of `k` dimensions.
+        extents : array_like(Number, shape=(m, 2 * k))
+            Represents `m` extents of `k` dimensions.
+
+        Returns
+        -------
+        indptr : np.ndarray(int, shape=(m + 1))
+            Index pointer. The indices of the points within extent `i` are
+            given by `indices[indptr[i]:indptr[i + 1]]`.
+        indices : np.ndarray(int)
+            Sorted indices of the points located within each extent.
+
+        See Also
+        --------
+        Extent.intersection
+
+        Examples
+        --------
+
+        >>> coords = [(0.5, 1), (1, 2), (-1, 1), (3, 3.5), (2, 1), (1, 0)]
+        >>> extents = [(0, 0.5, 1, 4), (0, 0, 2, 2), (5, 5, 6, 6)]
+        >>> indptr, indices = Extent.intersect_many(coords, extents)
+        >>> print_rounded(indptr)
+        [0 2 6 6]
+        >>> for i in range(len(extents)):
+        ...     print_rounded(indices[indptr[i]:indptr[i + 1]])
+        [0 1]
+        [0 1 4 5]
+        []
+
+        Equal to multiple intersection tests.
+
+        >>> for ext in extents:
+        ...     print_rounded(Extent(ext).intersection(coords))
+        [0 1]
+        [0 1 4 5]
+        []
+
+        """
+        coords = assertion.ensure_numarray(coords)
+        extents = assertion.ensure_numarray(extents)
+        if len(coords.shape) == 1:
+            coords = np.array([coords])
+        if len(extents.shape) == 1:
+            extents = np.array([extents])
+        m = len(extents)
+        dim = extents.shape[1] // 2
+        if not (len(coords.shape) == 2 and coords.shape[1] >= dim):
+            raise ValueError(
+                "'coords' need to have at least %i dimensions" % dim)
+        if not dim * 2 == extents.shape[1]:
+            raise ValueError('malformed extent vectors')
+        if not np.all(extents[:, :dim] <= extents[:, dim:]):
+            raise ValueError('minima must not be greater than maxima')
+
+        coords = coords[:, :dim]
+        min_ext = extents[:, :dim].astype(float)
+        max_ext = extents[:, dim:].astype(float)
+        if len(coords) == 0 or m == 0:
+            return np.zeros(m + 1, dtype=int), np.zeros(0, dtype=int)
+
+        # helper grid covering the extents and the coordinates
+        lower = np.maximum(min_ext.min(0), coords.min(0))
+        upper = np.minimum(max_ext.max(0), coords.max(0))
+        if np.any(upper < lower):
+            return np.zeros(m + 1, dtype=int), np.zeros(0, dtype=int)
+        ranges = np.minimum(max_ext, upper) - np.maximum(min_ext, lower)
+        size = np.median(np.maximum(ranges, 0), axis=0)
+        size[~(size > 0)] = np.maximum(upper - lower, 1)[~(size > 0)]
+        shape = (np.floor((upper - lower) / size) + 1).astype(int)
+        while np.product(shape.astype(float)) > max(16 * m, 1024):
+            size = size * 2
+            shape = (np.floor((upper - lower) / size) + 1).astype(int)
+
+        # assign coordinates to cells
+        inside = np.all((coords >= lower) & (coords <= upper), axis=1)
+        ids = np.where(inside)[0]
+        keys = np.floor((coords[ids, :] - lower) / size).astype(int)
+        cells = np.ravel_multi_index(tuple(keys.T), shape)
+        order = np.argsort(cells, kind='mergesort')
+        ids = ids[order]
+        cell_ptr = np.searchsorted(
+            cells[order], np.arange(np.product(shape) + 1))
+
+        # test the points of cells overlapping the extents
+        key_min = np.floor((np.maximum(min_ext, lower) - lower) / size)
+        key_max = np.floor((np.minimum(max_ext, upper) - lower) / size)
+        key_min = np.clip(key_min, 0, shape - 1).astype(int)
+        key_max = np.clip(key_max, 0, shape - 1).astype(int)
+
+        indptr = np.zeros(m + 1, dtype=int)
+        indices_list = []
+        for i in range(m):
+            if np.any(max_ext[i] < lower) or np.any(min_ext[i] > upper):
+                indices_list.append(np.zeros(0, dtype=int))
+                continue
+            cell_keys = np.indices(key_max[i] - key_min[i] + 1)
+            cell_keys = cell_keys.reshape(dim, -1) + key_min[i][:, None]
+            cell_ids = np.ravel_multi_index(tuple(cell_keys), shape)
+            candidates = np.concatenate([
+                ids[cell_ptr[c]:cell_ptr[c + 1]] for c in cell_ids
+            ])
+            values = coords[candidates, :]
+            mask = np.all(
+                (values >= min_ext[i]) & (values <= max_ext[i]), axis=1)
+            indices = np.sort(candidates[mask])
+            indices_list.append(indices)
+            indptr[i + 1] = len(indices)
+
+        indptr = np.cumsum(indptr)
+        return indptr, np.concatenate(indices_list).astype(int)
@@ -0,0 +1,327 @@
+# BEGIN OF LICENSE NOTE
+# This file is part of Pyoints.
+# Copyright (c) 2018, Sebastian Lamprecht, Trier University,
+# lamprecht@uni-trier.de
+#
+# Pyoints is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyoints is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pyoints. If not, see <https://www.gnu.org/licenses/>.
+# END OF LICENSE NOTE
+"""Multi-scale geometric features of point neighbourhoods.
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from . import (
+    assertion,
+    profiling,
+)
+from .coords import Coords
+from .georecords import GeoRecords
+from .normals import (
+    _ball_segments,
+    _segment_covariances,
+)
+from .misc import print_rounded
+
+
+# names of the features derived from the eigenvalues of neighbourhoods
+FEATURES = (
+    'linearity',
+    'planarity',
+    'sphericity',
+    'omnivariance',
+    'anisotropy',
+    'eigenentropy',
+    'curvature',
+    'verticality',
+)
+
+
+@profiling.profile('features.eigen_features', points=len)
+def eigen_features(
+        coords,
+        radii=None,
+        ks=None,
+        features=FEATURES,
+        indices=None,
+        bulk=10000,
+        n_jobs=1):
+    """Calculates features based on the eigenvalues of local point
+    neighbourhoods at multiple scales.
+
+    Parameters
+    ----------
+    coords : array_like(Number, shape=(n, 3))
+        Represents `n` points of three dimensions.
+    radii : optional, array_like(Number, shape=(s))
+        Radii of the neighbourhoods.
+    ks : optional, array_like(int, shape=(s))
+        Numbers of nearest neighbours of the neighbourhoods. Either `radii`
+        or `ks` needs to be provided.
+    features : optional, list of str
+        Names of the features to calculate. See `FEATURES`.
+    indices : optional, array_like(int, shape=(m))
+        Indices of the points to calculate the features for. If None, all
+        points are considered.
+    bulk : optional, positive int
+        Number of points processed at once.
+    n_jobs : optional, int
+        Number of threads processing the chunks of points in parallel. If -1,
+        all processors are used.
+
+    Returns
+    -------
+    np.recarray(shape=(m, ))
+        Record array with one field per feature and the field
+        'num_neighbours'. Each field has `s` columns, one per scale. Features
+        of neighbourhoods with less than three points are set to `np.nan`.
+
+    Notes
+    -----
+    The neighbours are queried once for the largest scale. Smaller scales
+    reuse these neighbours, so the costs of additional scales are small.
+
+    With the eigenvalues `l1 >= l2 >= l3` of the covariance matrix, their
+    sum `s` and the normal `n` (eigenvector of `l3`), the features are
+    defined as follows [1]:
+
+    linearity : (l1 - l2) / l1
+    planarity : (l2 - l3) / l1
+    sphericity : l3 / l1
+    omnivariance : (l1 * l2 * l3 / s**3) ** (1 / 3)
+    anisotropy : (l1 - l3) / l1
+    eigenentropy : -sum(li / s * ln(li / s))
+    curvature : l3 / s
+    verticality : 1 - abs(n_z)
+
+    References
+    ----------
+
+    [1] M. Weinmann, B. Jutzi, S. Hinz, C. Mallet (2015): Semantic point cloud
+    interpretation based on optimal neighborhoods, relevant features and
+    efficient classifiers. ISPRS Journal of Photogrammetry and Remote Sensing,
+    105, pp. 286-304.
+
+    See Also
+    --------
+    add_features, transformation.eigen, normals.fit_normals
+
+    Examples
+    --------
+
+    Create a line, a horizontal plane and a vertical plane.
+
+    >>> x, y = np.meshgrid(np.arange(0, 10, 0.5), np.arange(0, 10, 0.5))
+    >>> x = x.ravel()
+    >>> y = y.ravel()
+    >>> line = np.vstack((x[:20], np.zeros(20), np.zeros(20) + 20)).T
+    >>> horizontal = np.vstack((x, y, np.zeros(len(x)))).T
+    >>> vertical = np.vstack((x, np.zeros(len(x)) + 20, y)).T
+    >>> coords = np.vstack((line, horizontal, vertical))
+
+    Calculate the features at two scales.
+
+    >>> rec = eigen_features(coords, radii=[1.1, 2.1], indices=[5, 230, 630])
+    >>> print(rec.dtype.names[:3])
+    ('linearity', 'planarity', 'sphericity')
+    >>> print_rounded(rec.num_neighbours)
+    [[ 5  9]
+     [13 57]
+     [13 57]]
+    >>> print_rounded(rec.linearity, 2)
+    [[ 1.  1.]
+     [ 0.  0.]
+     [ 0.  0.]]
+    >>> print_rounded(rec.planarity, 2)
+    [[ 0.  0.]
+     [ 1.  1.]
+     [ 1.  1.]]
+    >>> print_rounded(rec.verticality[1:, :], 2)
+    [[ 0.  0.]
+     [ 1.  1.]]
+
+    Use nearest neighbours and select features.
+
+    >>> rec = eigen_features(
+    ...     coords, ks=[3, 10], features=['curvature'], indices=[230])
+    >>> print(rec.dtype.names)
+    ('curvature', 'num_neighbours')
+    >>> print_rounded(rec.curvature)
+    [[ 0.  0.]]
+
+    """
+    coords = Coords(assertion.ensure_coords(coords, dim=3))
+    indexKD = coords.indexKD()
+
+    if (radii is None) == (ks is None):
+        raise ValueError("either 'radii' or 'ks' needs to be provided")
+    if radii is not None:
+        scales = assertion.ensure_numvector(radii).astype(float)
+        if not np.all(scales > 0):
+            raise ValueError("'radii' need to be greater zero")
+    else:
+        scales = assertion.ensure_numvector(ks)
+        if not (np.issubdtype(scales.dtype, np.integer) and
+                np.all(scales > 0)):
+            raise ValueError("'ks' need to be integers greater zero")
+    if isinstance(features, str):
+        features = [features]
+    for name in features:
+        if name not in FEATURES:
+            raise ValueError("unknown feature '%s'" % name)
+    if indices is None:
+        indices = np.arange(len(coords))
+    else:
+        indices = assertion.ensure_indices(
+            indices, max_value=len(coords) - 1)
+    if not (isinstance(bulk, int) and bulk > 0):
+        raise ValueError("'bulk' needs to be an integer greater zero")
+    if not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+        raise ValueError("'n_jobs' needs to be a positive integer or -1")
+    n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+
+    dtype = [(name, float, (len(scales), )) for name in features]
+    dtype.append(('num_neighbours', int, (len(scales), )))
+    rec = np.recarray(len(indices), dtype=dtype)
+
+    def process(i):
+        ids = indices[i:i + bulk]
+        if radii is not None:
+            nIds, seg = _ball_segments(indexKD, coords[ids, :], scales.max())
+        else:
+            nIds, seg, ranks = _knn(indexKD, coords[ids, :], scales.max())
+        offsets = coords[nIds, :] - coords[ids[seg], :]
+        if radii is not None:
+            dists = np.linalg.norm(offsets, axis=1)
+            masks = [dists <= r for r in scales]
+        else:
+            masks = [ranks < k for k in scales]
+
+        for j, mask in enumerate(masks):
+            counts, _, cov = _segment_covariances(
+                offsets[mask], seg[mask], len(ids))
+            values = _features(cov, counts, features)
+            for name in features:
+                rec[name][i:i + bulk, j] = values[name]
+            rec.num_neighbours[i:i + bulk, j] = counts
+
+    tasks = range(0, len(indices), bulk)
+    if n_jobs == 1 or len(tasks) <= 1:
+        for i in tasks:
+            process(i)
+    else:
+        # the neighbourhood queries and eigen decompositions release the GIL,
+        # so threads suffice and the coordinates are shared without copying
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(process, tasks))
+
+    return rec
+
+
+def add_features(
+        geoRecords,
+        radii=None,
+        ks=None,
+        features=FEATURES,
+        bulk=10000,
+        n_jobs=1):
+    """Adds multi-scale eigenvalue features to points.
+
+    Parameters
+    ----------
+    geoRecords : GeoRecords
+        Points to calculate the features for.
+    radii, ks, features, bulk, n_jobs : optional
+        See `eigen_features`.
+
+    Returns
+    -------
+    GeoRecords
+        Points with additional fields for each feature and 'num_neighbours'.
+
+    See Also
+    --------
+    eigen_features
+
+    Examples
+    --------
+
+    >>> x, y = np.meshgrid(np.arange(0, 10, 0.5), np.arange(0, 10, 0.5))
+    >>> coords = np.vstack((x.ravel(), y.ravel(), np.zeros(x.size))).T
+    >>> geo = GeoRecords(None, {'coords': coords})
+    >>> geo = add_features(geo, ks=[5, 9, 25], features=['planarity'])
+    >>> print(geo.dtype.names)
+    ('coords', 'planarity', 'num_neighbours')
+    >>> print_rounded(geo.planarity.shape)
+    (400, 3)
+    >>> print_rounded(geo.planarity[210, :])
+    [ 1.  1.  1.]
+    >>> print_rounded(geo.planarity[0, :])
+    [ 0.33  1.    0.67]
+
+    """
+    if not isinstance(geoRecords, GeoRecords):
+        raise TypeError("'geoRecords' needs to be an instance of GeoRecords")
+    rec = eigen_features(
+        geoRecords.coords,
+        radii=radii,
+        ks=ks,
+        features=features,
+        bulk=bulk,
+        n_jobs=n_jobs
+    )
+    data = [rec[name] for name in rec.dtype.names]
+    return geoRecords.add_fields(rec.dtype.descr, data=data)
+
+
+def _knn(indexKD, coords, k):
+    # Nearest neighbours as flat arrays of neighbour indices, point indices
+    # and ranks.
+    k = min(int(k), len(indexKD))
+    nIds = indexKD.kd_tree.query(coords, k=k)[1].reshape((len(coords), k))
+    seg = np.repeat(np.arange(len(coords)), k)
+    ranks = np.tile(np.arange(k), len(coords))
+    return nIds.ravel(), seg, ranks
+
+
+def _features(cov, counts, features):
+    # Eigenvalue features of covariance matrices.
+    n = len(counts)
+    values = {name: np.full(n, np.nan) for name in features}
+    mask = counts >= 3
+    if not np.any(mask):
+        return values
+
+    eig_val, eig_vec = np.linalg.eigh(cov[mask])
+    eig_val = np.maximum(eig_val[:, ::-1], 0)
+    l1, l2, l3 = eig_val.T
+    s = eig_val.sum(1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        e = eig_val / s[:, None]
+        results = {
+            'linearity': lambda: (l1 - l2) / l1,
+            'planarity': lambda: (l2 - l3) / l1,
+            'sphericity': lambda: l3 / l1,
+            'omnivariance': lambda: np.cbrt(e.prod(1)),
+            'anisotropy': lambda: (l1 - l3) / l1,
+            'eigenentropy': lambda: -np.where(
+                e > 0, e * np.log(np.where(e > 0, e, 1)), 0).sum(1),
+            'curvature': lambda: l3 / s,
+            'verticality': lambda: 1 - np.abs(eig_vec[:, 2, 0]),
+        }
+        for name in features:
+            values[name][mask] = results[name]()
+    return values
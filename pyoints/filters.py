@@ -27,6 +27,7 @@ from . import (
     distance,
     interpolate,
     IndexKD,
+    profiling,
     transformation,
     vector,
 )
@@ -238,6 +239,140 @@ def is_isolated(indexKD, r):
                 yield pId
 
 
+@profiling.profile('filters.statistical_outliers', points=len)
+def statistical_outliers(indexKD, k, std_ratio=2.0, bulk=100000, n_jobs=1):
+    """Identifies outliers by the mean distance of points to their nearest
+    neighbours.
+
+    Parameters
+    ----------
+    indexKD : IndexKD
+        Spatial index of `n` points to filter.
+    k : positive int
+        Number of nearest neighbours to consider, excluding the point itself.
+    std_ratio : optional, positive Number
+        A point is considered as an outlier, if its mean neighbour distance
+        exceeds the average of all mean neighbour distances by more than
+        `std_ratio` times their standard deviation.
+    bulk : optional, positive int
+        Number of points queried at once.
+    n_jobs : optional, int
+        Number of threads used for the nearest neighbour queries. If -1, all
+        processors are used.
+
+    Returns
+    -------
+    np.ndarray(bool, shape=(n))
+        Indicates whether or not a point is an outlier.
+
+    See Also
+    --------
+    radius_outliers
+
+    Examples
+    --------
+
+    >>> coords = np.indices((10, 10)).reshape((2, 100)).T
+    >>> coords = np.vstack((coords, [(4.5, 4.5), (20, 20), (-5, 3)]))
+    >>> indexKD = IndexKD(coords)
+
+    >>> mask = statistical_outliers(indexKD, 4)
+    >>> print(np.where(mask)[0])
+    [101 102]
+    >>> print(len(indexKD.coords[~mask, :]))
+    101
+
+    """
+    if not isinstance(indexKD, IndexKD):
+        raise TypeError("'indexKD' needs to be of type 'IndexKD'")
+    if not (isinstance(k, int) and k > 0):
+        raise ValueError("'k' needs to be an integer greater zero")
+    if not (assertion.isnumeric(std_ratio) and std_ratio > 0):
+        raise ValueError("'std_ratio' needs to be a number greater zero")
+    _check_bulk(bulk, n_jobs)
+
+    n = len(indexKD)
+    k = min(k, n - 1)
+    if k < 1:
+        return np.zeros(n, dtype=bool)
+
+    mean_dists = np.empty(n, dtype=float)
+    for i in range(0, n, bulk):
+        dists = indexKD.kd_tree.query(
+            indexKD.coords[i:i + bulk, :], k=k + 1, n_jobs=n_jobs)[0]
+        mean_dists[i:i + bulk] = dists[:, 1:].mean(1)
+
+    max_dist = mean_dists.mean() + std_ratio * mean_dists.std()
+    return mean_dists > max_dist
+
+
+@profiling.profile('filters.radius_outliers', points=len)
+def radius_outliers(indexKD, r, min_pts, bulk=100000, n_jobs=1):
+    """Identifies outliers by the number of neighbours within a radius.
+
+    Parameters
+    ----------
+    indexKD : IndexKD
+        Spatial index of `n` points to filter.
+    r : positive Number
+        Radius to count the neighbours within.
+    min_pts : positive int
+        Minimum number of neighbours of a point, excluding the point itself,
+        to not be considered as an outlier.
+    bulk : optional, positive int
+        Number of points queried at once.
+    n_jobs : optional, int
+        Number of threads used for the neighbourhood queries. If -1, all
+        processors are used.
+
+    Returns
+    -------
+    np.ndarray(bool, shape=(n))
+        Indicates whether or not a point is an outlier.
+
+    See Also
+    --------
+    statistical_outliers, is_isolated
+
+    Examples
+    --------
+
+    >>> coords = [(0, 0), (0.5, 0.5), (0, 1), (0.7, 0.5), (-1, -1)]
+    >>> indexKD = IndexKD(coords)
+
+    >>> print(radius_outliers(indexKD, 0.7, 1))
+    [ True False  True False  True]
+    >>> print(radius_outliers(indexKD, 1.2, 2))
+    [False False False False  True]
+
+    """
+    if not isinstance(indexKD, IndexKD):
+        raise TypeError("'indexKD' needs to be of type 'IndexKD'")
+    if not (assertion.isnumeric(r) and r > 0):
+        raise ValueError("'r' needs to be a number greater zero")
+    if not (isinstance(min_pts, int) and min_pts > 0):
+        raise ValueError("'min_pts' needs to be an integer greater zero")
+    _check_bulk(bulk, n_jobs)
+
+    n = len(indexKD)
+    counts = np.empty(n, dtype=int)
+    for i in range(0, n, bulk):
+        counts[i:i + bulk] = indexKD.kd_tree.query_ball_point(
+            indexKD.coords[i:i + bulk, :], r,
+            n_jobs=n_jobs, return_length=True)
+
+    # the point itself is counted as well
+    return counts <= min_pts
+
+
+def _check_bulk(bulk, n_jobs):
+    # Validates the parameters of bulk queries.
+    if not (isinstance(bulk, int) and bulk > 0):
+        raise ValueError("'bulk' needs to be an integer greater zero")
+    if not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+        raise ValueError("'n_jobs' needs to be a positive integer or -1")
+
+
 def ball(indexKD, r, order=None, inverse=False, axis=-1, min_pts=1):
     """Filters coordinates by radius. This algorithm is suitable to remove
     duplicate points or to get an almost uniform point density.
@@ -380,6 +515,7 @@ def surface(indexKD, r, order=None, inverse=False, axis=-1):
             yield nIds[np.argmin(inverseOrder[nIds])]
 
 
+@profiling.profile('filters.dem_filter', points='coords')
 def dem_filter(coords, r, max_angle=70):
     """Selects points suitable for generating a digital elevation model.
 
@@ -20,7 +20,6 @@
 """
 
 import numpy as np
-import cylinder_fitting
 
 from . import (
     transformation,
@@ -149,6 +148,8 @@ def fit_cylinder(coords, vec=None):
     [ 2.5  2.5]
 
     """
+    import cylinder_fitting
+
     coords = assertion.ensure_coords(coords, dim=3)
 
     # set estimated direction
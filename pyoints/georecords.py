@@ -392,7 +392,7 @@ class GeoRecords(np.recarray, object):
         ----------
         dtypes : np.dtype
             Data types of the new fields.
-        data : optional, list of arrays
+        data : optional, list of arrays or dict
             Data values of the new fields.
 
         Returns
@@ -400,9 +400,16 @@ class GeoRecords(np.recarray, object):
         geo : self.__class__
             New GeoRecords with additional fields.
 
+        Notes
+        -----
+        The record array is reallocated on each call, so multiple fields
+        should be added at once. Cached coordinates and spatial indices are
+        passed to the new instance. Use `ColumnarGeoRecords` or
+        `LasRecords.reserve` to add fields without copying.
+
         See Also
         --------
-        nptools.add_fields
+        nptools.add_fields, ColumnarGeoRecords, LasRecords.reserve
 
         Examples
         --------
@@ -425,7 +432,10 @@ class GeoRecords(np.recarray, object):
         """
 
         records = nptools.add_fields(self, dtypes, data=data)
-        return self.__class__(self.proj, records, T=self.t, date=self.date)
+        geo = self.__class__(self.proj, records, T=self.t, date=self.date)
+        if hasattr(self, '_coords'):
+            geo._coords = self._coords
+        return geo
 
     def merge(self, rec):
         """Merges a record array with the georecords.
@@ -433,7 +443,8 @@ class GeoRecords(np.recarray, object):
         Parameters
         ----------
         rec : array_like
-            Record array with same fields as self.
+            Record array with fields compatible to self. Structured arrays
+            are merged along the first axis.
 
         Returns
         -------
@@ -442,21 +453,47 @@ class GeoRecords(np.recarray, object):
 
         See Also
         --------
-        nptools.merge
+        merge, nptools.merge
+
+        Examples
+        --------
+
+        >>> geo = GeoRecords(None, {'coords': [(0, 1), (1, 2)], 'a': [1, 2]})
+        >>> rec = nptools.recarray({'coords': [(3, 2)], 'b': [3]})
+        >>> merged = geo.merge(rec)
+        >>> print(merged.dtype.names)
+        ('coords', 'a', 'b')
+        >>> print_rounded(merged.coords)
+        [[0 1]
+         [1 2]
+         [3 2]]
 
         """
-        data = nptools.merge((self, rec))
+        if not self.ndim == 1:
+            data = nptools.merge((self, rec))
+        else:
+            data = merge([self, rec], proj=self.proj, T=self.t)
         return self.__class__(self.proj, data, T=self.t, date=self.date)
 
-    def apply_function(self, func, dtypes=[object]):
+    def apply_function(self, func, dtypes=None, batch=False, bulk=100000,
+                       n_jobs=1):
         """Applies or maps a function to each element of the data array.
 
         Parameters
         ----------
         func : function
-            This function is applied to record of the array.
+            This function is applied to record of the array. If `batch` is
+            True, the function is applied to blocks of records instead.
         dtypes :  optional, np.dtype
-            Desired data type of the output array.
+            Desired data type of the output array. The data type needs to
+            provide the field `coords`. If None, the data type of `self` is
+            used.
+        batch : optional, bool
+            Indicates whether or not to apply `func` to blocks of records.
+        bulk : optional, positive int
+            Maximum number of records per block.
+        n_jobs : optional, int
+            Number of processes used to map the blocks.
 
         Returns
         -------
@@ -467,8 +504,44 @@ class GeoRecords(np.recarray, object):
         --------
         nptools.apply_function
 
+        Examples
+        --------
+
+        >>> data = {
+        ...    'coords': [(2, 3), (3, 2), (0, 1), (9, 5)],
+        ...    'values': [1, 3, 4, 0]
+        ... }
+        >>> geo = GeoRecords(None, data)
+
+        Apply a function to each record.
+
+        >>> func = lambda record: (record.coords, record.values * 2)
+        >>> print_rounded(geo.apply_function(func).values)
+        [2 6 8 0]
+
+        Apply a function to blocks of records.
+
+        >>> func = lambda block: (block.coords * 2, block.values + 1)
+        >>> res = geo.apply_function(func, batch=True, bulk=3)
+        >>> print_rounded(res.values)
+        [2 4 5 1]
+        >>> print_rounded(res.coords)
+        [[ 4  6]
+         [ 6  4]
+         [ 0  2]
+         [18 10]]
+
         """
-        data = nptools.apply_function(self, func, dtypes=dtypes)
+        if dtypes is None:
+            dtypes = self.dtype
+        data = nptools.apply_function(
+            self,
+            func,
+            dtype=dtypes,
+            batch=batch,
+            bulk=bulk,
+            n_jobs=n_jobs
+        )
         return self.__class__(self.proj, data, T=self.t, date=self.date)
 
 
@@ -487,6 +560,9 @@ class LasRecords(GeoRecords):
     total_gps_seconds : np.ndarray(np.float32) or None
         Total gps time in seconds. Requires the fields 'gps_time' and 'date' to
         be set.
+    spare_bytes : int
+        Number of bytes per point reserved for additional fields. See
+        `LasRecords.reserve`.
 
     See Also
     --------
@@ -539,6 +615,15 @@ class LasRecords(GeoRecords):
             return week * 604800 + self.gps_time
         return None
 
+    @property
+    def spare_bytes(self):
+        if not getattr(self, '_reserved', False):
+            return 0
+        fields = self.dtype.fields
+        used = max(fields[name][0].itemsize + fields[name][1]
+                   for name in self.dtype.names)
+        return self.dtype.itemsize - used
+
     @staticmethod
     def available_fields():
         fields = []
@@ -567,6 +652,135 @@ class LasRecords(GeoRecords):
                 return self.add_fields([field])
         raise ValueError('field "%s" not found' % field_name)
 
+    def reserve(self, dtypes):
+        """Reserves memory for fields to be added later on.
+
+        Parameters
+        ----------
+        dtypes : np.dtype
+            Data types of the fields to reserve memory for.
+
+        Returns
+        -------
+        LasRecords
+            Copy of the records providing spare memory for the fields.
+
+        Notes
+        -----
+        Fields fitting into the spare memory are added in place by
+        `LasRecords.add_fields`, so the existing fields are not copied again.
+        Thus, reserving the memory once is much cheaper than adding fields
+        one by one to large point clouds. Copies and views of the returned
+        records do not provide the spare memory.
+
+        See Also
+        --------
+        LasRecords.add_fields
+
+        Examples
+        --------
+
+        >>> data = {
+        ...    'coords': [(2, 3, 1), (3, 2, 3), (0, 1, 0), (9, 5, 4)],
+        ...    'intensity': [5, 3, 2, 0]
+        ... }
+        >>> las = LasRecords(None, data).reserve(
+        ...     [('tree_id', np.int32), ('height', float)])
+        >>> print(las.spare_bytes)
+        12
+
+        Add a field without copying the records.
+
+        >>> las2 = las.add_fields([('tree_id', np.int32)], data=[[1, 1, 2, 0]])
+        >>> print(las2 is las)
+        True
+        >>> print(las.dtype.names)
+        ('coords', 'intensity', 'tree_id')
+        >>> print(las.tree_id)
+        [1 1 2 0]
+        >>> print(las.spare_bytes)
+        8
+
+        Fields exceeding the spare memory are added by copying the records.
+
+        >>> las2 = las.add_fields([('A', np.int32), ('B', float)])
+        >>> print(las2 is las)
+        False
+        >>> print(las2.dtype.names)
+        ('coords', 'intensity', 'tree_id', 'A', 'B')
+
+        """
+        dtypes = np.dtype(dtypes)
+        if dtypes.hasobject:
+            raise ValueError("memory can not be reserved for objects")
+        names = self.dtype.names
+        dtype = np.dtype({
+            'names': names,
+            'formats': [self.dtype.fields[name][0] for name in names],
+            'offsets': [self.dtype.fields[name][1] for name in names],
+            'itemsize': self.dtype.itemsize + dtypes.itemsize,
+        })
+        records = self.view(np.recarray).astype(dtype)
+        las = self.__class__(self.proj, records, T=self.t, date=self.date)
+        las._reserved = True
+        if hasattr(self, '_coords'):
+            las._coords = self._coords
+        return las
+
+    def add_fields(self, dtypes, data=None):
+        """Adds data fields to the records. Fields fitting into the memory
+        reserved by `LasRecords.reserve` are added in place.
+
+        Parameters
+        ----------
+        dtypes : np.dtype
+            Data types of the new fields.
+        data : optional, list of arrays or dict
+            Data values of the new fields.
+
+        Returns
+        -------
+        LasRecords
+            Records with additional fields. Either `self` or a copy of the
+            records, if the spare memory is not sufficient.
+
+        See Also
+        --------
+        GeoRecords.add_fields, LasRecords.reserve
+
+        """
+        dtypes = np.dtype(dtypes)
+        if (dtypes.names is None or dtypes.hasobject or
+                dtypes.itemsize > self.spare_bytes):
+            return GeoRecords.add_fields(self, dtypes, data=data)
+
+        for name in dtypes.names:
+            if name in self.dtype.names:
+                raise ValueError("field '%s' already exists" % name)
+            if hasattr(self, name):
+                raise ValueError("can not overwrite attribute '%s'" % name)
+
+        # place the new fields behind the used memory
+        used = self.dtype.itemsize - self.spare_bytes
+        names = self.dtype.names
+        fields = [self.dtype.fields[name] for name in names]
+        fields.extend((dt, used + offset) for dt, offset in
+                      (dtypes.fields[name][:2] for name in dtypes.names))
+        self.dtype = np.dtype({
+            'names': names + dtypes.names,
+            'formats': [f[0] for f in fields],
+            'offsets': [f[1] for f in fields],
+            'itemsize': self.dtype.itemsize,
+        })
+
+        if data is not None:
+            if nptools.haskeys(data):
+                data = [data.get(name) for name in dtypes.names]
+            for name, column in zip(dtypes.names, data):
+                if column is not None:
+                    self[name] = column
+        return self
+
     def grd(self):
         """Filters by points classified as ground.
 
@@ -604,3 +818,655 @@ class LasRecords(GeoRecords):
 
         """
         return np.where(np.in1d(self.classification, classes))[0]
+
+
+class ColumnarGeoRecords(object):
+    """Column oriented alternative to `GeoRecords`. Each field is stored as a
+    separate contiguous array. Thus, accessing the coordinates does not
+    require a copy and fields can be added, dropped or selected without
+    copying the other fields. Only unstructured point sets are supported.
+
+    Parameters
+    ----------
+    proj : projection.Proj
+        Projection object to provide the coordinate reference system.
+    columns : dict or np.recarray
+        Fields of `n` points. The field `coords` is required and represents
+        coordinates of `k` dimensions.
+    T : optional, array_like(Number, shape=(k+1, k+1))
+        Linear transformation matrix to transform the coordinates. Set to a
+        translation matrix of the minimum corner, if not given.
+    date : optional, datetime
+        Date of capture.
+
+    Attributes
+    ----------
+    proj : projection.Proj
+        Projection of the coordinates.
+    t : np.ndarray(Number, shape=(k+1, k+1))
+        Linear transformation matrix to transform the coordinates.
+    dim : positive int
+        Number of coordinate dimensions of the `coords` field.
+    count : positive int
+        Number of points.
+    names : tuple of str
+        Names of the fields.
+    dtype : np.dtype
+        Data type of the equivalent record array.
+    date : datetime
+        Date of capture.
+
+    See Also
+    --------
+    GeoRecords
+
+    Examples
+    --------
+
+    >>> data = {
+    ...    'coords': [(2, 3), (3, 2), (0, 1), (-1, 2.2), (9, 5)],
+    ...    'values': [1, 3, 4, 0, 6]
+    ... }
+    >>> geo = ColumnarGeoRecords(projection.Proj(), data)
+    >>> print(geo.names)
+    ('coords', 'values')
+    >>> print_rounded(geo.values)
+    [1 3 4 0 6]
+    >>> print_rounded(geo.coords)
+    [[ 2.   3. ]
+     [ 3.   2. ]
+     [ 0.   1. ]
+     [-1.   2.2]
+     [ 9.   5. ]]
+
+    The coordinates are not copied, so the spatial index is kept.
+
+    >>> geo.coords is geo.coords
+    True
+    >>> print_rounded(geo.indexKD().ball((0, 0), 2))
+    [2]
+
+    Add and drop fields without copying other fields.
+
+    >>> geo2 = geo.add_fields([('A', int)], data=[[1, 2, 3, 4, 5]])
+    >>> print(geo2.names)
+    ('coords', 'values', 'A')
+    >>> geo2.coords is geo.coords
+    True
+    >>> print(geo2.drop_fields(['values']).names)
+    ('coords', 'A')
+
+    Select points and fields.
+
+    >>> print_rounded(geo2[geo2.values > 2].A)
+    [2 3 5]
+    >>> print(geo2[['A']].names)
+    ('coords', 'A')
+
+    Convert to GeoRecords and back.
+
+    >>> rec = geo2.records()
+    >>> print(type(rec).__name__)
+    GeoRecords
+    >>> print(rec.dtype.names)
+    ('coords', 'values', 'A')
+    >>> geo3 = ColumnarGeoRecords.from_records(rec)
+    >>> print_rounded(geo3.A)
+    [1 2 3 4 5]
+
+    """
+
+    def __init__(self, proj, columns, T=None, date=None):
+        if isinstance(columns, np.ndarray) and columns.dtype.names:
+            if not len(columns.shape) == 1:
+                raise ValueError("one dimensional record array required")
+            names = columns.dtype.names
+            columns = [(name, columns[name]) for name in names]
+        elif nptools.haskeys(columns):
+            columns = [(name, columns[name]) for name in columns.keys()]
+        else:
+            raise TypeError("'columns' needs to be a dictionary or recarray")
+
+        names = [name for name, _ in columns]
+        if 'coords' not in names:
+            raise ValueError("field 'coords' required")
+        if not len(set(names)) == len(names):
+            raise ValueError("field names need to be unique")
+
+        self.__dict__['_names'] = []
+        self.__dict__['_columns'] = {}
+        for name, values in columns:
+            self._set_column(name, values)
+
+        if T is None:
+            T = transformation.t_matrix(self.extent().min_corner)
+        # validated by setter
+        self.proj = proj
+        self.t = T
+        self.date = date
+
+    @classmethod
+    def from_records(cls, geoRecords, proj=None, T=None, date=None):
+        """Converts a record array to the columnar representation.
+
+        Parameters
+        ----------
+        geoRecords : np.recarray or GeoRecords
+            Records to convert. Each field is copied once.
+        proj, T, date : optional
+            Spatial reference and date. Taken from `geoRecords`, if not
+            given.
+
+        Returns
+        -------
+        ColumnarGeoRecords
+
+        """
+        if isinstance(geoRecords, GeoRecords):
+            proj = geoRecords.proj if proj is None else proj
+            T = geoRecords.t if T is None else T
+            date = geoRecords.date if date is None else date
+            geoRecords = geoRecords.records()
+        return cls(proj, geoRecords, T=T, date=date)
+
+    def records(self):
+        """Converts the columns to `GeoRecords`, e.g. to save them to disc.
+
+        Returns
+        -------
+        GeoRecords
+            Record array of `self.count` points.
+
+        """
+        rec = np.recarray(self.count, dtype=self.dtype)
+        for name in self._names:
+            rec[name] = self._columns[name]
+        return GeoRecords(self.proj, rec, T=self.t, date=self.date)
+
+    def _set_column(self, name, values):
+        # Add or replace a field.
+        if not isinstance(name, str):
+            raise TypeError("field names need to be strings")
+        values = np.asarray(values)
+        if name == 'coords':
+            if not len(values.shape) == 2:
+                raise ValueError("malformed coordinate shape")
+            if not values.shape[1] >= 2:
+                raise ValueError("at least two coordinate dimensions needed")
+            values = Coords(np.ascontiguousarray(values))
+        if len(self._names) > 0:
+            n = len(self._columns[self._names[0]])
+            if not len(values) == n:
+                m = "length of field '%s' needs to be %i" % (name, n)
+                raise ValueError(m)
+        if name not in self._columns:
+            self._names.append(name)
+        self._columns[name] = values
+
+    def _copy_with(self, columns):
+        # Creates a new instance sharing the given columns.
+        geo = object.__new__(self.__class__)
+        geo.__dict__.update(self.__dict__)
+        geo.__dict__['_names'] = [name for name, _ in columns]
+        geo.__dict__['_columns'] = dict(columns)
+        return geo
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get('_columns', {})
+        if name in columns:
+            return columns[name]
+        m = "'%s' object has no attribute '%s'"
+        raise AttributeError(m % (self.__class__.__name__, name))
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__.get('_columns', {}):
+            self._set_column(name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._columns[key]
+        if isinstance(key, list) and all(isinstance(k, str) for k in key):
+            # select fields, but keep the coordinates
+            names = [name for name in self._names
+                     if name == 'coords' or name in key]
+            for name in key:
+                if name not in self._columns:
+                    raise ValueError('field "%s" not found' % name)
+            return self._copy_with([(n, self._columns[n]) for n in names])
+        if isinstance(key, (int, np.integer)):
+            key = [key]
+
+        # select points
+        columns = []
+        for name in self._names:
+            values = self._columns[name][key]
+            if name == 'coords':
+                values = Coords(np.ascontiguousarray(values))
+            columns.append((name, values))
+        return self._copy_with(columns)
+
+    def __setitem__(self, name, values):
+        if not isinstance(name, str):
+            raise TypeError("only fields can be set")
+        self._set_column(name, values)
+
+    @property
+    def names(self):
+        return tuple(self._names)
+
+    @property
+    def dtype(self):
+        dtypes = []
+        for name in self._names:
+            values = self._columns[name]
+            dtypes.append((name, values.dtype, values.shape[1:]))
+        return np.dtype(dtypes)
+
+    @property
+    def dim(self):
+        return self.coords.dim
+
+    @property
+    def count(self):
+        return len(self._columns['coords'])
+
+    @property
+    def shape(self):
+        return (self.count,)
+
+    @property
+    def coords(self):
+        return self._columns['coords']
+
+    @coords.setter
+    def coords(self, coords):
+        self._set_column('coords', coords)
+
+    def extent(self, *args, **kwargs):
+        return self.coords.extent(*args, **kwargs)
+
+    def indexKD(self, *args, **kwargs):
+        return self.coords.indexKD(*args, **kwargs)
+
+    @property
+    def t(self):
+        return self._t
+
+    @t.setter
+    def t(self, t):
+        t = assertion.ensure_tmatrix(t)
+        if not t.shape[0] == self.dim + 1:
+            raise ValueError('dimensions do not fit')
+        self._t = transformation.LocalSystem(t)
+
+    @property
+    def proj(self):
+        return self._proj
+
+    @proj.setter
+    def proj(self, proj):
+        if proj is None:
+            proj = projection.Proj()
+            warnings.warn("'proj' not set, so I assume '%s'" % proj.proj4)
+        elif not isinstance(proj, projection.Proj):
+            raise TypeError("'proj' needs to be of type 'projection.Proj'")
+        self._proj = proj
+
+    @property
+    def date(self):
+        return self._date
+
+    @date.setter
+    def date(self, date):
+        if (date is not None) and (not isinstance(date, datetime)):
+            m = "'date' needs to be of type 'datetime', got %s" % type(date)
+            raise TypeError(m)
+        self._date = date
+
+    def add_fields(self, dtypes, data=None):
+        """Adds data fields without copying the existing fields.
+
+        Parameters
+        ----------
+        dtypes : np.dtype
+            Data types of the new fields.
+        data : optional, list of arrays
+            Data values of the new fields.
+
+        Returns
+        -------
+        geo : self.__class__
+            New ColumnarGeoRecords sharing the existing fields.
+
+        See Also
+        --------
+        GeoRecords.add_fields
+
+        """
+        dtypes = np.dtype(dtypes)
+        if data is not None and not len(data) == len(dtypes.names):
+            raise ValueError("dimensions of 'data' and 'dtypes' do not match")
+        columns = [(name, self._columns[name]) for name in self._names]
+        geo = self._copy_with(columns)
+        for i, name in enumerate(dtypes.names):
+            if name in self._columns:
+                raise ValueError("field '%s' already exists" % name)
+            dt = dtypes[name]
+            shape = (self.count,) + dt.shape
+            base_dtype = dt.subdtype[0] if dt.subdtype is not None else dt
+            if data is None:
+                values = np.zeros(shape, dtype=base_dtype)
+            else:
+                values = np.asarray(data[i], dtype=base_dtype)
+            geo._set_column(name, values)
+        return geo
+
+    def drop_fields(self, names):
+        """Removes fields without copying the remaining fields.
+
+        Parameters
+        ----------
+        names : list of str
+            Names of the fields to remove.
+
+        Returns
+        -------
+        geo : self.__class__
+            New ColumnarGeoRecords sharing the remaining fields.
+
+        """
+        if isinstance(names, str):
+            names = [names]
+        if 'coords' in names:
+            raise ValueError("field 'coords' is required")
+        columns = [(name, self._columns[name]) for name in self._names
+                   if name not in names]
+        return self._copy_with(columns)
+
+    def transform(self, T):
+        """Transforms coordinates.
+
+        Parameters
+        ----------
+        T : array_like(Number, shape=(self.dim+1, self.dim+1))
+            Transformation matrix to apply.
+
+        Returns
+        -------
+        self
+
+        See Also
+        --------
+        GeoRecords.transform
+
+        """
+        self.coords = self.coords.transform(T)
+        self.t = T @ self.t
+        return self
+
+    def project(self, proj):
+        """Projects the coordinates to a different coordinate system.
+
+        Parameters
+        ----------
+        proj : Proj
+            Desired output projection system.
+
+        Returns
+        -------
+        self
+
+        See Also
+        --------
+        GeoRecords.project
+
+        """
+        self.coords = projection.project(self.coords, self.proj, proj)
+        self.proj = proj
+        return self
+
+
+def merge(items, proj=None, T=None, dtype=None, date=None, chunksize=1000000):
+    """Merges multiple point sets into a single GeoRecords object.
+
+    Parameters
+    ----------
+    items : iterable of GeoRecords or GeoFile
+        Point sets or file readers providing the points to merge.
+    proj : optional, projection.Proj
+        Projection of the merged points. Points of a differing projection are
+        projected accordingly. If None, the projection of the first item is
+        used.
+    T : optional, array_like(Number, shape=(k+1, k+1))
+        Transformation matrix of the merged points. If None, the origin of
+        the merged points is used. The coordinates themselves are not
+        transformed.
+    dtype : optional, np.dtype
+        Data type of the merged points. If None, the data types of all items
+        are unified. Missing fields are set to zero.
+    date : optional, datetime
+        Date of capture.
+    chunksize : optional, positive int
+        Maximum number of points loaded at once from readers providing a
+        `load_chunks` method.
+
+    Returns
+    -------
+    GeoRecords
+        Merged points. If all items provide LAS data, a `LasRecords` object is
+        returned.
+
+    Notes
+    -----
+    The output array is allocated only once. If `dtype` is not provided, the
+    file readers need to be accessed twice to determine the common data
+    type.
+
+    See Also
+    --------
+    iter_merge, nptools.unify_dtypes
+
+    Examples
+    --------
+
+    >>> A = GeoRecords(None, {
+    ...     'coords': [(0, 1, 2), (2, 3, 4)],
+    ...     'intensity': np.array([3, 4], dtype=np.uint8)
+    ... })
+    >>> B = GeoRecords(None, {
+    ...     'coords': [(4, 5, 6)],
+    ...     'intensity': np.array([300], dtype=np.uint16),
+    ...     'classification': [2]
+    ... })
+    >>> geo = merge([A, B])
+    >>> print(geo.dtype.names)
+    ('coords', 'intensity', 'classification')
+    >>> print_rounded(geo.intensity)
+    [  3   4 300]
+    >>> print_rounded(geo.classification)
+    [0 0 2]
+    >>> print_rounded(geo.t)
+    [[ 1.  0.  0.  0.]
+     [ 0.  1.  0.  1.]
+     [ 0.  0.  1.  2.]
+     [ 0.  0.  0.  1.]]
+
+    """
+    items = list(items)
+    if len(items) == 0:
+        raise ValueError("'items' needs to contain at least one element")
+    if not (isinstance(chunksize, int) and chunksize > 0):
+        raise ValueError("'chunksize' needs to be an integer greater zero")
+    items = _load_items(items)
+
+    if dtype is None:
+        dtype = nptools.unify_dtypes([_item_dtype(item) for item in items])
+    else:
+        dtype = np.dtype(dtype)
+    if proj is None:
+        proj = items[0].proj
+
+    count = sum(_item_count(item) for item in items)
+    rec = np.recarray(count, dtype=dtype)
+
+    i = 0
+    is_las = True
+    for chunk, chunk_proj in _iter_chunks(items, chunksize):
+        n = chunk.size
+        if i + n > count:
+            raise ValueError("number of points changed while merging")
+        _reconcile(chunk, rec[i:i + n], chunk_proj, proj)
+        is_las = is_las and isinstance(chunk, LasRecords)
+        i = i + n
+    if not i == count:
+        raise ValueError("number of points changed while merging")
+
+    if is_las:
+        return LasRecords(proj, rec, T=T, date=date)
+    return GeoRecords(proj, rec, T=T, date=date)
+
+
+def iter_merge(items, proj=None, T=None, dtype=None, chunksize=1000000):
+    """Iterates over multiple point sets providing chunks of a common data
+    type and projection.
+
+    Parameters
+    ----------
+    items : iterable of GeoRecords or GeoFile
+        Point sets or file readers providing the points to merge.
+    proj : optional, projection.Proj
+        Projection of the merged points. If None, the projection of the first
+        item is used.
+    T : optional, array_like(Number, shape=(k+1, k+1))
+        Transformation matrix of the chunks. If None, the origin of each chunk
+        is used.
+    dtype : optional, np.dtype
+        Common data type of the chunks. If None, the data types of all items
+        are unified.
+    chunksize : optional, positive int
+        Maximum number of points loaded at once from readers providing a
+        `load_chunks` method.
+
+    Yields
+    ------
+    GeoRecords
+        Chunk of points of data type `dtype` and projection `proj`.
+
+    Notes
+    -----
+    Only a single chunk is kept in memory, so the merged points can be
+    written to a file without loading all items at once. For example, a
+    list of LAS files can be merged to a single CSV file using
+    `storage.writeCsv(iter_merge(readers), outfile)`. Readers without a
+    `load_chunks` method are loaded entirely. If `dtype` is None, they are
+    loaded in advance to determine their data types.
+
+    See Also
+    --------
+    merge, storage.writeCsv
+
+    Examples
+    --------
+
+    >>> A = GeoRecords(None, {'coords': [(0, 1), (2, 3)], 'a': [1, 2]})
+    >>> B = GeoRecords(None, {'coords': [(4, 5)], 'b': [3.5]})
+    >>> for chunk in iter_merge([A, B]):
+    ...     print(chunk.dtype.names)
+    ...     print_rounded(chunk.b)
+    ('coords', 'a', 'b')
+    [ 0.  0.]
+    ('coords', 'a', 'b')
+    [ 3.5]
+
+    """
+    items = list(items)
+    if not (isinstance(chunksize, int) and chunksize > 0):
+        raise ValueError("'chunksize' needs to be an integer greater zero")
+    if len(items) == 0:
+        return
+
+    if dtype is None:
+        items = _load_items(items)
+        dtype = nptools.unify_dtypes([_item_dtype(item) for item in items])
+    else:
+        dtype = np.dtype(dtype)
+    if proj is None:
+        proj = items[0].proj
+
+    for chunk, chunk_proj in _iter_chunks(items, chunksize):
+        rec = np.recarray(chunk.size, dtype=dtype)
+        _reconcile(chunk, rec, chunk_proj, proj)
+        yield GeoRecords(proj, rec, T=T, date=getattr(chunk, 'date', None))
+
+
+def _load_items(items):
+    # Loads file readers without a `load_chunks` method once, so their points
+    # provide the data type, the number of points and the values.
+    loaded = []
+    for item in items:
+        if not (isinstance(item, (np.ndarray, ColumnarGeoRecords)) or
+                hasattr(item, 'load_chunks')):
+            item = item.load()
+        loaded.append(item)
+    return loaded
+
+
+def _item_dtype(item):
+    # Data type of a point set or file reader.
+    if isinstance(item, (np.ndarray, ColumnarGeoRecords)):
+        return item.dtype
+    if hasattr(item, 'load_chunks'):
+        chunks = item.load_chunks(chunksize=1)
+        try:
+            return next(chunks).dtype
+        except StopIteration:
+            pass
+        finally:
+            chunks.close()
+    return item.load().dtype
+
+
+def _item_count(item):
+    # Number of points of a point set or file reader.
+    if isinstance(item, ColumnarGeoRecords):
+        return item.count
+    if isinstance(item, np.ndarray):
+        return item.size
+    return len(item)
+
+
+def _iter_chunks(items, chunksize):
+    # Yields the points of the items chunk by chunk along with their
+    # projection.
+    for item in items:
+        if isinstance(item, ColumnarGeoRecords):
+            yield item.records(), item.proj
+        elif isinstance(item, np.ndarray):
+            yield item, getattr(item, 'proj', None)
+        elif hasattr(item, 'load_chunks'):
+            for chunk in item.load_chunks(chunksize=chunksize):
+                yield chunk, item.proj
+        else:
+            yield item.load(), item.proj
+
+
+def _reconcile(chunk, rec, from_proj, to_proj):
+    # Copies the fields of `chunk` to `rec` and projects the coordinates.
+    n = chunk.size
+    for name in rec.dtype.names:
+        if name in chunk.dtype.names:
+            shape = (n, ) + rec.dtype[name].shape
+            rec[name] = chunk[name].reshape(shape)
+        else:
+            rec[name] = np.zeros(1, dtype=rec.dtype[name])
+    if from_proj is not None and to_proj is not None:
+        if not from_proj.proj4 == to_proj.proj4:
+            rec['coords'] = projection.project(rec.coords, from_proj, to_proj)
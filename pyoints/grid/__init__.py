@@ -20,3 +20,5 @@
 
 from .grid import *
 from .transformation import *
+from .sparse import *
+from .rangeimage import *
@@ -24,8 +24,11 @@ import pandas
 
 from .. import (
     assertion,
+    interpolate,
     nptools,
+    profiling,
     projection,
+    transformation,
 )
 from .. georecords import GeoRecords
 from .. extent import Extent
@@ -567,6 +570,7 @@ class Grid(GeoRecords):
         return voxelize(rec, self.t, shape=self.shape, **kwargs)
 
 
+@profiling.profile('grid.voxelize', points='rec')
 def voxelize(rec, T, shape=None, agg_func=None, dtype=None):
     """Aggregates a point cloud to a voxel or raster.
 
@@ -595,7 +599,7 @@ def voxelize(rec, T, shape=None, agg_func=None, dtype=None):
 
     See Also
     --------
-    Grid, np.apply_function
+    Grid, SparseGrid, np.apply_function
 
     Examples
     --------
@@ -705,3 +709,257 @@ def voxelize(rec, T, shape=None, agg_func=None, dtype=None):
         res = Grid(rec.proj, res, T, date=rec.date)
 
     return res
+
+
+def rasterize(
+        rec,
+        T,
+        field='z',
+        stat='min',
+        fill=None,
+        shape=None,
+        q=50,
+        proj=None):
+    """Aggregates point values to a raster or voxel space. In contrast to
+    `voxelize`, the values are aggregated using vectorized reductions, so no
+    Python function is called per cell.
+
+    Parameters
+    ----------
+    rec : np.recarray(shape=(n, )) or iterable of np.recarray
+        Numpy record array of `n` points to rasterize. It requires a two
+        dimensional field 'coords' associated with `k` dimensional
+        coordinates. Alternatively, an iterable of record arrays, like the
+        chunks provided by `LasReader.load_chunks`, is aggregated chunk by
+        chunk.
+    T : array_like(Number, shape=(m+1, m+1))
+        Transformation matrix defining the `m <= k` dimensional raster.
+    field : optional, str
+        Field to aggregate. The names 'x', 'y' and 'z' refer to the
+        coordinate axes, if `rec` has no such field.
+    stat : optional, str
+        Aggregation statistic. Either 'min', 'max', 'mean', 'count' or 'pct'.
+    fill : optional, str
+        Interpolation method to fill empty cells. Either 'idw' for inverse
+        distance weighting or 'tin' for linear interpolation within a
+        triangulated irregular network. If None, empty cells are set to
+        `np.nan`.
+    shape : optional, array_like(int, shape=(m))
+        Shape of the output raster. If None, `shape` is fit to `rec.coords`.
+        Required for chunked input.
+    q : optional, Number
+        Percentile in range [0, 100] used if `stat` is 'pct'.
+    proj : optional, Proj
+        Projection of the raster. If None, the projection of `rec` is used,
+        if available.
+
+    Returns
+    -------
+    Grid
+        Raster with the aggregated values in field `field` and the number of
+        points per cell in field 'num_points'.
+
+    Notes
+    -----
+    For statistic 'pct', the cell indices and values of all chunks are kept
+    in memory.
+
+    See Also
+    --------
+    voxelize, LasReader.load_chunks
+
+    Examples
+    --------
+
+    >>> from pyoints import transformation
+
+    Create record array with coordinates.
+
+    >>> coords = [
+    ...     (0, 0, 3), (1, 0.5, 1), (2, 2, 4), (4, 6, 2), (3, 2, 8), (1, 5, 7),
+    ...     (3, 0, 5), (2.2, 1.5, 6)
+    ... ]
+    >>> rec = np.recarray(len(coords), dtype=[('coords', float, 3)])
+    >>> rec['coords'] = coords
+    >>> T = transformation.matrix(s=(2.5, 3), t=[0, 0])
+
+    Derive the lowest and highest z-values per cell.
+
+    >>> raster = rasterize(rec, T, field='z', stat='min')
+    >>> print_rounded(raster.shape)
+    (3, 2)
+    >>> print_rounded(raster.z)
+    [[  1.   5.]
+     [  7.  nan]
+     [ nan   2.]]
+    >>> print_rounded(raster.num_points)
+    [[4 2]
+     [1 0]
+     [0 1]]
+    >>> print_rounded(rasterize(rec, T, stat='max').z)
+    [[  6.   8.]
+     [  7.  nan]
+     [ nan   2.]]
+
+    Calculate the mean and the median of the z-values. Fill empty cells by
+    inverse distance weighting.
+
+    >>> print_rounded(rasterize(rec, T, stat='mean').z, 2)
+    [[ 3.5  6.5]
+     [ 7.   nan]
+     [ nan  2. ]]
+    >>> print_rounded(rasterize(rec, T, stat='pct', q=50, fill='idw').z, 2)
+    [[ 3.5   6.5 ]
+     [ 7.    5.28]
+     [ 4.13  2.  ]]
+
+    Aggregate chunks of points.
+
+    >>> chunks = [rec[:3], rec[3:]]
+    >>> raster = rasterize(chunks, T, stat='min', shape=(3, 2))
+    >>> print_rounded(raster.z)
+    [[  1.   5.]
+     [  7.  nan]
+     [ nan   2.]]
+
+    """
+    T = transformation.LocalSystem(assertion.ensure_tmatrix(T))
+    dim = T.dim
+    if stat not in ('min', 'max', 'mean', 'count', 'pct'):
+        raise ValueError("unknown statistic '%s'" % stat)
+    if fill not in (None, 'idw', 'tin'):
+        raise ValueError("unknown fill method '%s'" % fill)
+    if not isinstance(field, str):
+        raise TypeError("'field' needs to be a string")
+    if stat == 'pct' and not (q >= 0 and q <= 100):
+        raise ValueError("'q' needs to be in range [0, 100]")
+
+    if isinstance(rec, np.recarray):
+        chunks = [rec]
+    elif hasattr(rec, '__iter__'):
+        if shape is None:
+            raise ValueError("'shape' required for chunked input")
+        chunks = rec
+    else:
+        raise TypeError("'rec' needs an instance of np.recarray")
+    if shape is not None:
+        shape = tuple(assertion.ensure_shape(shape, dim=dim))
+
+    date = None
+    counts = None
+    for chunk in chunks:
+        keys, values = _rasterize_chunk(chunk, T, field)
+        if isinstance(chunk, GeoRecords):
+            if proj is None:
+                proj = chunk.proj
+            date = chunk.date
+
+        if counts is None:
+            # initialize accumulators
+            if shape is None:
+                shape = tuple(keys.max(0) + 1) if len(keys) > 0 else (0,) * dim
+            size = int(np.product(shape))
+            counts = np.zeros(size, dtype=int)
+            if stat == 'min':
+                acc = np.full(size, np.inf)
+            elif stat == 'max':
+                acc = np.full(size, -np.inf)
+            elif stat == 'mean':
+                acc = np.zeros(size, dtype=float)
+            elif stat == 'pct':
+                pct_indices = []
+                pct_values = []
+
+        # cut by extent
+        mask = np.all((keys >= 0) & (keys < shape), axis=1)
+        indices = np.ravel_multi_index(tuple(keys[mask, :].T), shape)
+        values = values[mask]
+
+        counts += np.bincount(indices, minlength=size)
+        if stat in ('min', 'max'):
+            order = np.lexsort((values, indices))
+            sorted_indices = indices[order]
+            change = sorted_indices[1:] != sorted_indices[:-1]
+            if stat == 'min':
+                first = np.concatenate(([True], change))
+            else:
+                first = np.concatenate((change, [True]))
+            cells = sorted_indices[first]
+            reduced = values[order][first]
+            if stat == 'min':
+                acc[cells] = np.minimum(acc[cells], reduced)
+            else:
+                acc[cells] = np.maximum(acc[cells], reduced)
+        elif stat == 'mean':
+            acc += np.bincount(indices, weights=values, minlength=size)
+        elif stat == 'pct':
+            pct_indices.append(indices)
+            pct_values.append(values)
+
+    if counts is None:
+        raise ValueError("no points to rasterize")
+
+    # finalize aggregation
+    filled = counts > 0
+    if stat == 'count':
+        values = counts.astype(float)
+    elif stat == 'mean':
+        values = np.full(size, np.nan)
+        values[filled] = acc[filled] / counts[filled]
+    elif stat == 'pct':
+        indices = np.concatenate(pct_indices)
+        values = np.concatenate(pct_values)
+        sorted_values = values[np.lexsort((values, indices))]
+        starts = np.cumsum(counts) - counts
+        pos = q / 100.0 * (counts[filled] - 1)
+        lower = sorted_values[starts[filled] + np.floor(pos).astype(int)]
+        upper = sorted_values[starts[filled] + np.ceil(pos).astype(int)]
+        values = np.full(size, np.nan)
+        values[filled] = lower + (upper - lower) * (pos - np.floor(pos))
+    else:
+        values = acc
+        values[~filled] = np.nan
+
+    # fill empty cells
+    if fill is not None and np.any(filled) and not np.all(filled):
+        keys = nptools.indices(shape, flatten=True)
+        ccoords = keys_to_coords(T, keys)
+        if fill == 'idw':
+            interpolator = interpolate.KnnInterpolator(
+                ccoords[filled, :], values[filled])
+        else:
+            interpolator = interpolate.LinearInterpolator(
+                ccoords[filled, :], values[filled])
+        values[~filled] = interpolator(ccoords[~filled, :])
+
+    res = np.recarray(shape, dtype=[(field, float), ('num_points', int)])
+    res[field] = values.reshape(shape)
+    res['num_points'] = counts.reshape(shape)
+
+    if proj is None:
+        proj = projection.Proj()
+    return Grid(proj, res, T, date=date)
+
+
+def _rasterize_chunk(rec, T, field):
+    # Helper function to receive the cell keys and values of some points.
+    if not isinstance(rec, np.recarray):
+        raise TypeError("'rec' needs an instance of np.recarray")
+    if 'coords' not in rec.dtype.names:
+        raise ValueError("'rec' requires field 'coords'")
+    coords = assertion.ensure_coords(rec.coords, min_dim=T.dim)
+
+    if field in rec.dtype.names:
+        values = rec[field]
+    elif field in ('x', 'y', 'z'):
+        axis = ('x', 'y', 'z').index(field)
+        if axis >= coords.shape[1]:
+            raise ValueError("'rec' has no coordinate axis '%s'" % field)
+        values = coords[:, axis]
+    else:
+        raise ValueError("'rec' needs to have a field '%s'" % field)
+    if not len(values.shape) == 1:
+        raise ValueError("field '%s' needs to be one dimensional" % field)
+
+    keys = np.floor(T.to_global(coords[:, :T.dim])).astype(int)[:, ::-1]
+    return keys, values.astype(float)
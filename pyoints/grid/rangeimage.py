@@ -0,0 +1,479 @@
+# BEGIN OF LICENSE NOTE
+# This file is part of Pyoints.
+# Copyright (c) 2018, Sebastian Lamprecht, Trier University,
+# lamprecht@uni-trier.de
+#
+# Pyoints is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyoints is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pyoints. If not, see <https://www.gnu.org/licenses/>.
+# END OF LICENSE NOTE
+"""Handling of range images of terrestrial laser scans."""
+
+import numpy as np
+from numbers import Number
+
+from .. import (
+    assertion,
+    polar,
+    projection,
+    transformation,
+)
+from .grid import Grid
+
+from ..misc import print_rounded
+
+
+class RangeImage(object):
+    """Range image of a terrestrial laser scan. The points are binned into
+    an image of zenith (rows) and azimuth (columns) angles relative to the
+    scanner position. Neighbouring points in the scan topology are found by
+    simple image lookups instead of spatial queries.
+
+    Parameters
+    ----------
+    coords : array_like(Number, shape=(n, 3))
+        Represents `n` points of three dimensions.
+    resolution : positive Number or array_like(Number, shape=(2))
+        Angular resolution of the image in radians. Either a single value or
+        the resolutions of the azimuth and zenith angles.
+    center : optional, array_like(Number, shape=(3))
+        Position of the scanner. Defaults to the origin.
+
+    Attributes
+    ----------
+    center : np.ndarray(Number, shape=(3))
+        Position of the scanner.
+    resolution : np.ndarray(Number, shape=(2))
+        Resolution of the azimuth and zenith angles. The azimuth resolution
+        is adjusted slightly, so the columns cover the full circle.
+    shape : tuple of int
+        Number of rows and columns of the image.
+    keys : np.ndarray(int, shape=(n, 2))
+        Row and column of the pixel each point is located in.
+    ranges : np.ndarray(Number, shape=(n))
+        Distances of the points to the scanner.
+    image : np.ndarray(int, shape=shape)
+        Indices of the points closest to the scanner per pixel. Set to -1 for
+        empty pixels.
+    num_points : np.ndarray(int, shape=shape)
+        Number of points per pixel.
+    t : np.matrix(Number, shape=(3, 3))
+        Transformation matrix of the image. It converts pixel indices to
+        azimuth and zenith angles.
+
+    Notes
+    -----
+    The azimuth of a point is measured in the x-y plane starting at the
+    x-axis, the zenith angle is measured starting at the z-axis. Columns
+    wrap around, so the first and the last column are neighbours. The rows
+    cover the range of zenith angles of the points only.
+
+    See Also
+    --------
+    polar.coords_to_polar, SparseGrid
+
+    Examples
+    --------
+
+    Create a scan of two parallel walls with a gap in depth.
+
+    >>> azimuth, zenith = np.meshgrid(
+    ...     np.arange(-9.5, 10), np.arange(80.5, 100))
+    >>> azimuth = np.deg2rad(azimuth.ravel())
+    >>> zenith = np.deg2rad(zenith.ravel())
+    >>> x = np.where(azimuth < 0, 5.0, 10.0)
+    >>> ranges = x / (np.sin(zenith) * np.cos(azimuth))
+    >>> pcoords = np.vstack((ranges, azimuth, zenith)).T
+    >>> coords = polar.polar_to_coords(pcoords) + [1, 2, 3]
+
+    Create the range image with a resolution of one degree.
+
+    >>> image = RangeImage(coords, np.pi / 180, center=[1, 2, 3])
+    >>> print(image.shape)
+    (20, 360)
+    >>> print_rounded(image.keys[[0, 1, 19, 20], :])
+    [[  0 170]
+     [  0 171]
+     [  0 189]
+     [  1 170]]
+    >>> print_rounded(image.ranges[:3], 2)
+    [ 5.14  5.13  5.11]
+
+    Look up the closest points of pixels.
+
+    >>> print_rounded(image.lookup([(0, 170), (0, 171), (20, 171), (0, 0)]))
+    [ 0  1 -1 -1]
+
+    Find the points of the neighbouring pixels.
+
+    >>> print_rounded(image.neighbours(indices=[0, 30]))
+    [[-1 -1 -1 -1  1 -1 20 21]
+     [ 9 10 11 29 31 49 50 51]]
+
+    Convert coordinates to keys and back.
+
+    >>> keys = image.coords_to_keys(coords[:3, :])
+    >>> print_rounded(keys)
+    [[  0 170]
+     [  0 171]
+     [  0 172]]
+    >>> print_rounded(image.keys_to_coords(keys, image.ranges[:3]), 2)
+    [[ 6.    1.16  3.85]
+     [ 6.    1.25  3.85]
+     [ 6.    1.34  3.84]]
+    >>> print_rounded(coords[:3, :], 2)
+    [[ 6.    1.16  3.85]
+     [ 6.    1.25  3.85]
+     [ 6.    1.34  3.84]]
+
+    Fit normals using the image neighbourhood. The normals are oriented
+    towards the scanner. Neighbours of the other wall are excluded by
+    limiting the difference of ranges.
+
+    >>> normals = image.normals(max_dist=1)
+    >>> print_rounded(normals[[0, 9, 10, 399], :], 2)
+    [[-1.  0.  0.]
+     [-1.  0.  0.]
+     [-1.  0.  0.]
+     [-1.  0.  0.]]
+
+    Remove the points at the range discontinuity.
+
+    >>> fIds = image.jump_filter(1)
+    >>> print_rounded(len(coords) - len(fIds))
+    40
+
+    Convert to a grid of azimuth and zenith angles.
+
+    >>> grid = image.to_grid()
+    >>> print(sorted(grid.dtype.names))
+    ['coords', 'index', 'num_points', 'range']
+    >>> print_rounded(grid.shape)
+    (20, 360)
+    >>> print_rounded(grid.range[0, 168:173], 2)
+    [  nan   nan  5.14  5.13  5.11]
+    >>> print_rounded(grid.index[0, 168:173])
+    [-1 -1  0  1  2]
+
+    """
+
+    def __init__(self, coords, resolution, center=None):
+        coords = assertion.ensure_coords(coords, dim=3)
+        if len(coords) == 0:
+            raise ValueError("at least one point required")
+
+        if isinstance(resolution, Number):
+            resolution = [resolution, resolution]
+        resolution = assertion.ensure_numvector(resolution, length=2)
+        if not np.all(resolution > 0):
+            raise ValueError("'resolution' needs to be greater zero")
+
+        if center is None:
+            center = np.zeros(3, dtype=float)
+        center = assertion.ensure_numvector(center, length=3)
+
+        # divide the full circle into columns of equal size
+        n_cols = max(int(np.round(2 * np.pi / resolution[0])), 1)
+        resolution = np.array([2 * np.pi / n_cols, resolution[1]], float)
+
+        pcoords = polar.coords_to_polar(coords - center)
+        rows = np.floor(pcoords[:, 2] / resolution[1]).astype(np.int64)
+        min_row = rows.min()
+        rows -= min_row
+        cols = np.floor((pcoords[:, 1] + np.pi) / resolution[0])
+        cols = cols.astype(np.int64) % n_cols
+
+        self._coords = coords
+        self._center = center
+        self._resolution = resolution
+        self._min_row = min_row
+        self._shape = (int(rows.max()) + 1, n_cols)
+        self._keys = np.vstack((rows, cols)).T
+        self._ranges = pcoords[:, 0]
+
+        # closest point per pixel
+        pixels = rows * n_cols + cols
+        order = np.lexsort((self._ranges, pixels))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = pixels[order[1:]] != pixels[order[:-1]]
+        image = -np.ones(self._shape[0] * n_cols, dtype=np.int64)
+        image[pixels[order[first]]] = order[first]
+        self._image = image.reshape(self._shape)
+
+        num_points = np.bincount(pixels, minlength=len(image))
+        self._num_points = num_points.reshape(self._shape)
+
+    @property
+    def center(self):
+        return self._center
+
+    @property
+    def resolution(self):
+        return self._resolution
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def keys(self):
+        return self._keys
+
+    @property
+    def ranges(self):
+        return self._ranges
+
+    @property
+    def image(self):
+        return self._image
+
+    @property
+    def num_points(self):
+        return self._num_points
+
+    @property
+    def t(self):
+        origin = [-np.pi, self._min_row * self._resolution[1]]
+        return transformation.matrix(
+            t=origin, s=self._resolution, order='rst')
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def coords_to_keys(self, coords):
+        """Converts Cartesian coordinates to pixel keys.
+
+        Parameters
+        ----------
+        coords : array_like(Number, shape=(n, 3))
+            Coordinates to convert.
+
+        Returns
+        -------
+        np.ndarray(int, shape=(n, 2))
+            Rows and columns of the pixels the coordinates are located in.
+            Rows might be located outside of the image.
+
+        """
+        coords = assertion.ensure_coords(coords, dim=3)
+        pcoords = polar.coords_to_polar(coords - self._center)
+        rows = np.floor(pcoords[:, 2] / self._resolution[1]).astype(np.int64)
+        cols = np.floor((pcoords[:, 1] + np.pi) / self._resolution[0])
+        cols = cols.astype(np.int64) % self._shape[1]
+        return np.vstack((rows - self._min_row, cols)).T
+
+    def keys_to_coords(self, keys, ranges):
+        """Converts pixel keys to Cartesian coordinates.
+
+        Parameters
+        ----------
+        keys : array_like(int, shape=(n, 2))
+            Rows and columns of pixels.
+        ranges : array_like(Number, shape=(n))
+            Distances to the scanner.
+
+        Returns
+        -------
+        np.ndarray(Number, shape=(n, 3))
+            Coordinates of the pixel centers at the given distances.
+
+        """
+        keys = assertion.ensure_numarray(keys)
+        if not (len(keys.shape) == 2 and keys.shape[1] == 2):
+            raise ValueError("'keys' needs to have shape (n, 2)")
+        ranges = assertion.ensure_numvector(ranges, length=len(keys))
+        azimuth = (keys[:, 1] + 0.5) * self._resolution[0] - np.pi
+        zenith = (keys[:, 0] + self._min_row + 0.5) * self._resolution[1]
+        pcoords = np.vstack((ranges, azimuth, zenith)).T
+        return polar.polar_to_coords(pcoords) + self._center
+
+    def lookup(self, keys):
+        """Finds the closest points of pixels.
+
+        Parameters
+        ----------
+        keys : array_like(int, shape=(n, 2))
+            Rows and columns of pixels. Columns wrap around.
+
+        Returns
+        -------
+        np.ndarray(int, shape=(n))
+            Indices of the points. Set to -1 for empty pixels or pixels
+            outside of the image.
+
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        if not (len(keys.shape) == 2 and keys.shape[1] == 2):
+            raise ValueError("'keys' needs to have shape (n, 2)")
+        rows = keys[:, 0]
+        cols = keys[:, 1] % self._shape[1]
+        mask = (rows >= 0) & (rows < self._shape[0])
+        ids = -np.ones(len(keys), dtype=np.int64)
+        ids[mask] = self._image[rows[mask], cols[mask]]
+        return ids
+
+    def neighbours(self, size=1, indices=None):
+        """Finds the closest points of the pixels surrounding each point.
+
+        Parameters
+        ----------
+        size : optional, positive int
+            Number of pixels to consider in each direction. The window of a
+            point covers `2 * size + 1` rows and columns.
+        indices : optional, array_like(int, shape=(m))
+            Indices of points to find the neighbours for. If None, all points
+            are considered.
+
+        Returns
+        -------
+        np.ndarray(int, shape=(m, (2 * size + 1)**2 - 1))
+            Indices of the neighbouring points. The pixel of the point itself
+            is excluded. Set to -1 for empty pixels.
+
+        """
+        keys = self._window_keys(size, indices)
+        m, w = keys.shape[:2]
+        center = w // 2
+        keys = np.delete(keys, center, axis=1)
+        return self.lookup(keys.reshape((-1, 2))).reshape((m, w - 1))
+
+    def normals(self, size=1, max_dist=np.inf, indices=None, bulk=100000):
+        """Fits normals to the points using the closest points of the
+        surrounding pixels.
+
+        Parameters
+        ----------
+        size : optional, positive int
+            Number of pixels to consider in each direction.
+        max_dist : optional, positive Number
+            Maximum difference of the ranges of neighbouring points. Points
+            of occluding or occluded surfaces are excluded this way.
+        indices : optional, array_like(int, shape=(m))
+            Indices of points to fit normals for. If None, all points are
+            considered.
+        bulk : optional, positive int
+            Number of points processed at once.
+
+        Returns
+        -------
+        np.ndarray(Number, shape=(m, 3))
+            Normals oriented towards the scanner. Set to zero, if less than
+            three neighbouring points are available.
+
+        See Also
+        --------
+        normals.fit_normals
+
+        """
+        if not (isinstance(max_dist, Number) and max_dist > 0):
+            raise ValueError("'max_dist' needs to be a number greater zero")
+        if not (isinstance(bulk, int) and bulk > 0):
+            raise ValueError("'bulk' needs to be an integer greater zero")
+        indices = self._indices(indices)
+
+        normals = np.zeros((len(indices), 3), dtype=float)
+        for i in range(0, len(indices), bulk):
+            ids = indices[i:i + bulk]
+            nIds = np.hstack((ids[:, None], self.neighbours(size, ids)))
+            valid = self._valid_neighbours(ids, nIds, max_dist)
+
+            # weighted covariance matrices of the neighbourhoods
+            weights = valid.astype(float)
+            counts = weights.sum(1)
+            nCoords = self._coords[nIds, :]
+            means = (nCoords * weights[:, :, None]).sum(1) / counts[:, None]
+            nCoords -= means[:, None, :]
+            nCoords *= weights[:, :, None]
+            cov = np.einsum('mwi,mwj->mij', nCoords, nCoords)
+
+            mask = counts >= 3
+            eig_vec = np.linalg.eigh(cov[mask])[1]
+            normals[i:i + bulk][mask] = eig_vec[:, :, 0]
+
+        # orient towards the scanner
+        flip = (normals * (self._center - self._coords[indices, :])).sum(1)
+        normals[flip < 0] *= -1
+        return normals
+
+    def jump_filter(self, max_dist, size=1):
+        """Filters points at range discontinuities. Such points are typically
+        located at the edges of occluding objects or represent mixed pixels.
+
+        Parameters
+        ----------
+        max_dist : positive Number
+            Maximum difference of the ranges of neighbouring points.
+        size : optional, positive int
+            Number of pixels to consider in each direction.
+
+        Returns
+        -------
+        np.ndarray(int, shape=(m))
+            Indices of the points with ranges similar to their neighbours.
+
+        """
+        if not (isinstance(max_dist, Number) and max_dist > 0):
+            raise ValueError("'max_dist' needs to be a number greater zero")
+        indices = np.arange(len(self))
+        nIds = self.neighbours(size)
+        valid = self._valid_neighbours(indices, nIds, max_dist)
+        jump = np.any((nIds >= 0) & ~valid, axis=1)
+        return indices[~jump]
+
+    def to_grid(self, proj=None):
+        """Converts the range image to a grid of azimuth and zenith angles.
+
+        Parameters
+        ----------
+        proj : optional, Proj
+            Projection of the grid. Defaults to `Proj()`.
+
+        Returns
+        -------
+        Grid
+            Grid with the fields 'index' (closest point), 'range' (distance
+            of the closest point, `np.nan` for empty pixels) and
+            'num_points'.
+
+        """
+        if proj is None:
+            proj = projection.Proj()
+        dtype = [('index', np.int64), ('range', float), ('num_points', int)]
+        rec = np.recarray(self._shape, dtype=dtype)
+        rec.index = self._image
+        rec.range = np.nan
+        mask = self._image >= 0
+        rec.range[mask] = self._ranges[self._image[mask]]
+        rec.num_points = self._num_points
+        return Grid(proj, rec, self.t)
+
+    def _indices(self, indices):
+        # Validates point indices.
+        if indices is None:
+            return np.arange(len(self))
+        return assertion.ensure_indices(indices, max_value=len(self) - 1)
+
+    def _window_keys(self, size, indices):
+        # Keys of the pixels surrounding the points.
+        if not (isinstance(size, int) and size > 0):
+            raise ValueError("'size' needs to be an integer greater zero")
+        indices = self._indices(indices)
+        offsets = np.arange(-size, size + 1)
+        offsets = np.array(np.meshgrid(offsets, offsets, indexing='ij'))
+        offsets = offsets.reshape((2, -1)).T
+        return self._keys[indices, None, :] + offsets[None, :, :]
+
+    def _valid_neighbours(self, indices, nIds, max_dist):
+        # Identifies neighbours with ranges similar to the points.
+        ranges = self._ranges[nIds]
+        ranges -= self._ranges[indices, None]
+        return (nIds >= 0) & (np.abs(ranges) <= max_dist)
@@ -0,0 +1,543 @@
+# BEGIN OF LICENSE NOTE
+# This file is part of Pyoints.
+# Copyright (c) 2018, Sebastian Lamprecht, Trier University,
+# lamprecht@uni-trier.de
+#
+# Pyoints is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyoints is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pyoints. If not, see <https://www.gnu.org/licenses/>.
+# END OF LICENSE NOTE
+"""Handling of sparse grids storing occupied cells only."""
+
+import itertools
+import warnings
+import numpy as np
+
+from .. import (
+    assertion,
+    nptools,
+    projection,
+    transformation,
+)
+from ..georecords import GeoRecords
+from .grid import Grid
+from .transformation import keys_to_coords
+
+from ..misc import print_rounded
+
+
+class SparseGrid(object):
+    """Sparse raster or voxel grid. In contrast to `Grid`, only the cells
+    occupied by points are stored, so the memory scales with the number of
+    occupied cells instead of the extent of the grid.
+
+    Parameters
+    ----------
+    rec : np.recarray(shape=(n, ))
+        Numpy record array of `n` points. It requires a two dimensional field
+        'coords' associated with `k` dimensional coordinates.
+    T : array_like(Number, shape=(m+1, m+1))
+        Transformation matrix defining the `m <= k` dimensional grid. See
+        `Grid`.
+    proj : optional, Proj
+        Projection of the grid. If None, the projection of `rec` is used, if
+        available.
+
+    Attributes
+    ----------
+    t : np.matrix(Number, shape=(m+1, m+1))
+        Transformation matrix of the grid.
+    proj : Proj
+        Projection of the grid.
+    dim : positive int
+        Number of grid dimensions `m`.
+    count : positive int
+        Number of occupied cells `c`.
+    packed_keys : np.ndarray(int, shape=(c))
+        Sorted packed keys of the occupied cells.
+    keys : np.ndarray(int, shape=(c, m))
+        Keys of the occupied cells. Similar to `Grid` the keys are ordered by
+        rows (y-axis) first.
+    indptr, indices : np.ndarray(int)
+        Membership of the points in compressed sparse row format. The indices
+        of the points located in cell `i` are given by
+        `indices[indptr[i]:indptr[i+1]]`.
+    num_points : np.ndarray(int, shape=(c))
+        Number of points per occupied cell.
+
+    Notes
+    -----
+    Keys are derived by rounding down, so points with coordinates smaller
+    than the origin of `T` receive negative keys.
+
+    See Also
+    --------
+    Grid, voxelize, rasterize
+
+    Examples
+    --------
+
+    >>> coords = [
+    ...     (0.5, 0.5, 0.2), (0.6, 0.2, 0.4), (1.5, 0.5, 0.3),
+    ...     (0.2, 1.7, 0.4), (9.5, 9.5, 9.5), (-0.5, 0.5, 0.2)
+    ... ]
+    >>> rec = nptools.recarray({
+    ...     'coords': coords, 'intensity': [1, 3, 4, 5, 6, 7]
+    ... })
+    >>> T = transformation.matrix(t=[0, 0, 0], s=[1, 1, 1])
+    >>> sgrid = SparseGrid(rec, T)
+
+    >>> print_rounded(sgrid.count)
+    5
+    >>> print_rounded(sgrid.keys)
+    [[ 0  0 -1]
+     [ 0  0  0]
+     [ 0  0  1]
+     [ 0  1  0]
+     [ 9  9  9]]
+    >>> print_rounded(sgrid.num_points)
+    [1 2 1 1 1]
+    >>> print_rounded(sgrid.points(1))
+    [0 1]
+
+    Convert coordinates to keys and look up the corresponding cells.
+
+    >>> keys = sgrid.coords_to_keys([(0.7, 0.1, 0.1), (5.5, 5.5, 5.5)])
+    >>> print_rounded(keys)
+    [[0 0 0]
+     [5 5 5]]
+    >>> print_rounded(sgrid.lookup(keys))
+    [ 1 -1]
+    >>> print_rounded(sgrid.keys_to_coords(keys))
+    [[ 0.5  0.5  0.5]
+     [ 5.5  5.5  5.5]]
+
+    Aggregate values per cell.
+
+    >>> print_rounded(sgrid.reduce('intensity', stat='mean'))
+    [ 7.  2.  4.  5.  6.]
+    >>> print_rounded(sgrid.reduce('intensity', stat='max'))
+    [7 3 4 5 6]
+
+    Find neighbouring cells.
+
+    >>> print_rounded(sgrid.neighbours(connectivity=6)[1])
+    [-1 -1  0  2  3 -1]
+
+    Convert to records of occupied cells.
+
+    >>> geo = sgrid.to_records({'intensity': sgrid.reduce('intensity')})
+    >>> print(geo.dtype.names)
+    ('coords', 'keys', 'num_points', 'intensity')
+    >>> print_rounded(geo.coords)
+    [[-0.5  0.5  0.5]
+     [ 0.5  0.5  0.5]
+     [ 1.5  0.5  0.5]
+     [ 0.5  1.5  0.5]
+     [ 9.5  9.5  9.5]]
+
+    Convert to a dense grid.
+
+    >>> grid = sgrid.to_grid()
+    >>> print_rounded(grid.shape)
+    (10, 10, 11)
+    >>> print_rounded(grid.t.origin)
+    [-1.  0.  0.]
+    >>> print_rounded(grid.num_points[0, 0, :3])
+    [1 2 1]
+    >>> print_rounded(grid.num_points.sum())
+    6
+
+    """
+
+    def __init__(self, rec, T, proj=None):
+        if not isinstance(rec, np.recarray):
+            raise TypeError("'rec' needs an instance of np.recarray")
+        if 'coords' not in rec.dtype.names:
+            raise ValueError("'rec' requires field 'coords'")
+        T = assertion.ensure_tmatrix(T)
+        coords = assertion.ensure_coords(rec.coords, min_dim=T.dim)
+        if proj is None:
+            proj = getattr(rec, 'proj', None)
+
+        self.t = T
+        self.proj = proj
+        self._rec = rec
+
+        keys = self.coords_to_keys(coords[:, :T.dim])
+
+        # define the packing of keys with a margin of one cell
+        if len(keys) == 0:
+            self._min_key = -np.ones(T.dim, dtype=np.int64)
+            span = np.full(T.dim, 2, dtype=np.int64)
+        else:
+            self._min_key = keys.min(0) - 1
+            span = keys.max(0) - self._min_key + 2
+        if np.prod(span.astype(float)) >= 2**62:
+            raise ValueError("extent of the grid too large to pack the keys")
+        self._span = span
+        self._strides = np.append(np.cumprod(span[:0:-1])[::-1], 1)
+
+        # group points by cell
+        packed = self.pack_keys(keys)
+        order = np.argsort(packed, kind='mergesort')
+        sorted_keys = packed[order]
+        starts = np.where(np.diff(sorted_keys) != 0)[0] + 1
+        starts = np.concatenate(([0], starts)) if len(keys) > 0 else starts
+
+        self._packed_keys = sorted_keys[starts]
+        self._indptr = np.append(starts, len(keys))
+        self._indices = order
+
+    @property
+    def t(self):
+        return self._t
+
+    @t.setter
+    def t(self, t):
+        self._t = assertion.ensure_tmatrix(t)
+
+    @property
+    def proj(self):
+        return self._proj
+
+    @proj.setter
+    def proj(self, proj):
+        if proj is None:
+            proj = projection.Proj()
+            warnings.warn("'proj' not set, so I assume '%s'" % proj.proj4)
+        elif not isinstance(proj, projection.Proj):
+            raise TypeError("'proj' needs to be of type 'projection.Proj'")
+        self._proj = proj
+
+    @property
+    def dim(self):
+        return self.t.dim
+
+    @property
+    def count(self):
+        return len(self._packed_keys)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def packed_keys(self):
+        return self._packed_keys
+
+    @property
+    def keys(self):
+        return self.unpack_keys(self._packed_keys)
+
+    @property
+    def indptr(self):
+        return self._indptr
+
+    @property
+    def indices(self):
+        return self._indices
+
+    @property
+    def num_points(self):
+        return np.diff(self._indptr)
+
+    def coords_to_keys(self, coords):
+        """Converts coordinates to cell keys.
+
+        Parameters
+        ----------
+        coords : array_like(Number, shape=(n, m))
+            Coordinates to convert.
+
+        Returns
+        -------
+        np.ndarray(int, shape=(n, m))
+            Keys of the cells the coordinates are located in.
+
+        """
+        coords = assertion.ensure_coords(coords, dim=self.dim)
+        values = np.floor(self.t.to_global(coords))
+        return values.astype(np.int64)[:, ::-1]
+
+    def keys_to_coords(self, keys):
+        """Converts cell keys to coordinates of the cell centers.
+
+        Parameters
+        ----------
+        keys : array_like(int, shape=(n, m))
+            Keys to convert.
+
+        Returns
+        -------
+        np.ndarray(Number, shape=(n, m))
+            Coordinates of the cell centers.
+
+        """
+        keys = assertion.ensure_numarray(keys)
+        if len(keys) == 0:
+            return np.zeros((0, self.dim), dtype=float)
+        return keys_to_coords(self.t, keys)
+
+    def pack_keys(self, keys):
+        """Packs cell keys to single integers.
+
+        Parameters
+        ----------
+        keys : array_like(int, shape=(n, m))
+            Keys to pack. The keys need to be within the extent of the grid
+            or adjacent to it.
+
+        Returns
+        -------
+        np.ndarray(int, shape=(n))
+            Packed keys.
+
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        if not (len(keys.shape) == 2 and keys.shape[1] == self.dim):
+            raise ValueError("'keys' needs to have shape (n, %i)" % self.dim)
+        return (keys - self._min_key) @ self._strides
+
+    def unpack_keys(self, packed_keys):
+        """Converts packed keys to cell keys.
+
+        Parameters
+        ----------
+        packed_keys : array_like(int, shape=(n))
+            Keys packed by `pack_keys`.
+
+        Returns
+        -------
+        np.ndarray(int, shape=(n, m))
+            Unpacked keys.
+
+        """
+        packed_keys = np.asarray(packed_keys, dtype=np.int64)
+        keys = (packed_keys[:, None] // self._strides) % self._span
+        return keys + self._min_key
+
+    def lookup(self, keys):
+        """Finds the occupied cells of given keys.
+
+        Parameters
+        ----------
+        keys : array_like(int, shape=(n, m))
+            Keys of the cells to look up.
+
+        Returns
+        -------
+        np.ndarray(int, shape=(n))
+            Indices of the occupied cells. Set to -1 for empty cells.
+
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        if not (len(keys.shape) == 2 and keys.shape[1] == self.dim):
+            raise ValueError("'keys' needs to have shape (n, %i)" % self.dim)
+        mask = np.all(
+            (keys >= self._min_key) & (keys < self._min_key + self._span),
+            axis=1
+        )
+        cells = -np.ones(len(keys), dtype=np.int64)
+        cells[mask] = self._lookup_packed(self.pack_keys(keys[mask]))
+        return cells
+
+    def _lookup_packed(self, packed_keys):
+        # Finds the occupied cells of packed keys.
+        cells = np.searchsorted(self._packed_keys, packed_keys)
+        cells[cells == self.count] = 0
+        if self.count > 0:
+            found = self._packed_keys[cells] == packed_keys
+        else:
+            found = np.zeros(cells.shape, dtype=bool)
+        cells[~found] = -1
+        return cells
+
+    def points(self, cell):
+        """Provides the points located within a cell.
+
+        Parameters
+        ----------
+        cell : int
+            Index of an occupied cell.
+
+        Returns
+        -------
+        np.ndarray(int)
+            Indices of the points.
+
+        """
+        return self._indices[self._indptr[cell]:self._indptr[cell + 1]]
+
+    def neighbours(self, connectivity=None):
+        """Finds the occupied neighbours of all occupied cells.
+
+        Parameters
+        ----------
+        connectivity : optional, positive int
+            Number of neighbours to consider. For a three dimensional grid
+            either 6 (shared faces), 18 (shared edges) or 26 (shared
+            corners). For a two dimensional grid either 4 or 8. If None, all
+            adjacent cells are considered.
+
+        Returns
+        -------
+        np.ndarray(int, shape=(c, connectivity))
+            Indices of the neighbouring cells. Set to -1 for empty cells.
+
+        """
+        offsets = np.array(
+            list(itertools.product([-1, 0, 1], repeat=self.dim)),
+            dtype=np.int64
+        )
+        l1 = np.abs(offsets).sum(1)
+        offsets = offsets[l1 > 0]
+        l1 = l1[l1 > 0]
+
+        counts = [np.sum(l1 <= r) for r in range(1, self.dim + 1)]
+        if connectivity is None:
+            connectivity = counts[-1]
+        if connectivity not in counts:
+            m = "'connectivity' needs to be one of %s" % str(counts)
+            raise ValueError(m)
+        offsets = offsets[l1 <= counts.index(connectivity) + 1]
+
+        # keys are packed with a margin, so adjacent cells do not overflow
+        packed_offsets = offsets @ self._strides
+        packed_keys = self._packed_keys[:, None] + packed_offsets[None, :]
+        return self._lookup_packed(packed_keys.ravel()).reshape(
+            packed_keys.shape)
+
+    def reduce(self, values, stat='mean'):
+        """Aggregates point values per occupied cell.
+
+        Parameters
+        ----------
+        values : str or array_like(Number, shape=(n, ...))
+            Values of the points or name of a field of `rec`.
+        stat : optional, str
+            Aggregation statistic. Either 'count', 'sum', 'mean', 'min' or
+            'max'.
+
+        Returns
+        -------
+        np.ndarray(Number, shape=(c, ...))
+            Aggregated values.
+
+        """
+        if isinstance(values, str):
+            if values not in self._rec.dtype.names:
+                raise ValueError("'rec' needs to have a field '%s'" % values)
+            values = self._rec[values]
+        values = np.asarray(values)
+        if not len(values) == len(self._indices):
+            raise ValueError("'values' needs to have one value per point")
+
+        if stat == 'count':
+            return self.num_points
+        if self.count == 0:
+            return np.zeros((0, ) + values.shape[1:], dtype=values.dtype)
+
+        starts = self._indptr[:-1]
+        values = values[self._indices]
+        if stat == 'sum':
+            return np.add.reduceat(values, starts, axis=0)
+        elif stat == 'mean':
+            sums = np.add.reduceat(values.astype(float), starts, axis=0)
+            shape = (self.count, ) + (1, ) * (len(values.shape) - 1)
+            return sums / self.num_points.reshape(shape)
+        elif stat == 'min':
+            return np.minimum.reduceat(values, starts, axis=0)
+        elif stat == 'max':
+            return np.maximum.reduceat(values, starts, axis=0)
+        else:
+            raise ValueError("unknown statistic '%s'" % stat)
+
+    def to_records(self, fields={}):
+        """Converts the occupied cells to a GeoRecords object.
+
+        Parameters
+        ----------
+        fields : optional, dict
+            Values per occupied cell to add as fields, like the results of
+            `reduce`.
+
+        Returns
+        -------
+        GeoRecords
+            Occupied cells with the fields 'coords' (cell centers), 'keys',
+            'num_points' and `fields`.
+
+        """
+        keys = self.keys
+        dtype = [
+            ('coords', float, self.dim),
+            ('keys', np.int64, self.dim),
+            ('num_points', int),
+        ]
+        data = [self.keys_to_coords(keys), keys, self.num_points]
+        for name in fields:
+            values = np.asarray(fields[name])
+            if not len(values) == self.count:
+                m = "field '%s' needs to have one value per cell" % name
+                raise ValueError(m)
+            dtype.append((name, values.dtype, values.shape[1:]))
+            data.append(values)
+
+        rec = np.recarray(self.count, dtype=dtype)
+        for name, values in zip(rec.dtype.names, data):
+            rec[name] = values
+        return GeoRecords(self.proj, rec, T=self.t)
+
+    def to_grid(self, fields={}):
+        """Converts the sparse grid to a dense grid covering all occupied
+        cells.
+
+        Parameters
+        ----------
+        fields : optional, dict
+            Values per occupied cell to add as fields, like the results of
+            `reduce`. Empty cells are set to `np.nan` for floating point
+            fields and to zero otherwise.
+
+        Returns
+        -------
+        Grid
+            Dense grid with the fields 'num_points' and `fields`.
+
+        """
+        if self.count == 0:
+            raise ValueError("no occupied cells to convert")
+        keys = self.keys
+        min_key = keys.min(0)
+        shape = tuple(keys.max(0) - min_key + 1)
+
+        dtype = [('num_points', int)]
+        data = [self.num_points]
+        for name in fields:
+            values = np.asarray(fields[name])
+            if not len(values) == self.count:
+                m = "field '%s' needs to have one value per cell" % name
+                raise ValueError(m)
+            dtype.append((name, values.dtype, values.shape[1:]))
+            data.append(values)
+
+        rec = np.recarray(shape, dtype=dtype)
+        index = tuple((keys - min_key).T)
+        for name, values in zip(rec.dtype.names, data):
+            if np.issubdtype(rec.dtype[name].base, np.floating):
+                rec[name] = np.nan
+            else:
+                rec[name] = np.zeros(1, dtype=rec.dtype[name])
+            rec[name][index] = values
+
+        T = self.t @ transformation.t_matrix(min_key[::-1])
+        return Grid(self.proj, rec, T)
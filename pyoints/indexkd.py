@@ -29,6 +29,7 @@ from rtree import Rtree
 
 from . import (
     assertion,
+    profiling,
     transformation,
 )
 
@@ -201,13 +202,14 @@ class IndexKD(object):
     @property
     def kd_tree(self):
         if not hasattr(self, '_kd_tree'):
-            self._kd_tree = cKDTree(
-                self.coords,
-                leafsize=self._leafsize,
-                copy_data=False,
-                balanced_tree=self._balanced,
-                compact_nodes=self._compact
-            )
+            with profiling.measure('IndexKD.build', points=len(self)):
+                self._kd_tree = cKDTree(
+                    self.coords,
+                    leafsize=self._leafsize,
+                    copy_data=False,
+                    balanced_tree=self._balanced,
+                    compact_nodes=self._compact
+                )
         return self._kd_tree
 
     @property
@@ -228,6 +230,7 @@ class IndexKD(object):
 
         return self._r_tree
 
+    @profiling.profile('IndexKD.ball', points='coords')
     def ball(self, coords, r, bulk=100000, **kwargs):
         """Finds all points within distance `r` of point or points `coords`.
 
@@ -321,6 +324,7 @@ class IndexKD(object):
             nIds = self.kd_tree.query_ball_point(coord[:self.dim], r, **kwargs)
             yield nIds
 
+    @profiling.profile('IndexKD.ball_count', points=np.size)
     def ball_count(self, r, coords=None, **kwargs):
         """Counts numbers of neighbours within radius.
 
@@ -444,6 +448,7 @@ class IndexKD(object):
         outer = self.ball(coord[:self.dim], r_max, **kwargs)
         return np.intersect1d(outer, inner)
 
+    @profiling.profile('IndexKD.knn', points='coords')
     def knn(self, coords, k=1, bulk=100000, **kwargs):
         """Query for `k` nearest neighbours.
 
@@ -502,6 +507,19 @@ class IndexKD(object):
         elif hasattr(k, '__iter__'):
             # query multiple radii
             dists, nIds = zip(*self.knns_iter(coords, ks=k, **kwargs))
+        elif isinstance(coords, np.ndarray):
+            # bulk queries of chunks without iterating point by point
+            if not (isinstance(bulk, int) and bulk > 0):
+                raise ValueError("bulk size has to be an integer greater zero")
+            dists_list = []
+            nIds_list = []
+            for i in range(0, len(coords), bulk):
+                dists, nIds = self.kd_tree.query(
+                    coords[i:i + bulk, :self.dim], k=k, **kwargs)
+                dists_list.append(dists)
+                nIds_list.append(nIds)
+            dists = np.concatenate(dists_list)
+            nIds = np.concatenate(nIds_list)
         else:
             # bulk queries
             dists, nIds = zip(*self.knn_iter(coords, k=k, bulk=bulk, **kwargs))
@@ -23,13 +23,13 @@ import numpy as np
 from numbers import Number
 
 from scipy.interpolate import LinearNDInterpolator
-from sklearn.neighbors import KNeighborsRegressor
 from sklearn.preprocessing import PolynomialFeatures
 from sklearn.linear_model import LinearRegression
 
 from . import (
     assertion,
 )
+from .indexkd import IndexKD
 from .misc import print_rounded
 
 
@@ -211,23 +211,36 @@ class LinearInterpolator(Interpolator):
 
 
 class KnnInterpolator(Interpolator):
-    """Nearest neighbor interpolation.
+    """Nearest neighbor interpolation using inverse distance weighting.
 
     Parameters
     ----------
-    coords : array_like(Number, shape=(n, k))
-        Represents `n` data points of `k` dimensions.
+    coords : array_like(Number, shape=(n, k)) or IndexKD
+        Represents `n` data points of `k` dimensions. If an existing spatial
+        index is provided, it is used for the neighbourhood queries and the
+        points to interpolate need to be given in the coordinate system of
+        the spatial index.
     values : array_like(Number, shape=(n)) or array_like(Number, shape=(n, m))
         One dimensional or `m` dimensional values to interpolate.
     k : optional, positive int
         Number of neighbors used for interpolation.
     max_dist : optional, positive Number
         Maximum distance of a neigbouring point to be used for interpolation.
+    bulk : optional, positive int
+        Number of points to interpolate at once. Limits the memory
+        consumption when interpolating millions of points.
+    n_jobs : optional, int
+        Number of parallel jobs used for the neighbourhood queries. If -1,
+        all processors are used.
 
     See Also
     --------
-    Interpolator, sklearn.neighbors.KNeighborsRegressor
+    Interpolator, IndexKD.knn
 
+    Notes
+    -----
+    Points without any neighbour within `max_dist` are interpolated as
+    `np.nan`.
 
     Examples
     --------
@@ -258,42 +271,87 @@ class KnnInterpolator(Interpolator):
      [ 0.    1.    3.  ]
      [ 0.5   1.5   4.25]]
 
+    Reuse an existing spatial index.
+
+    >>> indexKD = IndexKD(coords)
+    >>> interpolator = KnnInterpolator(indexKD, values, k=2, bulk=2)
+    >>> print(interpolator([(0, 1), (0, 0), (0, -1)]))
+    [[ 1.    2.    5.5 ]
+     [ 0.    1.    3.  ]
+     [ 0.5   1.5   4.25]]
+
     """
 
-    def __init__(self, coords, values, k=None, max_dist=None):
-        Interpolator.__init__(self, coords, values)
+    def __init__(
+            self,
+            coords,
+            values,
+            k=None,
+            max_dist=None,
+            bulk=100000,
+            n_jobs=1):
+
+        if isinstance(coords, IndexKD):
+            indexKD = coords
+            Interpolator.__init__(self, indexKD.coords, values)
+            self._shift = np.zeros(self.dim)
+        else:
+            Interpolator.__init__(self, coords, values)
+            indexKD = IndexKD(self._prepare(coords), copy=False)
 
         if k is None:
             k = self.dim + 1
         else:
             if not (isinstance(k, int) and k > 0):
                 raise ValueError("'k' needs to be an integer greater 0")
-
-        if max_dist is None:
-            weight_function = 'distance'
-        else:
+        if max_dist is not None:
             if not (isinstance(max_dist, Number) and max_dist > 0):
                 raise ValueError("'max_dist' needs to be a number greater 0")
+        if not (isinstance(bulk, int) and bulk > 0):
+            raise ValueError("'bulk' needs to be an integer greater 0")
 
-            def weight_function(dists):
-                w = np.zeros(dists.shape)
-                zeroMask = dists == 0
-
-                w[~zeroMask] = 1.0 / dists[~zeroMask]
-                w[dists > max_dist] = 0
+        self._indexKD = indexKD
+        self._values = assertion.ensure_numarray(values)
+        self._k = min(k, len(indexKD))
+        self._max_dist = max_dist
+        self._bulk = bulk
+        self._n_jobs = n_jobs
 
-                w[np.any(zeroMask, axis=1), :] = 0
-                w[zeroMask] = 1
-                return w
-
-        self._interpolator = KNeighborsRegressor(
-            n_neighbors=k,
-            weights=weight_function,
-        )
-        self._interpolator.fit(self._prepare(coords), values)
+    @property
+    def indexKD(self):
+        return self._indexKD
 
     def _interpolate(self, prepared_coords):
-        return self._interpolator.predict(prepared_coords)
+        n = len(prepared_coords)
+        shape = (n,) + self._values.shape[1:]
+        values = np.empty(shape, dtype=float)
+        for i in range(0, n, self._bulk):
+            dists, nIds = self._indexKD.kd_tree.query(
+                prepared_coords[i:i + self._bulk, :],
+                k=self._k,
+                n_jobs=self._n_jobs
+            )
+            if self._k == 1:
+                dists = dists[:, None]
+                nIds = nIds[:, None]
+            values[i:i + self._bulk, ...] = self._idw(dists, nIds)
+        return values
+
+    def _idw(self, dists, nIds):
+        # inverse distance weighting of the neighbouring values
+        zero_mask = dists == 0
+        w = np.zeros(dists.shape)
+        np.divide(1.0, dists, out=w, where=~zero_mask)
+        if self._max_dist is not None:
+            w[dists > self._max_dist] = 0
+
+        # exact matches are weighted exclusively
+        zero_rows = np.any(zero_mask, axis=1)
+        w[zero_rows, :] = zero_mask[zero_rows, :]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            w = w / w.sum(axis=1)[:, None]
+        return np.einsum('ij,ij...->i...', w, self._values[nIds, ...])
 
 
 class PolynomInterpolator(Interpolator):
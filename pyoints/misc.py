@@ -24,6 +24,7 @@ import sys
 import pkg_resources
 import numpy as np
 from numbers import Number
+from scipy.spatial import cKDTree
 
 
 def tic():
@@ -86,21 +87,33 @@ def sizeof_fmt(num, suffix='B'):
 
 
 def get_size(obj, seen=None):
-    """Recursively finds size of objects"""
-    size = sys.getsizeof(obj)
+    """Recursively finds size of objects. Memory shared by multiple numpy
+    arrays is counted once.
+
+    See Also
+    --------
+    memory_report
+
+    """
+    if not isinstance(seen, _SeenSet):
+        seen = _SeenSet() if seen is None else _SeenSet(seen)
+
+    if isinstance(obj, (np.ndarray, cKDTree)):
+        # buffers are determined like in the memory report
+        entries = []
+        _walk_memory(obj, '', entries, seen)
+        return sum(entry[3] for entry in entries)
 
-    if seen is None:
-        seen = set()
     obj_id = id(obj)
     if obj_id in seen:
         return 0
     # Important mark as seen *before* entering recursion to gracefully handle
     # self-referential objects
     seen.add(obj_id)
+
+    size = sys.getsizeof(obj)
     if isinstance(obj, (str, int, float)):
         pass
-    elif isinstance(obj, np.ndarray):
-        size += obj.nbytes
     elif isinstance(obj, dict):
         size += sum([get_size(v, seen) for v in obj.values()])
         size += sum([get_size(k, seen) for k in obj.keys()])
@@ -113,6 +126,171 @@ def get_size(obj, seen=None):
     return size
 
 
+class _SeenSet(set):
+    # Set of visited object ids, which also keeps the visited memory regions.
+    def __init__(self, *args):
+        set.__init__(self, *args)
+        self.regions = []
+
+
+def memory_report(obj):
+    """Reports the memory of the buffers held by an object.
+
+    The numpy arrays of an object are searched recursively, including the
+    attributes of array subclasses like cached coordinates, cached extents and
+    cached spatial indices. Buffers shared by multiple arrays are counted
+    once.
+
+    Parameters
+    ----------
+    obj : object
+        Object to investigate, like `GeoRecords`, `Grid`, `Coords` or
+        `IndexKD`.
+
+    Returns
+    -------
+    np.recarray
+        Buffers in order of traversal. Field 'name' provides the attribute
+        path of a buffer and field 'bytes' the number of bytes used by the
+        array. Field 'retained' is the number of bytes of the underlying
+        buffer, which is kept alive by the array. Field 'unique' provides the
+        number of retained bytes not covered by previous buffers. Thus, the
+        sum of field 'unique' is the total memory.
+
+    Notes
+    -----
+    A view of a larger array retains the whole buffer of the array. The
+    memory of the nodes of a `cKDTree` is estimated from the number of nodes.
+    The memory of R-trees and of Python objects other than arrays is not
+    reported.
+
+    See Also
+    --------
+    get_size
+
+    Examples
+    --------
+
+    >>> from pyoints import Coords
+
+    Create coordinates and cache a spatial index and an extent.
+
+    >>> coords = Coords(np.zeros((1000, 3)))
+    >>> kd_tree = coords.indexKD().kd_tree
+    >>> extent = coords.extent()
+
+    >>> report = memory_report(coords)
+    >>> for entry in report[:3]:
+    ...     print(entry)
+    ('Coords', 24000, 24000, 24000)
+    ('Coords._indices[3]._coords', 24000, 24000, 0)
+    ('Coords._indices[3]._t', 128, 128, 128)
+
+    The tree uses the coordinates without copying them.
+
+    >>> print(report.name[3:7])
+    ['Coords._indices[3]._kd_tree.data' 'Coords._indices[3]._kd_tree.indices'
+     'Coords._indices[3]._kd_tree.nodes' 'Coords._extents[3]']
+    >>> print(report.unique[3])
+    0
+
+    Fields and subsets of record arrays retain the memory of the record
+    array.
+
+    >>> rec = np.recarray(1000, dtype=[('a', float), ('b', int)])
+    >>> report = memory_report([rec, rec.a, rec[:10]])
+    >>> print(report.bytes)
+    [16000  8000   160]
+    >>> print(report.retained)
+    [16000 16000 16000]
+    >>> print(report.unique)
+    [16000     0     0]
+
+    A view retains the memory of its base, even if the base is deleted.
+
+    >>> subset = np.zeros(1000)[:10]
+    >>> print(memory_report(subset).retained)
+    [8000]
+
+    """
+    entries = []
+    _walk_memory(obj, type(obj).__name__, entries, _SeenSet())
+
+    dtype = [
+        ('name', object),
+        ('bytes', int),
+        ('retained', int),
+        ('unique', int),
+    ]
+    report = np.recarray(len(entries), dtype=dtype)
+    for i, entry in enumerate(entries):
+        report[i] = entry
+    return report
+
+
+# estimated memory of a single node of a cKDTree
+_KDTREE_NODE_NBYTES = 72
+
+
+def _walk_memory(obj, name, entries, seen):
+    # Collects the buffers of an object recursively. Memory regions already
+    # visited are not counted again.
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        root = obj
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+        low, high = np.byte_bounds(root)
+        unique = _claim_region(seen.regions, low, high)
+        entries.append((name, obj.nbytes, high - low, unique))
+
+        if obj.dtype.hasobject and obj.dtype.names is None:
+            for i, item in enumerate(obj.flat):
+                _walk_memory(item, '%s.flat[%i]' % (name, i), entries, seen)
+        if hasattr(obj, '__dict__'):
+            _walk_attributes(obj, name, entries, seen)
+    elif isinstance(obj, cKDTree):
+        _walk_memory(obj.data, name + '.data', entries, seen)
+        _walk_memory(obj.indices, name + '.indices', entries, seen)
+        nbytes = obj.size * _KDTREE_NODE_NBYTES
+        entries.append((name + '.nodes', nbytes, nbytes, nbytes))
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            _walk_memory(value, '%s[%s]' % (name, key), entries, seen)
+    elif isinstance(obj, (list, tuple)):
+        for i, item in enumerate(obj):
+            _walk_memory(item, '%s[%i]' % (name, i), entries, seen)
+    elif hasattr(obj, '__dict__') and \
+            type(obj).__module__.split('.')[0] == 'pyoints':
+        _walk_attributes(obj, name, entries, seen)
+
+
+def _walk_attributes(obj, name, entries, seen):
+    # Collects the buffers of the attributes of an object.
+    for attr, value in obj.__dict__.items():
+        _walk_memory(value, '%s.%s' % (name, attr), entries, seen)
+
+
+def _claim_region(regions, low, high):
+    # Adds the memory region [low, high) to a list of disjoint regions.
+    # Returns the number of bytes not covered by the regions before.
+    unique = high - low
+    keep = []
+    for r_low, r_high in regions:
+        if r_high <= low or r_low >= high:
+            keep.append((r_low, r_high))
+        else:
+            unique -= min(r_high, high) - max(r_low, low)
+            low = min(low, r_low)
+            high = max(high, r_high)
+    keep.append((low, high))
+    regions[:] = keep
+    return unique
+
+
 def print_object_size(obj):
     """Get the size of cached objects.
 
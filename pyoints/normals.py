@@ -19,6 +19,7 @@
 """Derive normals of point clouds.
 """
 
+import itertools
 import numpy as np
 from numbers import Number
 
@@ -26,6 +27,7 @@ from . import (
     Coords,
     assertion,
     distance,
+    profiling,
 )
 from .transformation import eigen
 from .misc import print_rounded
@@ -130,6 +132,7 @@ def normalize(vectors, dim=None, n=None):
     return (vectors.T / lengths).T
 
 
+@profiling.profile('normals.fit_normals', points='coords')
 def fit_normals(
         coords,
         r=np.inf,
@@ -352,3 +355,38 @@ def approximate_normals(coords, r=np.inf, k=None, preferred=None):
         normals = prefer_orientation(normals, preferred)
 
     return normals
+
+
+def _ball_segments(indexKD, coords, r):
+    # Neighbours within radius `r` of points as flat arrays of neighbour
+    # indices and indices of the corresponding points.
+    nIds_list = indexKD.kd_tree.query_ball_point(coords, r)
+    counts = np.fromiter(map(len, nIds_list), dtype=int, count=len(coords))
+    nIds = np.fromiter(
+        itertools.chain.from_iterable(nIds_list),
+        dtype=int,
+        count=counts.sum()
+    )
+    seg = np.repeat(np.arange(len(coords)), counts)
+    return nIds, seg
+
+
+def _segment_covariances(offsets, seg, n):
+    # Number of points, mean and covariance matrix of each of `n` segments of
+    # offsets. Means and covariances of empty segments are set to nan.
+    dim = offsets.shape[1]
+    counts = np.bincount(seg, minlength=n)
+    means = np.empty((n, dim), dtype=float)
+    cov = np.empty((n, dim, dim), dtype=float)
+    for i in range(dim):
+        means[:, i] = np.bincount(seg, weights=offsets[:, i], minlength=n)
+        for j in range(i + 1):
+            cov[:, i, j] = np.bincount(
+                seg, weights=offsets[:, i] * offsets[:, j], minlength=n)
+            cov[:, j, i] = cov[:, i, j]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means /= counts[:, None]
+        cov /= counts[:, None, None]
+    cov -= means[:, :, None] * means[:, None, :]
+    return counts, means, cov
@@ -20,6 +20,7 @@
 """
 
 import numpy as np
+import multiprocessing
 from numbers import Number
 
 from .misc import print_rounded
@@ -345,9 +346,10 @@ def add_fields(arr, dtypes, data=None):
         Numpy record array to add fields to.
     dtypes : np.dtype
         Data types of the new fields.
-    data : optional, list of array_like
+    data : optional, list of array_like or dict
         Data values of the new fields. The shape of each array has to be
-        compatible to arr.
+        compatible to arr. Alternatively, a dictionary of values accessed by
+        field name.
 
     Returns
     -------
@@ -355,6 +357,12 @@ def add_fields(arr, dtypes, data=None):
         Record array similar to `A`, but with additional fields of type
         `dtypes` and values of `data`.
 
+    Notes
+    -----
+    The output array is allocated only once, so it is recommended to add
+    multiple fields with a single call. If no Python objects are involved,
+    the fields of `arr` are copied as a single memory block.
+
     Examples
     --------
 
@@ -367,6 +375,13 @@ def add_fields(arr, dtypes, data=None):
     >>> print(D)
     [(0, 1, '') (1, 2, '') (2, 3, '') (3, 4, '')]
 
+    Add multiple fields using a dictionary.
+
+    >>> data = {'g': [1, 2, 3, 4], 'f': [5, 6, 7, 8]}
+    >>> E = add_fields(A, [('f', int), ('g', int)], data=data)
+    >>> print(E)
+    [(0, 5, 1) (1, 6, 2) (2, 7, 3) (3, 8, 4)]
+
     """
     if not isinstance(arr, np.recarray):
         raise TypeError("'arr' has to be an numpy record array")
@@ -382,15 +397,16 @@ def add_fields(arr, dtypes, data=None):
         if name in arr.dtype.names:
             raise ValueError("field '%s' already exists" % name)
 
-    newDtypes = arr.dtype.descr + dtypes.descr
+    newDtypes = _descr(arr.dtype) + _descr(dtypes)
 
     # set values
     rec = np.recarray(arr.shape, dtype=newDtypes)
-    for name in arr.dtype.names:
-        rec[name] = arr[name]
+    _copy_fields(arr, rec)
 
     # set new values
     if data is not None:
+        if haskeys(data):
+            data = [data.get(name) for name in dtypes.names]
         for name, column in zip(dtypes.names, data):
             if column is not None:
                 rec[name] = column
@@ -455,7 +471,7 @@ def fuse(*recarrays):
     for arr in recarrays:
         if not isinstance(arr, np.recarray):
             raise TypeError("all arrays have to be of type 'np.recarray'")
-        dtype.extend(arr.dtype.descr)
+        dtype.extend(_descr(arr.dtype))
 
         # check shape
         if shape is None:
@@ -466,12 +482,49 @@ def fuse(*recarrays):
     # define array
     fused = np.recarray(shape, dtype=dtype)
     for arr in recarrays:
-        for name in arr.dtype.names:
-            fused[name] = arr[name]
+        _copy_fields(arr, fused)
 
     return fused
 
 
+def _descr(dtype):
+    # Description of a data type without unnamed padding bytes.
+    return [descr for descr in dtype.descr if not descr[0] == '']
+
+
+def _copy_fields(src, dst):
+    # Copies the fields of `src` to the corresponding fields of `dst`. If the
+    # fields of `src` are packed and form a contiguous block in `dst`, the
+    # whole block is copied at once instead of field by field.
+    names = src.dtype.names
+    if len(names) == 0:
+        return
+    offset = dst.dtype.fields[names[0]][1] - src.dtype.fields[names[0]][1]
+    is_block = (
+        not src.dtype.hasobject and
+        not dst.dtype.hasobject and
+        src.flags.c_contiguous and
+        dst.flags.c_contiguous and
+        offset >= 0 and
+        sum(src.dtype[name].itemsize for name in names) ==
+        src.dtype.itemsize and
+        src.dtype.itemsize + offset <= dst.dtype.itemsize and
+        all(dst.dtype.fields[name][0] == src.dtype.fields[name][0] and
+            dst.dtype.fields[name][1] == src.dtype.fields[name][1] + offset
+            for name in names)
+    )
+    if is_block and src.size > 0:
+        n = src.size
+        src_bytes = src.view(np.ndarray).reshape(n).view(np.uint8)
+        dst_bytes = dst.view(np.ndarray).reshape(n).view(np.uint8)
+        dst_bytes = dst_bytes.reshape((n, dst.dtype.itemsize))
+        dst_bytes[:, offset:offset + src.dtype.itemsize] = \
+            src_bytes.reshape((n, src.dtype.itemsize))
+    else:
+        for name in names:
+            dst[name] = src[name]
+
+
 def merge(arrays, strategy=np.concatenate):
     """Merges multiple arrays with similar fields.
 
@@ -579,6 +632,76 @@ def merge(arrays, strategy=np.concatenate):
     return arrays[0].__array_wrap__(strategy(arrays))
 
 
+def unify_dtypes(dtypes):
+    """Determines a common data type of multiple record data types.
+
+    Parameters
+    ----------
+    dtypes : iterable of np.dtype
+        Numpy record data types to unify.
+
+    Returns
+    -------
+    np.dtype
+        Data type containing all fields of `dtypes`. Data types of fields
+        occurring multiple times are promoted to a common data type.
+
+    Raises
+    ------
+    TypeError, ValueError
+
+    Examples
+    --------
+
+    >>> A = np.dtype([('coords', np.float32, 3), ('a', np.int8)])
+    >>> B = np.dtype([('coords', float, 3), ('b', str, 2), ('a', np.int16)])
+    >>> dtype = unify_dtypes([A, B])
+    >>> print(dtype.names)
+    ('coords', 'a', 'b')
+    >>> print(dtype['coords'])
+    ('<f8', (3,))
+    >>> print(dtype['a'])
+    int16
+
+    Fields need to have the same shape.
+
+    >>> C = np.dtype([('coords', float, 2)])
+    >>> unify_dtypes([A, C])
+    Traceback (most recent call last):
+    ...
+    ValueError: field 'coords' differs in shape
+
+    """
+    if not hasattr(dtypes, '__iter__'):
+        raise TypeError("'dtypes' needs to be iterable")
+
+    names = []
+    fields = {}
+    for dtype in dtypes:
+        dtype = np.dtype(dtype)
+        if dtype.names is None:
+            raise TypeError("'dtypes' needs to contain record data types")
+        for name in dtype.names:
+            field_dtype = dtype[name]
+            if name not in fields:
+                names.append(name)
+                fields[name] = field_dtype
+            else:
+                prev_dtype = fields[name]
+                if not prev_dtype.shape == field_dtype.shape:
+                    raise ValueError("field '%s' differs in shape" % name)
+                if prev_dtype.base == field_dtype.base:
+                    continue
+                try:
+                    base = np.promote_types(prev_dtype.base, field_dtype.base)
+                except TypeError:
+                    m = "data types of field '%s' can not be unified" % name
+                    raise TypeError(m)
+                fields[name] = np.dtype((base, prev_dtype.shape))
+
+    return np.dtype([(name, fields[name]) for name in names])
+
+
 def flatten_dtypes(np_dtypes):
     """Extract name, datatype and shape information from a numpy data type.
 
@@ -735,7 +858,7 @@ def colzip(arr):
         raise TypeError("unexpected type of 'arr'")
 
 
-def apply_function(arr, func, dtype=None):
+def apply_function(arr, func, dtype=None, batch=False, bulk=100000, n_jobs=1):
     """Applies a function to each record of a numpy array.
 
     Parameters
@@ -743,9 +866,21 @@ def apply_function(arr, func, dtype=None):
     arr : np.ndarray or np.recarray
         Numpy array to apply function to.
     func : function
-        Function to apply to each record.
-    dtypes : optional, np.dtype
+        Function to apply to each record. If `batch` is True, the function
+        receives a flat block of records instead and returns an array_like
+        of the same length. For structured output data types, either a
+        record array or a tuple of columns is expected.
+    dtype : optional, np.dtype
         Desired data type of the output array.
+    batch : optional, bool
+        Indicates whether or not to apply `func` to blocks of records instead
+        of single records.
+    bulk : optional, positive int
+        Maximum number of records per block.
+    n_jobs : optional, int
+        Number of processes used to map the blocks. If -1, all processors
+        are used. The function is serialized using `dill`, so lambda
+        functions are supported.
 
     Returns
     -------
@@ -799,6 +934,19 @@ def apply_function(arr, func, dtype=None):
     [[([ 0,  3],) ([ 1,  6],)]
      [([ 4,  9],) ([ 9, 12],)]]
 
+    Apply a function to blocks of records.
+
+    >>> func = lambda block: block.a ** block.b
+    >>> print(apply_function(arr, func, batch=True, bulk=3))
+    [[ 0  1]
+     [ 8 81]]
+
+    >>> func = lambda block: (block.a + block.b, block.a * block.b)
+    >>> dtype = [('c', float), ('d', int)]
+    >>> print(apply_function(arr, func, dtype=dtype, batch=True))
+    [[( 1.,  0) ( 3.,  2)]
+     [( 5.,  6) ( 7., 12)]]
+
     """
     if not callable(func):
         raise ValueError("'func' needs to be callable")
@@ -807,17 +955,104 @@ def apply_function(arr, func, dtype=None):
         raise TypeError(m)
     if dtype is not None:
         dtype = np.dtype(dtype)
+    if not (isinstance(bulk, int) and bulk > 0):
+        raise ValueError("'bulk' needs to be an integer greater zero")
+    if not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+        raise ValueError("'n_jobs' needs to be a positive integer or -1")
+
+    if n_jobs == -1:
+        n_jobs = multiprocessing.cpu_count()
+    if not batch and n_jobs == 1:
+        args = np.broadcast(None, arr)
+        values = [func(*arg[1:]) for arg in args]
+        return _values_to_array(values, dtype, arr.shape)
+
+    flat = arr.reshape(arr.size)
+    blocks = [flat[i:i + bulk] for i in range(0, arr.size, bulk)]
+    if n_jobs == 1:
+        results = [_apply_block(func, block, batch) for block in blocks]
+    else:
+        import dill
+        func_dump = dill.dumps(func)
+        tasks = [(func_dump, block, batch) for block in blocks]
+        pool = multiprocessing.Pool(processes=min(n_jobs, max(len(tasks), 1)))
+        try:
+            results = pool.map(_apply_block_dumped, tasks)
+        finally:
+            pool.close()
+            pool.join()
+
+    if not batch:
+        values = [value for values in results for value in values]
+        return _values_to_array(values, dtype, arr.shape)
+
+    if len(results) == 0:
+        res = np.empty(0, dtype=float if dtype is None else dtype)
+    elif dtype is not None and dtype.names is not None:
+        res = np.empty(arr.size, dtype=dtype)
+        i = 0
+        for values in results:
+            n = _set_columns(res[i:], values)
+            i = i + n
+        if not i == arr.size:
+            raise ValueError("'func' needs to return one value per record")
+    else:
+        res = np.concatenate([np.asarray(values) for values in results])
+        if not len(res) == arr.size:
+            raise ValueError("'func' needs to return one value per record")
+        if dtype is not None:
+            res = res.astype(dtype)
+
+    res = res.reshape(arr.shape + res.shape[1:])
+    if res.dtype.names is not None:
+        res = res.view(np.recarray)
+    return res
+
 
-    args = np.broadcast(None, arr)
-    values = [func(*arg[1:]) for arg in args]
+def _values_to_array(values, dtype, shape):
+    # Converts a list of function values to an array of desired shape.
     if dtype is None or dtype.names is None:
-        res = np.array(values, dtype=dtype).reshape(arr.shape)
+        res = np.array(values, dtype=dtype).reshape(shape)
     else:
-        res = np.array(
-            values, dtype=dtype).reshape(arr.shape).view(np.recarray)
+        res = np.array(values, dtype=dtype).reshape(shape).view(np.recarray)
     return res
 
 
+def _apply_block(func, block, batch):
+    # Applies a function to a flat block of records.
+    if batch:
+        return func(block)
+    return [func(*arg[1:]) for arg in np.broadcast(None, block)]
+
+
+def _apply_block_dumped(args):
+    # Applies a dill serialized function to a block of records.
+    import dill
+    func_dump, block, batch = args
+    return _apply_block(dill.loads(func_dump), block, batch)
+
+
+def _set_columns(res, values):
+    # Sets the fields of a structured array to the values returned by a
+    # batch function. Returns the number of values set.
+    if isinstance(values, np.ndarray) and values.dtype.names is not None:
+        columns = [values[name] for name in values.dtype.names]
+    elif isinstance(values, (tuple, list)):
+        columns = [np.asarray(column) for column in values]
+    else:
+        raise ValueError("'func' needs to return a record array or tuple")
+    if not len(columns) == len(res.dtype.names):
+        raise ValueError("'func' needs to return a value for each field")
+    n = len(columns[0])
+    if n > len(res):
+        raise ValueError("'func' needs to return one value per record")
+    for name, column in zip(res.dtype.names, columns):
+        if not len(column) == n:
+            raise ValueError("all columns need to have the same length")
+        res[name][:n] = column
+    return n
+
+
 def indices(shape, flatten=False):
     """Create keys or indices of a numpy ndarray.
 
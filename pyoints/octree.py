@@ -0,0 +1,478 @@
+# BEGIN OF LICENSE NOTE
+# This file is part of Pyoints.
+# Copyright (c) 2018, Sebastian Lamprecht, Trier University,
+# lamprecht@uni-trier.de
+#
+# Pyoints is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyoints is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pyoints. If not, see <https://www.gnu.org/licenses/>.
+# END OF LICENSE NOTE
+"""Multi-resolution octree providing levels of detail of point clouds.
+"""
+
+import os
+import json
+import numpy as np
+from datetime import datetime
+
+from . import (
+    assertion,
+    projection,
+)
+from .extent import Extent
+from .georecords import GeoRecords
+
+from .misc import print_rounded
+
+
+# format of dates stored by `Octree.save`
+_DATE_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+class Octree(object):
+    """Octree (or quadtree in two dimensions) providing a representative
+    point for each node. The points of a level of detail are a subset of the
+    points of all finer levels.
+
+    Parameters
+    ----------
+    geoRecords : GeoRecords
+        Points to organize. The records are stored in Morton order.
+    max_level : optional, positive int
+        Depth of the tree. If None, the depth is chosen to receive about one
+        point per leaf for uniformly distributed points.
+
+    Attributes
+    ----------
+    records : GeoRecords
+        Points in Morton order.
+    order : np.ndarray(int, shape=(n))
+        Indices of the points in the original records.
+    dim : positive int
+        Number of coordinate dimensions `k`.
+    max_level : positive int
+        Depth of the tree.
+    origin : np.ndarray(Number, shape=(k))
+        Minimum corner of the root node.
+    size : positive float
+        Edge length of the root node.
+
+    Notes
+    -----
+    The tree is built in `O(n log(n))` by sorting the points by their Morton
+    codes. The nodes of each level form contiguous ranges of `records`.
+    Representative points are selected bottom-up. The point closest to the
+    center of a node is chosen from the representatives of its children.
+
+    See Also
+    --------
+    filters.ball, grid.SparseGrid
+
+    Examples
+    --------
+
+    >>> coords = [
+    ...     (0, 0, 0), (0.1, 0.2, 0.1), (1, 1, 1), (0.9, 0.9, 0.9),
+    ...     (0.6, 0.2, 0.1), (0.2, 0.8, 0.6), (0.4, 0.4, 0.4), (0.7, 0.6, 0.9)
+    ... ]
+    >>> geo = GeoRecords(None, {'coords': coords}, date=datetime(2018, 5, 1))
+    >>> octree = Octree(geo, max_level=2)
+
+    >>> print_rounded(octree.max_level)
+    2
+    >>> print_rounded(octree.num_nodes)
+    [1 4 6]
+
+    Levels of detail.
+
+    >>> print_rounded(octree.lod(0).coords)
+    [[ 0.2  0.8  0.6]]
+    >>> print_rounded(octree.lod_indices(1))
+    [1 4 5 7]
+    >>> print_rounded(len(octree.lod(2)))
+    6
+
+    Levels of detail within an extent.
+
+    >>> print_rounded(octree.lod_indices(2, extent=[0, 0, 0, 0.5, 0.5, 0.5]))
+    [1 6]
+
+    Extents of the nodes.
+
+    >>> print_rounded(octree.node_extents(1)[:2])
+    [[ 0.   0.   0.   0.5  0.5  0.5]
+     [ 0.5  0.   0.   1.   0.5  0.5]]
+
+    Points of a node.
+
+    >>> print_rounded(octree.node_records(1, 0).coords)
+    [[ 0.   0.   0. ]
+     [ 0.1  0.2  0.1]
+     [ 0.4  0.4  0.4]]
+
+    Save the tree and load it lazily.
+
+    >>> import tempfile
+    >>> outdir = os.path.join(tempfile.mkdtemp(), 'octree')
+    >>> octree.save(outdir)
+    >>> octree = Octree.load(outdir, mmap_mode='r')
+    >>> print_rounded(octree.lod_indices(1))
+    [1 4 5 7]
+    >>> print(octree.records.date)
+    2018-05-01 00:00:00
+
+    """
+
+    def __init__(self, geoRecords, max_level=None):
+        if not isinstance(geoRecords, GeoRecords):
+            raise TypeError("'geoRecords' needs to be of type 'GeoRecords'")
+        if not len(geoRecords.shape) == 1:
+            raise ValueError("'geoRecords' needs to be one dimensional")
+        if len(geoRecords) == 0:
+            raise ValueError("'geoRecords' needs to contain points")
+
+        coords = geoRecords.coords
+        dim = coords.shape[1]
+        n = len(coords)
+
+        if max_level is None:
+            max_level = int(np.ceil(np.log2(max(n, 2)) / dim))
+        if not (isinstance(max_level, int) and max_level > 0):
+            raise ValueError("'max_level' needs to be an integer greater zero")
+        if max_level * dim > 62:
+            m = "'max_level' needs to be smaller %i" % (62 // dim + 1)
+            raise ValueError(m)
+
+        # cubic bounding box of the points
+        ext = Extent(coords)
+        origin = ext.min_corner
+        size = float(np.max(ext.ranges))
+        if size == 0:
+            size = 1.0
+
+        # Morton codes of the leaves
+        res = 2 ** max_level
+        cells = np.floor((coords - origin) / size * res).astype(np.int64)
+        cells = np.clip(cells, 0, res - 1)
+        codes = _encode(cells, max_level)
+
+        order = np.argsort(codes, kind='mergesort')
+
+        self._records = geoRecords[order]
+        self._order = order
+        self._origin = origin
+        self._size = size
+        self._max_level = max_level
+
+        codes = codes[order]
+        coords = coords[order]
+
+        # nodes per level
+        self._codes = []
+        self._indptr = []
+        for level in range(max_level + 1):
+            prefix = codes >> (dim * (max_level - level))
+            starts = np.concatenate(([0], np.where(np.diff(prefix))[0] + 1))
+            self._codes.append(prefix[starts])
+            self._indptr.append(np.append(starts, n))
+
+        # representative points (bottom-up)
+        self._reps = [None] * (max_level + 1)
+        candidates = np.arange(n)
+        for level in range(max_level, -1, -1):
+            prefix = codes[candidates] >> (dim * (max_level - level))
+            starts = np.concatenate(([0], np.where(np.diff(prefix))[0] + 1))
+            centers = self._node_centers(level, prefix[starts])
+            sizes = np.diff(np.append(starts, len(candidates)))
+            dists = np.sum(
+                (coords[candidates] - np.repeat(centers, sizes, axis=0)) ** 2,
+                axis=1
+            )
+            candidates = candidates[_group_argmin(dists, starts)]
+            self._reps[level] = candidates
+
+    @property
+    def records(self):
+        return self._records
+
+    @property
+    def order(self):
+        return self._order
+
+    @property
+    def dim(self):
+        return len(self._origin)
+
+    @property
+    def max_level(self):
+        return self._max_level
+
+    @property
+    def origin(self):
+        return self._origin
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def num_nodes(self):
+        return np.array([len(codes) for codes in self._codes])
+
+    def _check_level(self, level):
+        if not (isinstance(level, int) and 0 <= level <= self.max_level):
+            m = "'level' needs to be an integer in range [0, %i]"
+            raise ValueError(m % self.max_level)
+
+    def _node_centers(self, level, codes):
+        # Centers of the nodes with given codes.
+        cells = _decode(codes, self.dim, level)
+        return self.origin + (cells + 0.5) * (self.size / 2 ** level)
+
+    def node_codes(self, level):
+        """Provides the Morton codes of the nodes of a level.
+
+        Parameters
+        ----------
+        level : int
+            Level of the tree.
+
+        Returns
+        -------
+        np.ndarray(int, shape=(m))
+            Sorted Morton codes of the `m` nodes.
+
+        """
+        self._check_level(level)
+        return np.asarray(self._codes[level])
+
+    def node_extents(self, level):
+        """Provides the bounding boxes of the nodes of a level.
+
+        Parameters
+        ----------
+        level : int
+            Level of the tree.
+
+        Returns
+        -------
+        np.ndarray(Number, shape=(m, 2 * k))
+            Extents of the `m` nodes.
+
+        """
+        self._check_level(level)
+        cells = _decode(np.asarray(self._codes[level]), self.dim, level)
+        cell_size = self.size / 2 ** level
+        min_corners = self.origin + cells * cell_size
+        return np.hstack((min_corners, min_corners + cell_size))
+
+    def node_records(self, level, node):
+        """Provides all points of a node.
+
+        Parameters
+        ----------
+        level : int
+            Level of the tree.
+        node : int
+            Index of the node.
+
+        Returns
+        -------
+        GeoRecords
+            Points of the node. Only these points are read, if the tree has
+            been loaded lazily.
+
+        """
+        self._check_level(level)
+        indptr = self._indptr[level]
+        return self.records[indptr[node]:indptr[node + 1]]
+
+    def _lod_positions(self, level, extent):
+        # Positions of the representatives of a level within `records`.
+        self._check_level(level)
+        positions = np.asarray(self._reps[level])
+        if extent is not None:
+            ext = Extent(extent)
+            if not ext.dim == self.dim:
+                m = "'extent' needs to have %i dimensions" % self.dim
+                raise ValueError(m)
+            node_ext = self.node_extents(level)
+            mask = np.all(node_ext[:, :self.dim] <= ext.max_corner, axis=1)
+            mask &= np.all(node_ext[:, self.dim:] >= ext.min_corner, axis=1)
+            positions = positions[mask]
+
+            # read the selected coordinates only to keep memory maps lazy
+            coords = self.records['coords'][positions]
+            mask = np.all(coords >= ext.min_corner, axis=1)
+            mask &= np.all(coords <= ext.max_corner, axis=1)
+            positions = positions[mask]
+        return positions
+
+    def lod(self, level, extent=None):
+        """Provides the points of a level of detail.
+
+        Parameters
+        ----------
+        level : int
+            Level of detail in range [0, `max_level`].
+        extent : optional, array_like(Number, shape=(2 * k))
+            Only points within this extent are provided. Nodes outside the
+            extent are culled.
+
+        Returns
+        -------
+        GeoRecords
+            Representative points of the nodes of the level.
+
+        """
+        return self.records[self._lod_positions(level, extent)]
+
+    def lod_indices(self, level, extent=None):
+        """Provides the indices of the points of a level of detail.
+
+        Parameters
+        ----------
+        level : int
+            Level of detail in range [0, `max_level`].
+        extent : optional, array_like(Number, shape=(2 * k))
+            Only points within this extent are provided.
+
+        Returns
+        -------
+        np.ndarray(int)
+            Indices of the representative points in the original records.
+
+        See Also
+        --------
+        Octree.lod
+
+        """
+        return np.asarray(self.order)[self._lod_positions(level, extent)]
+
+    def save(self, outdir):
+        """Saves the tree to a directory.
+
+        Parameters
+        ----------
+        outdir : String
+            Output directory. It is created if it does not exist.
+
+        See Also
+        --------
+        Octree.load
+
+        """
+        if self.records.dtype.hasobject:
+            raise ValueError("records with objects can not be saved")
+        if not os.path.isdir(outdir):
+            os.makedirs(outdir)
+
+        meta = {
+            'dim': self.dim,
+            'max_level': self.max_level,
+            'origin': self.origin.tolist(),
+            'size': self.size,
+            'proj4': self.records.proj.proj4,
+            't': np.asarray(self.records.t).tolist(),
+            'date': None,
+        }
+        if self.records.date is not None:
+            meta['date'] = self.records.date.strftime(_DATE_FORMAT)
+        with open(os.path.join(outdir, 'octree.json'), 'w') as f:
+            json.dump(meta, f)
+
+        np.save(os.path.join(outdir, 'records.npy'), self.records)
+        np.save(os.path.join(outdir, 'order.npy'), self.order)
+        for level in range(self.max_level + 1):
+            for name, values in (
+                    ('codes', self._codes[level]),
+                    ('indptr', self._indptr[level]),
+                    ('reps', self._reps[level])):
+                outfile = os.path.join(outdir, '%s_%i.npy' % (name, level))
+                np.save(outfile, values)
+
+    @classmethod
+    def load(cls, indir, mmap_mode='r'):
+        """Loads a tree saved by `Octree.save`.
+
+        Parameters
+        ----------
+        indir : String
+            Directory the tree has been saved to.
+        mmap_mode : optional, str
+            Memory map mode passed to `np.load`. If not None, the points are
+            read from disk on demand.
+
+        Returns
+        -------
+        Octree
+            Loaded tree.
+
+        """
+        infile = os.path.join(indir, 'octree.json')
+        if not os.path.isfile(infile):
+            raise IOError('file "%s" not found' % infile)
+        with open(infile, 'r') as f:
+            meta = json.load(f)
+
+        def load_array(name):
+            return np.load(os.path.join(indir, name), mmap_mode=mmap_mode)
+
+        rec = load_array('records.npy').view(np.recarray)
+        proj = projection.Proj.from_proj4(meta['proj4'])
+        T = assertion.ensure_tmatrix(meta['t'])
+        date = meta.get('date')
+        if date is not None:
+            date = datetime.strptime(date, _DATE_FORMAT)
+
+        octree = cls.__new__(cls)
+        octree._records = GeoRecords(proj, rec, T=T, date=date)
+        octree._order = load_array('order.npy')
+        octree._origin = np.array(meta['origin'], dtype=float)
+        octree._size = float(meta['size'])
+        octree._max_level = int(meta['max_level'])
+
+        levels = range(octree._max_level + 1)
+        octree._codes = [load_array('codes_%i.npy' % i) for i in levels]
+        octree._indptr = [load_array('indptr_%i.npy' % i) for i in levels]
+        octree._reps = [load_array('reps_%i.npy' % i) for i in levels]
+        return octree
+
+
+def _encode(cells, level):
+    # Morton codes of integer cell coordinates by interleaving the bits.
+    dim = cells.shape[1]
+    codes = np.zeros(len(cells), dtype=np.int64)
+    for bit in range(level):
+        for d in range(dim):
+            codes |= ((cells[:, d] >> bit) & 1) << (bit * dim + d)
+    return codes
+
+
+def _decode(codes, dim, level):
+    # Integer cell coordinates of Morton codes.
+    codes = np.asarray(codes, dtype=np.int64)
+    cells = np.zeros((len(codes), dim), dtype=np.int64)
+    for bit in range(level):
+        for d in range(dim):
+            cells[:, d] |= ((codes >> (bit * dim + d)) & 1) << bit
+    return cells
+
+
+def _group_argmin(values, starts):
+    # Index of the minimum value of each group of consecutive values.
+    mins = np.minimum.reduceat(values, starts)
+    sizes = np.diff(np.append(starts, len(values)))
+    groups = np.repeat(np.arange(len(starts)), sizes)
+    hits = np.where(values == mins[groups])[0]
+    _, first = np.unique(groups[hits], return_index=True)
+    return hits[first]
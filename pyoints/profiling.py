@@ -0,0 +1,482 @@
+# BEGIN OF LICENSE NOTE
+# This file is part of Pyoints.
+# Copyright (c) 2018, Sebastian Lamprecht, Trier University,
+# lamprecht@uni-trier.de
+#
+# Pyoints is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyoints is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pyoints. If not, see <https://www.gnu.org/licenses/>.
+# END OF LICENSE NOTE
+"""Opt-in instrumentation of performance critical operations.
+
+The main operations of Pyoints, like building and querying spatial indices,
+fitting eigenvectors, reading and writing files or registering point clouds,
+are instrumented. Nothing is recorded unless a `Profiler` is enabled, so the
+instrumentation is cheap for common use.
+"""
+
+import os
+import json
+import time
+import inspect
+import functools
+import threading
+import tracemalloc
+from collections import OrderedDict
+
+import numpy as np
+
+
+# currently enabled profiler
+_PROFILER = None
+
+
+class Profiler:
+    """Records call counts, wall time, processed points and allocated memory
+    of instrumented operations.
+
+    Parameters
+    ----------
+    trace_memory : optional, bool
+        Indicates whether or not to record the memory allocated by each
+        operation. This relies on `tracemalloc`, which slows down the
+        execution notably.
+    max_events : optional, positive int
+        Maximum number of single events to keep for the trace export. The
+        aggregated statistics cover all events.
+
+    Attributes
+    ----------
+    events : list of dict
+        Recorded events. Each event provides the keys 'name', 'start',
+        'duration', 'points', 'bytes' and 'thread'.
+
+    Notes
+    -----
+    Only a single profiler records at a time. Enabling a profiler replaces
+    the currently enabled one, which is restored after disabling.
+
+    The allocated memory is the net amount of memory traced by `tracemalloc`
+    at the end of an operation compared to its beginning. It includes the
+    memory of the returned objects, but excludes memory allocated by
+    compiled extensions directly.
+
+    See Also
+    --------
+    measure, profile
+
+    Examples
+    --------
+
+    >>> from pyoints import IndexKD
+
+    Record operations.
+
+    >>> coords = np.indices((10, 10)).reshape((2, 100)).T
+    >>> with Profiler() as profiler:
+    ...     indexKD = IndexKD(coords)
+    ...     nIds = indexKD.ball(coords, 1.5)
+    ...     dists, nIds = indexKD.knn(coords[:10, :], k=3)
+
+    >>> stats = profiler.stats()
+    >>> print(list(stats.keys()))
+    ['IndexKD.build', 'IndexKD.ball', 'IndexKD.knn']
+    >>> print(stats['IndexKD.ball']['count'])
+    1
+    >>> print(stats['IndexKD.ball']['points'])
+    100
+    >>> print(stats['IndexKD.knn']['points'])
+    10
+
+    Nothing is recorded after disabling.
+
+    >>> nIds = indexKD.ball(coords, 1.5)
+    >>> print(profiler.stats()['IndexKD.ball']['count'])
+    1
+
+    Points are counted if they default to all indexed points as well.
+
+    >>> with Profiler() as profiler:
+    ...     counts = indexKD.ball_count(1.5)
+    >>> print(profiler.stats()['IndexKD.ball_count']['points'])
+    100
+
+    Record custom operations.
+
+    >>> with Profiler() as profiler:
+    ...     with measure('custom', points=len(coords)):
+    ...         s = coords.sum()
+    >>> print(profiler.stats()['custom']['points'])
+    100
+
+    """
+
+    def __init__(self, trace_memory=False, max_events=1000000):
+        if not (isinstance(max_events, int) and max_events > 0):
+            m = "'max_events' needs to be an integer greater zero"
+            raise ValueError(m)
+        self.trace_memory = bool(trace_memory)
+        self.max_events = max_events
+        self._previous = None
+        self._started_tracing = False
+        self._origin = time.perf_counter()
+        self.clear()
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *args):
+        self.disable()
+
+    @property
+    def enabled(self):
+        return _PROFILER is self
+
+    def enable(self):
+        """Starts recording."""
+        global _PROFILER
+        if self.enabled:
+            return
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._previous = _PROFILER
+        _PROFILER = self
+
+    def disable(self):
+        """Stops recording."""
+        global _PROFILER
+        if not self.enabled:
+            return
+        _PROFILER = self._previous
+        self._previous = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def clear(self):
+        """Removes all records."""
+        self.events = []
+        self._stats = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, name, start, duration, points=None, nbytes=None):
+        """Records a single event.
+
+        Parameters
+        ----------
+        name : str
+            Name of the operation.
+        start : float
+            Start time in seconds as provided by `time.perf_counter`.
+        duration : float
+            Wall time in seconds.
+        points : optional, int
+            Number of points processed.
+        nbytes : optional, int
+            Number of bytes allocated.
+
+        """
+        event = {
+            'name': name,
+            'start': start - self._origin,
+            'duration': duration,
+            'points': points,
+            'bytes': nbytes,
+            'thread': threading.get_ident(),
+        }
+        with self._lock:
+            if len(self.events) < self.max_events:
+                self.events.append(event)
+            if name not in self._stats:
+                self._stats[name] = {
+                    'count': 0,
+                    'time': 0.0,
+                    'points': 0,
+                    'bytes': 0,
+                }
+            stats = self._stats[name]
+            stats['count'] += 1
+            stats['time'] += duration
+            if points is not None:
+                stats['points'] += points
+            if nbytes is not None:
+                stats['bytes'] += nbytes
+
+    def stats(self):
+        """Aggregated statistics of the recorded operations.
+
+        Returns
+        -------
+        OrderedDict
+            Dictionary of operation names in order of first occurrence. Each
+            value is a dictionary providing the call count ('count'), the
+            total wall time in seconds ('time'), the total number of processed
+            points ('points') and the total number of allocated bytes
+            ('bytes').
+
+        """
+        with self._lock:
+            return OrderedDict(
+                (name, dict(stats)) for name, stats in self._stats.items())
+
+    def report(self):
+        """Creates a summary table of the recorded operations.
+
+        Returns
+        -------
+        str
+            Operations sorted by total wall time in descending order.
+
+        """
+        stats = self.stats()
+        names = sorted(stats.keys(), key=lambda n: -stats[n]['time'])
+        lines = ['%-32s %10s %12s %14s %14s' % (
+            'operation', 'calls', 'time [s]', 'points', 'bytes')]
+        for name in names:
+            s = stats[name]
+            lines.append('%-32s %10i %12.4f %14i %14i' % (
+                name, s['count'], s['time'], s['points'], s['bytes']))
+        return '\n'.join(lines)
+
+    def to_json(self, outfile):
+        """Saves the statistics and events as a JSON file.
+
+        Parameters
+        ----------
+        outfile : String
+            Desired output file.
+
+        """
+        data = {'stats': self.stats(), 'events': self.events}
+        with open(outfile, 'w') as f:
+            json.dump(data, f, indent=1)
+
+    def to_chrome_trace(self, outfile):
+        """Saves the events in the Trace Event Format. The file can be opened
+        in Chrome (chrome://tracing) or Perfetto.
+
+        Parameters
+        ----------
+        outfile : String
+            Desired output file.
+
+        """
+        pid = os.getpid()
+        trace_events = []
+        for event in self.events:
+            args = {}
+            if event['points'] is not None:
+                args['points'] = event['points']
+            if event['bytes'] is not None:
+                args['bytes'] = event['bytes']
+            trace_events.append({
+                'name': event['name'],
+                'ph': 'X',
+                'ts': event['start'] * 1e6,
+                'dur': event['duration'] * 1e6,
+                'pid': pid,
+                'tid': event['thread'],
+                'args': args,
+            })
+        with open(outfile, 'w') as f:
+            json.dump({'traceEvents': trace_events}, f)
+
+
+class _Measurement:
+    # Context manager recording a single event.
+
+    __slots__ = ('profiler', 'name', 'points', 'start', 'memory')
+
+    def __init__(self, profiler, name, points):
+        self.profiler = profiler
+        self.name = name
+        self.points = points
+
+    def __enter__(self):
+        self.memory = _traced_memory(self.profiler)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        duration = time.perf_counter() - self.start
+        nbytes = _traced_memory(self.profiler, self.memory)
+        self.profiler.record(
+            self.name, self.start, duration, self.points, nbytes)
+
+
+def _traced_memory(profiler, offset=0):
+    # Currently traced memory relative to `offset`, if memory is traced.
+    if not profiler.trace_memory or not tracemalloc.is_tracing():
+        return None
+    return tracemalloc.get_traced_memory()[0] - offset
+
+
+class _NullMeasurement:
+    # Context manager doing nothing.
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+_NULL_MEASUREMENT = _NullMeasurement()
+
+
+def is_enabled():
+    """Indicates whether or not a profiler is recording.
+
+    Returns
+    -------
+    bool
+        True, if a profiler is enabled.
+
+    """
+    return _PROFILER is not None
+
+
+def measure(name, points=None):
+    """Context manager recording a block of code as an operation.
+
+    Parameters
+    ----------
+    name : str
+        Name of the operation.
+    points : optional, int
+        Number of points processed.
+
+    Returns
+    -------
+    context manager
+        Records the operation, if a profiler is enabled.
+
+    See Also
+    --------
+    Profiler, profile
+
+    """
+    profiler = _PROFILER
+    if profiler is None:
+        return _NULL_MEASUREMENT
+    return _Measurement(profiler, name, points)
+
+
+def profile(name, points=None):
+    """Decorator recording each call of a function as an operation.
+
+    Parameters
+    ----------
+    name : str
+        Name of the operation.
+    points : optional, str or callable
+        Name of the argument providing the points processed, or function
+        counting the points of the return value.
+
+    Returns
+    -------
+    callable
+        Decorator.
+
+    See Also
+    --------
+    Profiler, measure
+
+    Examples
+    --------
+
+    >>> @profile('mean', points='coords')
+    ... def mean(coords):
+    ...     return np.mean(coords, axis=0)
+
+    >>> with Profiler() as profiler:
+    ...     m = mean([(0, 1), (2, 3), (4, 5)])
+    ...     m = mean([(0, 1), (2, 3)])
+    >>> stats = profiler.stats()['mean']
+    >>> print('%i calls, %i points' % (stats['count'], stats['points']))
+    2 calls, 5 points
+
+    """
+    def decorator(func):
+        if isinstance(points, str):
+            signature = inspect.signature(func)
+            if points not in signature.parameters:
+                m = "'%s' is not an argument of '%s'" % (points, func.__name__)
+                raise ValueError(m)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _PROFILER
+            if profiler is None:
+                return func(*args, **kwargs)
+
+            n = None
+            if isinstance(points, str):
+                bound = signature.bind(*args, **kwargs)
+                if points in bound.arguments:
+                    n = count_points(bound.arguments[points])
+
+            memory = _traced_memory(profiler)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            duration = time.perf_counter() - start
+            nbytes = _traced_memory(profiler, memory)
+
+            if callable(points):
+                n = points(result)
+            profiler.record(name, start, duration, n, nbytes)
+            return result
+        return wrapper
+    return decorator
+
+
+def count_points(obj):
+    """Counts the points of an object.
+
+    Parameters
+    ----------
+    obj : object
+        Points to count.
+
+    Returns
+    -------
+    int or None
+        Number of points. A single coordinate counts as one point. If the
+        object does not represent points, None is returned.
+
+    Examples
+    --------
+
+    >>> print(count_points([(0, 1), (2, 3), (4, 5)]))
+    3
+    >>> print(count_points((0, 1)))
+    1
+    >>> print(count_points({'A': np.zeros((3, 2)), 'B': np.zeros((5, 2))}))
+    8
+    >>> print(count_points(None))
+    None
+
+    """
+    if isinstance(obj, dict):
+        counts = [count_points(v) for v in obj.values()]
+        return sum(c for c in counts if c is not None)
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.names is not None or obj.ndim > 1:
+            return len(obj)
+        return 1 if obj.ndim == 1 else None
+    if hasattr(obj, '__len__'):
+        return count_points(np.asarray(obj))
+    return None
@@ -0,0 +1,608 @@
+# BEGIN OF LICENSE NOTE
+# This file is part of Pyoints.
+# Copyright (c) 2018, Sebastian Lamprecht, Trier University,
+# lamprecht@uni-trier.de
+#
+# Pyoints is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyoints is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Pyoints. If not, see <https://www.gnu.org/licenses/>.
+# END OF LICENSE NOTE
+"""Robust detection of planes, spheres and cylinders using RANSAC.
+"""
+
+import numpy as np
+from numbers import Number
+
+from . import (
+    assertion,
+    fit,
+    transformation,
+    vector,
+)
+from .indexkd import IndexKD
+from .misc import print_rounded
+
+
+# maximum number of distances to calculate at once
+_MAX_BLOCK_SIZE = 10000000
+
+
+def detect_planes(
+        coords,
+        threshold,
+        r=None,
+        k=20,
+        min_inliers=10,
+        max_shapes=1,
+        batch_size=100,
+        max_hypotheses=10000,
+        probability=0.99,
+        score_size=10000,
+        seed=None):
+    """Detects planes in a point cloud using RANSAC.
+
+    Parameters
+    ----------
+    coords : array_like(Number, shape=(n, k))
+        Represents `n` points of `k` dimensions.
+    threshold : positive Number
+        Maximum distance of an inlier to a plane.
+    r : optional, positive Number
+        If provided, the points of a hypothesis are sampled from the
+        neighbourhood of a random point within radius `r`.
+    k : optional, positive int
+        Maximum number of neighbours to consider for localized sampling.
+    min_inliers : optional, positive int
+        Minimum number of inliers of a plane. The detection stops, if no
+        plane with at least `min_inliers` inliers is found.
+    max_shapes : optional, positive int
+        Maximum number of planes to detect one after another.
+    batch_size : optional, positive int
+        Number of hypotheses generated and scored at once.
+    max_hypotheses : optional, positive int
+        Maximum number of hypotheses per detected plane.
+    probability : optional, Number
+        Desired probability of finding the best plane. The sampling of
+        hypotheses terminates early, if the probability is reached.
+    score_size : optional, positive int
+        Number of randomly selected points used to score the hypotheses.
+    seed : optional, int
+        Seed of the random number generator.
+
+    Returns
+    -------
+    list of tuple
+        List of tuples `(plane, ids)`. Each tuple provides a detected `Plane`
+        and the indices of its inliers.
+
+    See Also
+    --------
+    detect_spheres, detect_cylinders, vector.PlaneSet
+
+    Examples
+    --------
+
+    Create two perpendicular planes with some noise.
+
+    >>> rs = np.random.RandomState(0)
+    >>> x, y = rs.rand(2, 600) * 10
+    >>> A = np.vstack((x, y, rs.rand(600) * 0.01)).T
+    >>> B = np.vstack((x, rs.rand(600) * 0.01, y)).T[:400, :]
+    >>> coords = np.vstack((A, B, rs.rand(50, 3) * 10))
+
+    Detect the planes.
+
+    >>> shapes = detect_planes(coords, 0.05, max_shapes=3, seed=0)
+    >>> print(len(shapes))
+    2
+    >>> plane, ids = shapes[0]
+    >>> print(len(ids) >= 600)
+    True
+    >>> print_rounded(np.abs(plane.t.pc(3)), 2)
+    [ 0.  0.  1.]
+    >>> plane, ids = shapes[1]
+    >>> print_rounded(np.abs(plane.t.pc(3)), 2)
+    [ 0.  1.  0.]
+
+    Use localized sampling.
+
+    >>> shapes = detect_planes(coords, 0.05, r=1, max_shapes=2, seed=0)
+    >>> print(len(shapes))
+    2
+
+    """
+    coords = assertion.ensure_coords(coords)
+    return _detect(
+        coords,
+        _PlaneModel(coords.shape[1]),
+        threshold,
+        r=r,
+        k=k,
+        min_inliers=min_inliers,
+        max_shapes=max_shapes,
+        batch_size=batch_size,
+        max_hypotheses=max_hypotheses,
+        probability=probability,
+        score_size=score_size,
+        seed=seed,
+    )
+
+
+def detect_spheres(
+        coords,
+        threshold,
+        max_r=np.inf,
+        r=None,
+        k=20,
+        min_inliers=10,
+        max_shapes=1,
+        batch_size=100,
+        max_hypotheses=10000,
+        probability=0.99,
+        score_size=10000,
+        seed=None):
+    """Detects spheres in a point cloud using RANSAC.
+
+    Parameters
+    ----------
+    coords : array_like(Number, shape=(n, k))
+        Represents `n` points of `k` dimensions.
+    threshold : positive Number
+        Maximum distance of an inlier to the surface of a sphere.
+    max_r : optional, positive Number
+        Maximum radius of a sphere. Large spheres are similar to planes.
+    r, k, min_inliers, max_shapes, batch_size, max_hypotheses, probability,
+    score_size, seed : optional
+        See `detect_planes`.
+
+    Returns
+    -------
+    list of tuple
+        List of tuples `((center, radius), ids)`. Each tuple provides the
+        center and the radius of a detected sphere and the indices of its
+        inliers.
+
+    See Also
+    --------
+    detect_planes, fit.fit_sphere
+
+    Examples
+    --------
+
+    Create a noisy sphere on a plane.
+
+    >>> rs = np.random.RandomState(0)
+    >>> v = rs.randn(500, 3)
+    >>> S = v / np.linalg.norm(v, axis=1)[:, None] * 2 + [5, 5, 3]
+    >>> P = np.vstack((rs.rand(2, 500) * 10, np.zeros(500))).T
+    >>> coords = np.vstack((S, P))
+
+    Detect the sphere.
+
+    >>> shapes = detect_spheres(coords, 0.05, max_r=5, seed=0)
+    >>> (center, radius), ids = shapes[0]
+    >>> print_rounded(center)
+    [ 5.  5.  3.]
+    >>> print_rounded(radius)
+    2.0
+    >>> print(len(ids))
+    500
+
+    Detect a small sphere in georeferenced coordinates.
+
+    >>> offset = [500000, 5500000, 300]
+    >>> shapes = detect_spheres(S * 0.15 + offset, 0.01, max_r=1, seed=0)
+    >>> (center, radius), ids = shapes[0]
+    >>> print_rounded(center - offset)
+    [ 0.75  0.75  0.45]
+    >>> print_rounded(radius)
+    0.3
+    >>> print(len(ids))
+    500
+
+    """
+    coords = assertion.ensure_coords(coords)
+    return _detect(
+        coords,
+        _SphereModel(coords.shape[1], max_r),
+        threshold,
+        r=r,
+        k=k,
+        min_inliers=min_inliers,
+        max_shapes=max_shapes,
+        batch_size=batch_size,
+        max_hypotheses=max_hypotheses,
+        probability=probability,
+        score_size=score_size,
+        seed=seed,
+    )
+
+
+def detect_cylinders(
+        coords,
+        normals,
+        threshold,
+        max_r=np.inf,
+        r=None,
+        k=20,
+        min_inliers=10,
+        max_shapes=1,
+        batch_size=100,
+        max_hypotheses=10000,
+        probability=0.99,
+        score_size=10000,
+        seed=None):
+    """Detects cylinders in a three dimensional point cloud using RANSAC.
+
+    Parameters
+    ----------
+    coords : array_like(Number, shape=(n, 3))
+        Represents `n` points of three dimensions.
+    normals : array_like(Number, shape=(n, 3))
+        Normals of the points. Each hypothesis is derived from two points and
+        their normals.
+    threshold : positive Number
+        Maximum distance of an inlier to the surface of a cylinder.
+    max_r : optional, positive Number
+        Maximum radius of a cylinder.
+    r, k, min_inliers, max_shapes, batch_size, max_hypotheses, probability,
+    score_size, seed : optional
+        See `detect_planes`.
+
+    Returns
+    -------
+    list of tuple
+        List of tuples `((axis, radius), ids)`. Each tuple provides the axis
+        as a `Vector` and the radius of a detected cylinder and the indices of
+        its inliers.
+
+    See Also
+    --------
+    detect_planes, fit.fit_cylinder, normals.fit_normals
+
+    Examples
+    --------
+
+    Create a vertical cylinder with exact normals.
+
+    >>> rs = np.random.RandomState(0)
+    >>> phi = rs.rand(1000) * 2 * np.pi
+    >>> normals = np.vstack((np.cos(phi), np.sin(phi), np.zeros(1000))).T
+    >>> coords = normals * 1.5 + [2, 3, 0]
+    >>> coords[:, 2] = rs.rand(1000) * 10
+
+    Detect the cylinder.
+
+    >>> shapes = detect_cylinders(coords, normals, 0.01, seed=0)
+    >>> (axis, radius), ids = shapes[0]
+    >>> print_rounded(radius)
+    1.5
+    >>> print_rounded(np.abs(axis.vec) / axis.length)
+    [ 0.  0.  1.]
+    >>> print_rounded(axis.distance([(2, 3, 0)]))
+    [ 0.]
+    >>> print(len(ids))
+    1000
+
+    """
+    coords = assertion.ensure_coords(coords, dim=3)
+    normals = assertion.ensure_coords(normals, dim=3)
+    if not len(normals) == len(coords):
+        raise ValueError("'normals' needs to have the length of 'coords'")
+    return _detect(
+        coords,
+        _CylinderModel(normals, max_r),
+        threshold,
+        r=r,
+        k=k,
+        min_inliers=min_inliers,
+        max_shapes=max_shapes,
+        batch_size=batch_size,
+        max_hypotheses=max_hypotheses,
+        probability=probability,
+        score_size=score_size,
+        seed=seed,
+    )
+
+
+def _detect(
+        coords,
+        model,
+        threshold,
+        r,
+        k,
+        min_inliers,
+        max_shapes,
+        batch_size,
+        max_hypotheses,
+        probability,
+        score_size,
+        seed):
+    # Detects shapes one after another. Hypotheses are generated and scored
+    # in batches.
+    if not (isinstance(threshold, Number) and threshold > 0):
+        raise ValueError("'threshold' needs to be a number greater zero")
+    if r is not None and not (isinstance(r, Number) and r > 0):
+        raise ValueError("'r' needs to be a number greater zero")
+    if not (isinstance(k, int) and k >= model.n_samples):
+        m = "'k' needs to be an integer greater or equal %i"
+        raise ValueError(m % model.n_samples)
+    for name, value in [
+            ('min_inliers', min_inliers),
+            ('max_shapes', max_shapes),
+            ('batch_size', batch_size),
+            ('max_hypotheses', max_hypotheses),
+            ('score_size', score_size)]:
+        if not (isinstance(value, int) and value > 0):
+            raise ValueError("'%s' needs to be an integer greater zero" % name)
+    if not (isinstance(probability, Number) and 0 < probability < 1):
+        raise ValueError("'probability' needs to be a number in range ]0, 1[")
+
+    # center the coordinates to avoid a loss of precision when scoring
+    # hypotheses of georeferenced point clouds
+    center = coords.mean(0)
+    coords = coords - center
+
+    rs = np.random.RandomState(seed)
+    remaining = np.arange(len(coords))
+    shapes = []
+
+    while len(shapes) < max_shapes and len(remaining) >= max(
+            min_inliers, model.n_samples):
+        rCoords = coords[remaining, :]
+        indexKD = None if r is None else IndexKD(rCoords, copy=False)
+
+        if len(remaining) > score_size:
+            score_ids = rs.choice(len(remaining), score_size, replace=False)
+        else:
+            score_ids = np.arange(len(remaining))
+        score_coords = rCoords[score_ids, :]
+
+        # sample and score hypotheses in batches
+        best = None
+        best_count = 0
+        n_hypotheses = 0
+        required = max_hypotheses
+        while n_hypotheses < min(required, max_hypotheses):
+            sample_ids = _sample(
+                len(remaining), model.n_samples, batch_size, rs, indexKD, r, k)
+            params = model.hypotheses(
+                rCoords[sample_ids, :], remaining[sample_ids])
+            n_hypotheses += batch_size
+
+            if len(params[0]) > 0:
+                counts = _count_inliers(
+                    model, params, score_coords, remaining[score_ids],
+                    threshold)
+                i = np.argmax(counts)
+                if counts[i] > best_count:
+                    best_count = counts[i]
+                    best = tuple(p[i:i + 1] for p in params)
+
+                    # update the number of required hypotheses
+                    w = float(best_count) / len(score_ids)
+                    required = _required_hypotheses(
+                        w, model.n_samples, probability)
+
+        if best is None:
+            break
+
+        # determine and refine the inliers of the best hypothesis
+        ids = _inliers(model, best, rCoords, remaining, threshold)
+        if len(ids) >= model.n_samples:
+            refined = model.refine(rCoords[ids, :], remaining[ids], best)
+            refined_ids = _inliers(
+                model, refined, rCoords, remaining, threshold)
+            if len(refined_ids) >= len(ids):
+                best, ids = refined, refined_ids
+
+        if len(ids) < min_inliers:
+            break
+
+        shapes.append((model.shape(best, center), remaining[ids]))
+        mask = np.ones(len(remaining), dtype=bool)
+        mask[ids] = False
+        remaining = remaining[mask]
+
+    return shapes
+
+
+def _sample(n, n_samples, batch_size, rs, indexKD=None, r=None, k=20):
+    # Samples point indices for a batch of hypotheses. If `indexKD` is
+    # provided, the points are sampled within the neighbourhood of a seed.
+    if indexKD is None:
+        return rs.randint(0, n, size=(batch_size, n_samples))
+
+    seeds = rs.randint(0, n, size=batch_size)
+    k = min(k, n)
+    dists, nIds = indexKD.knn(
+        indexKD.coords[seeds, :], k=k, distance_upper_bound=r)
+    dists = dists.reshape((batch_size, k))
+    nIds = nIds.reshape((batch_size, k))
+
+    # choose random neighbours excluding the seed
+    keys = rs.rand(batch_size, k)
+    keys[~np.isfinite(dists)] = np.inf
+    keys[nIds == seeds[:, None]] = np.inf
+    order = np.argsort(keys, axis=1)[:, :n_samples - 1]
+    rows = np.arange(batch_size)[:, None]
+    valid = np.isfinite(keys[rows, order])
+    chosen = np.where(valid, nIds[rows, order], seeds[:, None])
+
+    # samples with duplicates are degenerated and discarded later
+    return np.hstack((seeds[:, None], chosen))
+
+
+def _required_hypotheses(w, n_samples, probability):
+    # Number of hypotheses required to sample at least one outlier free
+    # sample with the given probability.
+    p_good = w ** n_samples
+    if p_good <= 0:
+        return np.inf
+    if p_good >= 1:
+        return 1
+    return np.log(1 - probability) / np.log(1 - p_good)
+
+
+def _blocks(n_params, n_points):
+    # Splits the points in blocks to limit the memory required.
+    bulk = max(1, _MAX_BLOCK_SIZE // max(1, n_params))
+    for i in range(0, n_points, bulk):
+        yield slice(i, min(i + bulk, n_points))
+
+
+def _count_inliers(model, params, coords, ids, threshold):
+    # Counts the inliers of each hypothesis.
+    counts = np.zeros(len(params[0]), dtype=int)
+    for block in _blocks(len(counts), len(coords)):
+        dists = model.distances(params, coords[block, :], ids[block])
+        counts += (dists <= threshold).sum(1)
+    return counts
+
+
+def _inliers(model, params, coords, ids, threshold):
+    # Determines the inliers of a single hypothesis.
+    mask = np.zeros(len(coords), dtype=bool)
+    for block in _blocks(1, len(coords)):
+        dists = model.distances(params, coords[block, :], ids[block])[0, :]
+        mask[block] = dists <= threshold
+    return np.where(mask)[0]
+
+
+class _PlaneModel:
+    # Planes defined by `dim` points.
+
+    def __init__(self, dim):
+        self.n_samples = dim
+
+    def hypotheses(self, samples, ids):
+        planes = vector.PlaneSet.from_points(samples)
+        s = np.linalg.svd(planes.vecs, compute_uv=False)
+        valid = s[:, -1] > 1e-9 * np.maximum(s[:, 0], 1e-300)
+        planes = planes[valid]
+        return planes.origins, planes.normals
+
+    def distances(self, params, coords, ids):
+        origins, normals = params
+        dists = np.dot(normals, coords.T)
+        dists -= (origins * normals).sum(1)[:, None]
+        return np.abs(dists, out=dists)
+
+    def refine(self, coords, ids, params):
+        eig_vec = transformation.eigen(coords)[0]
+        return coords.mean(0)[None, :], eig_vec[:, -1][None, :]
+
+    def shape(self, params, center):
+        origin, normal = params[0][0] + center, params[1][0]
+        basis = transformation.eigen(
+            np.vstack((np.zeros(len(normal)), normal)))[0]
+        # vectors orthogonal to the normal
+        vecs = basis[:, 1:].T
+        return vector.Plane(origin, *vecs)
+
+
+class _SphereModel:
+    # Spheres defined by `dim + 1` points.
+
+    def __init__(self, dim, max_r):
+        if not (isinstance(max_r, Number) and max_r > 0):
+            raise ValueError("'max_r' needs to be a number greater zero")
+        self.n_samples = dim + 1
+        self.max_r = max_r
+
+    def hypotheses(self, samples, ids):
+        # solve 2 * (p_i - p_0) * c = |p_i - p_0|^2 relative to p_0
+        p0 = samples[:, 0, :]
+        d = samples[:, 1:, :] - p0[:, None, :]
+        A = 2 * d
+        B = (d ** 2).sum(2)
+
+        scale = np.abs(A).max((1, 2)) ** A.shape[1]
+        valid = np.abs(np.linalg.det(A)) > 1e-9 * np.maximum(scale, 1e-300)
+        c = np.linalg.solve(A[valid], B[valid][:, :, None])[:, :, 0]
+        radii = np.linalg.norm(c, axis=1)
+        keep = radii <= self.max_r
+        return p0[valid][keep] + c[keep], radii[keep]
+
+    def distances(self, params, coords, ids):
+        centers, radii = params
+        sq_dists = (coords ** 2).sum(1)[None, :] \
+            - 2 * np.dot(centers, coords.T) \
+            + (centers ** 2).sum(1)[:, None]
+        dists = np.sqrt(np.maximum(sq_dists, 0))
+        dists -= radii[:, None]
+        return np.abs(dists, out=dists)
+
+    def refine(self, coords, ids, params):
+        center, r, _ = fit.fit_sphere(coords)
+        if not r <= self.max_r:
+            return params
+        return center[None, :], np.array([r])
+
+    def shape(self, params, center):
+        return params[0][0] + center, params[1][0]
+
+
+class _CylinderModel:
+    # Cylinders defined by two points and their normals.
+
+    def __init__(self, normals, max_r):
+        if not (isinstance(max_r, Number) and max_r > 0):
+            raise ValueError("'max_r' needs to be a number greater zero")
+        self.n_samples = 2
+        self.normals = normals
+        self.max_r = max_r
+
+    def hypotheses(self, samples, ids):
+        p1 = samples[:, 0, :]
+        p2 = samples[:, 1, :]
+        n1 = self.normals[ids[:, 0], :]
+        n2 = self.normals[ids[:, 1], :]
+
+        # the axis is orthogonal to both normals
+        axes = np.cross(n1, n2)
+        lengths = np.linalg.norm(axes, axis=1)
+        valid = lengths > 1e-6
+        p1, p2, n1, n2 = p1[valid], p2[valid], n1[valid], n2[valid]
+        axes = axes[valid] / lengths[valid, None]
+
+        # intersect the lines p1 + s * n1 and p2 + t * n2 projected to the
+        # plane orthogonal to the axis
+        q = p2 - p1
+        q -= (q * axes).sum(1)[:, None] * axes
+        a11 = (n1 * n1).sum(1)
+        a12 = -(n1 * n2).sum(1)
+        a22 = (n2 * n2).sum(1)
+        b1 = (n1 * q).sum(1)
+        b2 = -(n2 * q).sum(1)
+        det = a11 * a22 - a12 ** 2
+        s = (a22 * b1 - a12 * b2) / det
+
+        origins = p1 + s[:, None] * n1
+        radii = np.abs(s) * np.sqrt(a11)
+        keep = radii <= self.max_r
+        return origins[keep], axes[keep], radii[keep]
+
+    def distances(self, params, coords, ids):
+        origins, axes, radii = params
+        dists = vector.VectorSet(origins, axes).distance(coords)
+        dists -= radii[:, None]
+        return np.abs(dists, out=dists)
+
+    def refine(self, coords, ids, params):
+        origins, axes, _ = params
+        dists = vector.VectorSet(origins, axes).distance(coords)[0, :]
+        return origins, axes, np.array([dists.mean()])
+
+    def shape(self, params, center):
+        origins, axes, radii = params
+        return vector.Vector(origins[0] + center, axes[0]), radii[0]
@@ -19,15 +19,19 @@
 """Implementation of the Iterative Closest Point Algorithm.
 """
 
+import os
 import numpy as np
 from numbers import Number
+from concurrent.futures import ThreadPoolExecutor
 
 from . import rototranslations
+from .registration import find_overlaps
 from .. import (
     assertion,
     transformation,
     distance,
     assign,
+    profiling,
 )
 from ..misc import print_rounded
 
@@ -49,6 +53,39 @@ class ICP:
         Maximum number of iterations.
     update_normals : bool
         Indicates whether or not to also transform the normals.
+    levels : optional, positive int
+        Number of levels of a coarse-to-fine pyramid. At each level, the
+        point sets are subsampled using voxels of half the size of the radii
+        of the level. Starting with the coarsest level, the radii of the
+        coordinates are multiplied by `level_scale` per level. The resulting
+        transformation matrices are passed to the next finer level. The
+        original point sets are only used at the finest level.
+    level_scale : optional, Number
+        Scale factor of the radii and voxel sizes between two levels.
+    overlap_voxel_size : optional, Number or array_like(Number, shape=(k))
+        If provided and no `overlap_dict` is passed, overlapping point sets
+        are detected using voxels of this size. Point pairs are weighted by
+        the overlap ratios of the point sets. Otherwise, all point sets are
+        assumed to overlap each other.
+    point_to_plane : optional, bool
+        Indicates whether or not to minimize the point-to-plane distances
+        instead of the point-to-point distances. Requires point normals,
+        which are used to calculate the distances only. So `radii` has a
+        length of `k`.
+    kernel : optional, str
+        Robust kernel to weight the point pairs by their distances. Either
+        'huber' or 'tukey'. If None, the pairs are weighted by inverse
+        distance.
+    kernel_scale : optional, positive Number
+        Threshold distance of the kernel. If None, it is derived from the
+        median absolute distance of the point pairs.
+    trim_ratio : optional, Number
+        Ratio of point pairs with the largest distances to ignore. Must be in
+        range [0, 1).
+    n_jobs : optional, int
+        Number of threads used to assign the point pairs of overlapping
+        point sets in parallel. The results are merged in a deterministic
+        order. If -1, all processors are used.
     \*\*assign_parameters
         Parameters passed to `assign_class`.
 
@@ -148,6 +185,52 @@ class ICP:
      [ 2.   1. ]
      [-1.  -2. ]]
 
+    Coarse-to-fine ICP using a pyramid of two levels.
+
+    >>> radii = (0.25, 0.25)
+    >>> icp = ICP(radii, max_iter=10, levels=2, k=1)
+    >>> T, pairs, report = icp(coords_dict, weights=weights)
+    >>> tB = T['B'].to_local(B)
+    >>> print_rounded(tB, 1)
+    [[ 0.6  0.5]
+     [ 0.4  0. ]
+     [ 1.2  0.9]
+     [ 2.2  0.9]
+     [-1.  -1.9]]
+
+    Point-to-plane ICP with a robust kernel.
+
+    >>> icp = ICP(
+    ...     radii, max_iter=10, point_to_plane=True, kernel='huber', k=1)
+    >>> T, pairs, report = icp(
+    ...     coords_dict, normals_dict=normals_dict, weights=weights)
+    >>> tB = T['B'].to_local(B)
+    >>> print_rounded(tB, 1)
+    [[ 0.6  0.6]
+     [ 0.4  0.1]
+     [ 1.3  1. ]
+     [ 2.2  0.8]
+     [-1.2 -1.6]]
+
+    Detect overlapping point sets automatically.
+
+    >>> icp = ICP(radii, max_iter=10, overlap_voxel_size=1, k=1)
+    >>> T, pairs, report = icp(coords_dict, weights=weights)
+    >>> print(sorted(pairs['A'].keys()))
+    ['B']
+
+    Assign the point pairs in parallel threads.
+
+    >>> icp = ICP(radii, max_iter=10, n_jobs=2, k=1)
+    >>> T, pairs, report = icp(coords_dict, weights=weights)
+    >>> tB = T['B'].to_local(B)
+    >>> print_rounded(tB, 1)
+    [[ 0.6  0.5]
+     [ 0.4  0. ]
+     [ 1.2  0.9]
+     [ 2.2  0.9]
+     [-1.  -1.9]]
+
     """
 
     def __init__(self,
@@ -156,6 +239,14 @@ class ICP:
                  max_change_ratio=0.001,
                  assign_class=assign.KnnMatcher,
                  update_normals=False,
+                 levels=1,
+                 level_scale=2,
+                 overlap_voxel_size=None,
+                 point_to_plane=False,
+                 kernel=None,
+                 kernel_scale=None,
+                 trim_ratio=0,
+                 n_jobs=1,
                  **assign_parameters):
 
         if not callable(assign_class):
@@ -167,14 +258,38 @@ class ICP:
         if not (isinstance(max_change_ratio, Number) and max_change_ratio > 0):
             raise ValueError(
                 "'max_change_ratio' must be a number greater zero")
+        if not (isinstance(levels, int) and levels > 0):
+            raise ValueError("'levels' must be an integer greater zero")
+        if not (isinstance(level_scale, Number) and level_scale > 1):
+            raise ValueError("'level_scale' must be a number greater one")
+        if not isinstance(point_to_plane, bool):
+            raise TypeError("'point_to_plane' must be boolean")
+        if kernel not in (None, 'huber', 'tukey'):
+            raise ValueError("'kernel' must be either 'huber' or 'tukey'")
+        if not (kernel_scale is None or
+                (isinstance(kernel_scale, Number) and kernel_scale > 0)):
+            raise ValueError("'kernel_scale' must be a number greater zero")
+        if not (isinstance(trim_ratio, Number) and 0 <= trim_ratio < 1):
+            raise ValueError("'trim_ratio' must be a number in range [0, 1)")
+        if not isinstance(n_jobs, int) or n_jobs == 0 or n_jobs < -1:
+            raise ValueError("'n_jobs' must be a positive integer or -1")
 
         self._assign_class = assign_class
         self._radii = assertion.ensure_numvector(radii, min_length=2)
         self._max_iter = max_iter
         self._max_change_ratio = max_change_ratio
         self._update_normals = update_normals
+        self._levels = levels
+        self._level_scale = level_scale
+        self._overlap_voxel_size = overlap_voxel_size
+        self._point_to_plane = point_to_plane
+        self._kernel = kernel
+        self._kernel_scale = kernel_scale
+        self._trim_ratio = trim_ratio
+        self._n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
         self._assign_parameters = assign_parameters
 
+    @profiling.profile('registration.ICP', points='coords_dict')
     def __call__(
             self,
             coords_dict,
@@ -197,7 +312,8 @@ class ICP:
             Dictionary of transformation matrices. If `pairs_dict` is provided,
             `T_dict` will be overwritten.
         overlap_dict : optional, dict of list(str)
-            Dictionary specifying which point clouds overlap.
+            Dictionary specifying which point clouds overlap. If empty, the
+            overlaps are detected using `overlap_voxel_size`, if provided.
         weights : optional, array_like(Number)
             Weights passed to `find_rototranslations`.
 
@@ -217,63 +333,138 @@ class ICP:
         """
         # validate input
         coords_dict, dim = _ensure_coords_dict(coords_dict)
-        overlap_dict = _ensure_overlap_dict(
-            coords_dict, overlap_dict)
         normals_dict = _ensure_normals_dict(normals_dict, coords_dict)
         T_dict = _ensure_T_dict(T_dict, coords_dict, pairs_dict, weights)
 
+        ratio_dict = {}
+        if len(overlap_dict) == 0 and self._overlap_voxel_size is not None:
+            overlap_dict, ratio_dict = find_overlaps(
+                coords_dict, self._overlap_voxel_size, T_dict=T_dict)
+        overlap_dict = _ensure_overlap_dict(coords_dict, overlap_dict)
+
         # check radii
-        if len(normals_dict) > 0:
+        if self._point_to_plane:
+            if len(normals_dict) == 0:
+                raise ValueError("point-to-plane ICP requires normals")
+            if not len(self._radii) == dim:
+                m = "point-to-plane ICP requires %i radii, got %i"
+                raise ValueError(m % (dim, len(self._radii)))
+        elif len(normals_dict) > 0:
             if not len(self._radii) == 2 * dim:
                 m = "NICP requires %i radii, got %i"
                 raise ValueError(m % (2 * dim, len(self._radii)))
         else:
             if not len(self._radii) == dim:
-                m = "ICP requires %i radii, got %i" % (dim, len(self._radii))
-                raise ValueError(m % (2 * dim, len(self._radii)))
+                m = "ICP requires %i radii, got %i"
+                raise ValueError(m % (dim, len(self._radii)))
 
-        max_change = distance.norm(self._radii[:dim]) * self._max_change_ratio
+        # coarse-to-fine pyramid
+        report = {'RMSE': [], 'T': []}
+        for level in range(self._levels - 1, -1, -1):
+            radii = self._radii.astype(float)
+            radii[:dim] = radii[:dim] * self._level_scale ** level
+
+            if level > 0:
+                ids_dict = {
+                    key: _voxel_subsample(coords_dict[key], 0.5 * radii[:dim])
+                    for key in coords_dict
+                }
+                level_coords_dict = {
+                    key: coords_dict[key][ids_dict[key], :]
+                    for key in coords_dict
+                }
+                level_normals_dict = {
+                    key: normals_dict[key][ids_dict[key], :]
+                    for key in normals_dict
+                }
+            else:
+                level_coords_dict = coords_dict
+                level_normals_dict = normals_dict
+
+            T_dict, pairs_dict, level_report = self._iterate(
+                level_coords_dict,
+                level_normals_dict,
+                T_dict,
+                overlap_dict,
+                ratio_dict,
+                weights,
+                radii
+            )
+            report['RMSE'].extend(level_report['RMSE'])
+            report['T'].extend(level_report['T'])
+
+        return T_dict, pairs_dict, report
+
+    def _iterate(
+            self,
+            coords_dict,
+            normals_dict,
+            T_dict,
+            overlap_dict,
+            ratio_dict,
+            weights,
+            radii):
+        # Iterates the ICP algorithm for a single level.
+        dim = coords_dict[list(coords_dict.keys())[0]].shape[1]
+        max_change = distance.norm(radii[:dim]) * self._max_change_ratio
+
+        if self._point_to_plane:
+            match_normals_dict = {}
+        else:
+            match_normals_dict = normals_dict
 
-        # ICP algorithm
         report = {'RMSE': [], 'T': []}
+        pairs_dict = {}
         for num_iter in range(self._max_iter):
 
-            # assign pairs
-            pairs_dict = {}
-            for keyA in overlap_dict:
-                pairs_dict[keyA] = {}
-
-                A = _get_nCoords(
+            # transform the point sets once per iteration
+            nCoords_dict = {
+                key: _get_nCoords(
                     coords_dict,
-                    normals_dict,
-                    T_dict, keyA,
+                    match_normals_dict,
+                    T_dict,
+                    key,
                     self._update_normals
-                )
-                matcher = self._assign_class(A, self._radii)
-
-                for keyB in overlap_dict[keyA]:
-
-                    B = _get_nCoords(
-                        coords_dict,
-                        normals_dict,
-                        T_dict, keyB,
-                        self._update_normals
-                    )
-                    pairs = matcher(B, **self._assign_parameters)
-
-                    if len(pairs) > 0:
-                        dists = distance.dist(
-                            A[pairs[:, 0], :dim],
-                            B[pairs[:, 1], :dim],
-                        )
-                        w = distance.idw(dists, p=2)
+                ) for key in coords_dict
+            }
+            if self._point_to_plane:
+                tNormals_dict = {
+                    key: _get_normals(normals_dict, T_dict, key)
+                    for key in normals_dict
+                }
+
+            # assign pairs
+            tasks = [
+                (keyA, keyB)
+                for keyA in overlap_dict for keyB in overlap_dict[keyA]
+            ]
+            pairs_list = self._assign_pairs(nCoords_dict, tasks, radii)
+
+            pairs_dict = {keyA: {} for keyA in overlap_dict}
+            for (keyA, keyB), pairs in zip(tasks, pairs_list):
+                if len(pairs) > 0:
+                    A = nCoords_dict[keyA]
+                    B = nCoords_dict[keyB]
+                    diff = A[pairs[:, 0], :dim] - B[pairs[:, 1], :dim]
+                    if self._point_to_plane:
+                        normals = tNormals_dict[keyB][pairs[:, 1], :]
+                        dists = np.abs(np.sum(normals * diff, axis=1))
                     else:
-                        w = []
-                    pairs_dict[keyA][keyB] = (pairs, w)
+                        dists = distance.norm(diff)
+                    pairs, w = self._weight_pairs(pairs, dists)
+                    if keyA in ratio_dict and keyB in ratio_dict[keyA]:
+                        w = w * ratio_dict[keyA][keyB]
+                else:
+                    w = []
+                pairs_dict[keyA][keyB] = (pairs, w)
 
             # find roto-translation matrices
             T_dict_new = rototranslations.find_rototranslations(
-                coords_dict, pairs_dict, weights=weights)
+                coords_dict,
+                pairs_dict,
+                weights=weights,
+                normals_dict=normals_dict if self._point_to_plane else None
+            )
 
             # take a look at the residuals between before and after
             rmse = _get_change_rmse(coords_dict, T_dict, T_dict_new)
@@ -289,6 +480,74 @@ class ICP:
 
         return T_dict, pairs_dict, report
 
+    def _assign_pairs(self, nCoords_dict, tasks, radii):
+        # Assigns the point pairs of each task (keyA, keyB). The results are
+        # provided in the order of the tasks.
+        keys = []
+        for keyA, _ in tasks:
+            if keyA not in keys:
+                keys.append(keyA)
+
+        def build_matcher(key):
+            matcher = self._assign_class(nCoords_dict[key], radii)
+            if hasattr(matcher, 'rIndexKD'):
+                # build the tree before it is shared by multiple threads
+                matcher.rIndexKD.kd_tree
+            return matcher
+
+        def assign(task):
+            keyA, keyB = task
+            return matchers[keyA](
+                nCoords_dict[keyB], **self._assign_parameters)
+
+        if self._n_jobs == 1 or len(tasks) <= 1:
+            matchers = {key: build_matcher(key) for key in keys}
+            return [assign(task) for task in tasks]
+
+        # the nearest neighbour queries release the GIL, so threads suffice
+        # and the coordinates are shared without copying
+        with ThreadPoolExecutor(max_workers=self._n_jobs) as executor:
+            matchers = dict(zip(keys, executor.map(build_matcher, keys)))
+            return list(executor.map(assign, tasks))
+
+    def _weight_pairs(self, pairs, dists):
+        # Weights point pairs by their distances and removes outliers.
+        if self._trim_ratio > 0:
+            max_dist = np.percentile(dists, 100 * (1 - self._trim_ratio))
+            mask = dists <= max_dist
+            pairs = pairs[mask, :]
+            dists = dists[mask]
+
+        if self._kernel is None:
+            return pairs, distance.idw(dists, p=2)
+
+        if self._kernel_scale is None:
+            # scale estimate by the median absolute distance
+            sigma = 1.4826 * np.median(dists)
+            factor = 1.345 if self._kernel == 'huber' else 4.685
+            c = factor * sigma
+        else:
+            c = self._kernel_scale
+
+        w = np.ones(len(dists))
+        if c > 0:
+            if self._kernel == 'huber':
+                mask = dists > c
+                w[mask] = c / dists[mask]
+            else:
+                w = (1 - (dists / c) ** 2) ** 2
+                w[dists >= c] = 0
+
+        # the equations are scaled by the weights
+        return pairs, np.sqrt(w)
+
+
+def _voxel_subsample(coords, voxel_size):
+    # Selects one point per voxel.
+    keys = np.floor(coords / voxel_size).astype(np.int64)
+    _, ids = np.unique(keys, axis=0, return_index=True)
+    return np.sort(ids)
+
 
 def _get_change_rmse(coords_dict, T_dict_old, T_dict_new):
     rmse_dict = {}
@@ -314,6 +573,11 @@ def _get_nCoords(coords_dict, normals_dict, T_dict, key, update_normals):
     return nCoords
 
 
+def _get_normals(normals_dict, T_dict, key):
+    R = transformation.r_matrix(transformation.decomposition(T_dict[key])[1])
+    return transformation.transform(normals_dict[key], R)
+
+
 def _ensure_coords_dict(coords_dict):
     if not isinstance(coords_dict, dict):
         raise TypeError("'coords_dict' needs to be a dictionary")
@@ -145,3 +145,126 @@ def find_rototranslation(A, B):
     M = T1 @ R @ T2
 
     return transformation.LocalSystem(M)
+
+
+def find_overlaps(coords_dict, voxel_size, T_dict={}, min_ratio=0):
+    """Finds overlapping point sets using shared voxels.
+
+    Parameters
+    ----------
+    coords_dict : dict of array_like(Number, shape=(n, k))
+        Dictionary of point sets with `k` dimensions.
+    voxel_size : Number or array_like(Number, shape=(k))
+        Edge length of the voxels.
+    T_dict : optional, dict of array_like(Number, shape=(k+1, k+1))
+        Dictionary of transformation matrices to apply to the point sets
+        before voxelization.
+    min_ratio : optional, Number
+        Minimum overlap ratio of two point sets to be considered overlapping.
+
+    Returns
+    -------
+    overlap_dict : dict of list(str)
+        Dictionary specifying which point sets overlap.
+    ratio_dict : dict of dict of float
+        Overlap ratios of the overlapping point sets. The ratio is the number
+        of shared voxels divided by the number of voxels of the smaller point
+        set.
+
+    Notes
+    -----
+    Each point set is represented by its sorted and packed voxel keys. Only
+    pairs of point sets with intersecting extents are compared.
+
+    See Also
+    --------
+    ICP
+
+    Examples
+    --------
+
+    >>> coords_dict = {
+    ...     'A': [(0, 0), (0.5, 0.5), (1.5, 0.5), (2.5, 0.5)],
+    ...     'B': [(2.2, 0.2), (3.5, 0.5), (4.5, 0.5)],
+    ...     'C': [(1.2, 0.7), (2.6, 0.2), (3.1, 0.9)],
+    ...     'D': [(10, 10), (11, 11)],
+    ... }
+    >>> overlap_dict, ratio_dict = find_overlaps(coords_dict, 1)
+    >>> for key in sorted(overlap_dict.keys()):
+    ...     print(key, sorted(overlap_dict[key]))
+    A ['B', 'C']
+    B ['A', 'C']
+    C ['A', 'B']
+    D []
+    >>> print_rounded(ratio_dict['A']['C'], 2)
+    0.67
+
+    """
+    if not isinstance(coords_dict, dict):
+        raise TypeError("'coords_dict' needs to be a dictionary")
+    if not isinstance(T_dict, dict):
+        raise TypeError("'T_dict' needs to be a dictionary")
+    if not (assertion.isnumeric(min_ratio) and 0 <= min_ratio <= 1):
+        raise ValueError("'min_ratio' needs to be a number in range [0, 1]")
+
+    # transformed coordinates
+    dim = None
+    tcoords_dict = {}
+    for key in coords_dict:
+        coords = assertion.ensure_coords(coords_dict[key], dim=dim)
+        dim = coords.shape[1]
+        if key in T_dict:
+            coords = transformation.transform(coords, T_dict[key])
+        tcoords_dict[key] = coords
+
+    if assertion.isnumeric(voxel_size):
+        voxel_size = np.repeat(voxel_size, dim)
+    voxel_size = assertion.ensure_numvector(voxel_size, length=dim)
+    if np.any(voxel_size <= 0):
+        raise ValueError("'voxel_size' needs to be greater zero")
+
+    # voxel keys
+    keys_dict = {}
+    for key, coords in tcoords_dict.items():
+        keys = np.floor(coords / voxel_size).astype(np.int64)
+        keys_dict[key] = np.unique(keys, axis=0)
+
+    # pack keys using common strides
+    keys_list = [keys for keys in keys_dict.values() if len(keys) > 0]
+    packed_dict = {}
+    ext_dict = {}
+    if len(keys_list) > 0:
+        min_key = np.min([keys.min(0) for keys in keys_list], axis=0)
+        max_key = np.max([keys.max(0) for keys in keys_list], axis=0)
+        span = max_key - min_key + 1
+        if np.prod(span.astype(float)) >= 2**62:
+            raise ValueError("'voxel_size' too small to pack the voxel keys")
+        strides = np.append(np.cumprod(span[:0:-1])[::-1], 1)
+        for key, keys in keys_dict.items():
+            if len(keys) > 0:
+                packed_dict[key] = np.sort((keys - min_key) @ strides)
+                ext_dict[key] = (keys.min(0), keys.max(0))
+
+    # compare the point sets with intersecting extents
+    overlap_dict = {key: [] for key in coords_dict}
+    ratio_dict = {key: {} for key in coords_dict}
+    keys = list(packed_dict.keys())
+    for i, keyA in enumerate(keys):
+        for keyB in keys[i + 1:]:
+            minA, maxA = ext_dict[keyA]
+            minB, maxB = ext_dict[keyB]
+            if np.any(minA > maxB) or np.any(minB > maxA):
+                continue
+            shared = np.intersect1d(
+                packed_dict[keyA], packed_dict[keyB], assume_unique=True)
+            if len(shared) == 0:
+                continue
+            n = min(len(packed_dict[keyA]), len(packed_dict[keyB]))
+            ratio = float(len(shared)) / n
+            if ratio >= min_ratio:
+                overlap_dict[keyA].append(keyB)
+                overlap_dict[keyB].append(keyA)
+                ratio_dict[keyA][keyB] = ratio
+                ratio_dict[keyB][keyA] = ratio
+
+    return overlap_dict, ratio_dict
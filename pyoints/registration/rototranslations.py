@@ -29,7 +29,11 @@ from .. import (
 from ..misc import print_rounded
 
 
-def find_rototranslations(coords_dict, pairs_dict, weights=None):
+def find_rototranslations(
+        coords_dict,
+        pairs_dict,
+        weights=None,
+        normals_dict=None):
     """Finds the optimal roto-translation matrices between multiple
     point sets using pairs of points. The algorithm assumes infinitesimal
     rotations between the point sets.
@@ -47,6 +51,11 @@ def find_rototranslations(coords_dict, pairs_dict, weights=None):
         represent the weighting factors for orientation (angles).
         The weights can be provided for each point set individially in form
         of a dictionary. If not provided, weights are set to zero.
+    normals_dict : optional, dict of array_like(Number, shape=(n, k))
+        Dictionary of point normals. If provided, the point-to-plane distances
+        between the points of the first point set of a pair and the tangent
+        planes of the points of the second point set are minimized instead of
+        the point-to-point distances.
 
     Returns
     -------
@@ -55,7 +64,9 @@ def find_rototranslations(coords_dict, pairs_dict, weights=None):
 
     Notes
     -----
-    Algorithm idea taken from [1].
+    Algorithm idea taken from [1]. The point-to-plane variant accumulates
+    the normal equations pair by pair, so only a small system of
+    `k * (number of point sets)` unknowns is solved.
 
     References
     ----------
@@ -138,6 +149,32 @@ def find_rototranslations(coords_dict, pairs_dict, weights=None):
      [  1.  10.   5.]
      [  1.  -2.  60.]]
 
+    Point-to-plane alignment of planar patches.
+
+    >>> coordsA = [
+    ...     (0, 0, 0), (1, 0, 0), (0, 1, 0),
+    ...     (0, 0, 0), (1, 0, 0), (0, 0, 1),
+    ...     (0, 0, 0), (0, 1, 0), (0, 0, 1)
+    ... ]
+    >>> normalsA = [(0, 0, 1)] * 3 + [(0, 1, 0)] * 3 + [(1, 0, 0)] * 3
+    >>> T = transformation.matrix(t=[0.1, -0.2, 0.3])
+    >>> coordsB = transformation.transform(
+    ...     [(0.5, 0.2, 0), (0.3, 0, 0.4), (0, 0.6, 0.1)], T)
+    >>> coords_dict = {'A': coordsA, 'B': coordsB}
+    >>> normals_dict = {'A': normalsA, 'B': [(0, 0, 1)] * 3}
+    >>> pairs_dict = {'B': {'A': [(0, 0), (1, 3), (2, 6)]}}
+    >>> weights = {'A': [1, 1, 1, 1, 1, 1], 'B': [0, 0, 0, 1, 1, 1]}
+    >>> res = find_rototranslations(
+    ...     coords_dict,
+    ...     pairs_dict,
+    ...     weights=weights,
+    ...     normals_dict=normals_dict
+    ... )
+    >>> print_rounded(res['B'].to_local(coordsB), 2)
+    [[ 0.5  0.2  0. ]
+     [ 0.3  0.   0.4]
+     [ 0.   0.6  0.1]]
+
     """
     # prepare input
     dim, center, ccoords, centers, pairs, w = _prepare_input(
@@ -146,6 +183,22 @@ def find_rototranslations(coords_dict, pairs_dict, weights=None):
         weights
     )
 
+    if normals_dict is not None:
+        normals = _ensure_normals(normals_dict, ccoords)
+        N, r = _accumulate_point_to_plane_equations(ccoords, normals, pairs)
+        oA, oB = _build_location_orientation_equations(
+            center, centers, w, _count_pairs(pairs))
+        if len(oA) > 0:
+            oA = np.array(oA)
+            N = N + oA.T @ oA
+            r = r + oA.T @ np.array(oB)
+        if not np.any(N):
+            raise ValueError("At least one equation is needed")
+
+        rcond = np.finfo(np.float64).eps * max(N.shape)
+        M = np.linalg.lstsq(N, r, rcond=rcond)[0]
+        return _extract_transformations(M, centers, center)
+
     # get equations
     rA, rB = _build_rototranslation_equations(ccoords, pairs, w)
     oA, oB = _build_location_orientation_equations(center, centers, w, len(rA))
@@ -251,6 +304,71 @@ def _build_rototranslation_equations(ccoords, wpairs, weights):
     return mA, mB
 
 
+def _accumulate_point_to_plane_equations(ccoords, normals, wpairs):
+    # Accumulates the normal equations of the point-to-plane distances pair
+    # by pair. Each point pair contributes a single equation.
+    dim = ccoords[list(ccoords.keys())[0]].shape[1]
+    unknowns = _unknowns(dim)
+    k = len(ccoords)
+    N = np.zeros((k * unknowns, k * unknowns))
+    r = np.zeros(k * unknowns)
+    for iA, keyA in enumerate(ccoords):
+        if keyA in wpairs:
+            for iB, keyB in enumerate(ccoords):
+                if keyB in wpairs[keyA]:
+
+                    # get pairs of points
+                    p, pw = wpairs[keyA][keyB]
+
+                    A = ccoords[keyA][p[:, 0], :]
+                    B = ccoords[keyB][p[:, 1], :]
+                    n = normals[keyB][p[:, 1], :]
+
+                    # project the coordinate equations on the normals
+                    m = len(p)
+                    equations_A = _equations(-A).reshape((dim, m, unknowns))
+                    equations_B = _equations(-B).reshape((dim, m, unknowns))
+                    a_A = np.einsum('ij,jik->ik', n, equations_A)
+                    a_B = np.einsum('ij,jik->ik', n, equations_B)
+                    b = np.sum(n * (B - A), axis=1)
+
+                    # weighting
+                    w2 = pw ** 2
+                    wa_A = a_A * w2[:, None]
+                    wa_B = a_B * w2[:, None]
+
+                    sA = slice(iA * unknowns, (iA + 1) * unknowns)
+                    sB = slice(iB * unknowns, (iB + 1) * unknowns)
+                    N[sA, sA] += wa_A.T @ a_A
+                    N[sB, sB] += wa_B.T @ a_B
+                    N[sA, sB] -= wa_A.T @ a_B
+                    N[sB, sA] -= wa_B.T @ a_A
+                    r[sA] += wa_A.T @ b
+                    r[sB] -= wa_B.T @ b
+
+    return N, r
+
+
+def _count_pairs(wpairs):
+    # Counts all point pairs.
+    return sum(len(wpairs[keyA][keyB][0])
+               for keyA in wpairs for keyB in wpairs[keyA])
+
+
+def _ensure_normals(normals_dict, ccoords):
+    if not isinstance(normals_dict, dict):
+        raise TypeError("'normals_dict' of type 'dict' required")
+    normals = {}
+    for key in ccoords:
+        if key not in normals_dict:
+            raise ValueError("missing normals for '%s'" % key)
+        normals[key] = assertion.ensure_coords(
+            normals_dict[key], dim=ccoords[key].shape[1])
+        if not len(normals[key]) == len(ccoords[key]):
+            raise ValueError("one normal per point of '%s' required" % key)
+    return normals
+
+
 def _build_location_orientation_equations(center, centers, weights, n):
     # try to keep the original locations and orientations
     k = len(centers)
@@ -115,7 +115,7 @@ class GeoFile:
     def corners(self):
         raise NotImplementedError()
 
-    def __len__():
+    def __len__(self):
         """Return the number of points.
 
         Returns
@@ -21,6 +21,7 @@ import pandas
 import numpy as np
 
 from .. import nptools
+from ..georecords import GeoRecords
 
 
 def loadCsv(
@@ -30,6 +31,9 @@ def loadCsv(
         dtype=None,
         header=True,
         ignore='# ',
+        usecols=None,
+        chunksize=None,
+        proj=None,
         **kwargs):
     """Simplified loading of .csv files.
 
@@ -45,14 +49,31 @@ def loadCsv(
     dtype : np.dtype
         Desired data type of the output numpy record array.
     header : bool
-        Indicates
+        Indicates whether or not the first line of the file is a header.
+    usecols : optional, list of str
+        Fields to load. Multi-column fields are selected by their field name.
+        By default, all fields are loaded.
+    chunksize : optional, positive int
+        If given, the file is read in chunks of `chunksize` lines.
+    proj : optional, Proj
+        If given, the records are returned as `GeoRecords`. Requires a field
+        'coords'.
     *\\*kwargs : optional
         Arguments passed to `pandas.read_csv`.
 
     Returns
     -------
-    np.recarary
-        Loaded data.
+    np.recarary or GeoRecords or generator
+        Loaded data. If `chunksize` is given, a generator of record arrays of
+        common data type is returned.
+
+    Notes
+    -----
+    If `dtype` is not provided in chunked mode, the data types are derived
+    from the first chunk. A `ValueError` is raised, if the values of a later
+    chunk can not be converted safely to these data types. If all columns of
+    the file share a common numeric data type, the values are converted in a
+    single block.
 
     See Also
     --------
@@ -65,6 +86,11 @@ def loadCsv(
         raise ValueError("please specify a header or data types")
     if not isinstance(header, bool):
         raise TypeError("'header' needs to be boolean")
+    if usecols is not None and not hasattr(usecols, '__iter__'):
+        raise TypeError("'usecols' needs to be iterable")
+    if chunksize is not None:
+        if not (isinstance(chunksize, int) and chunksize > 0):
+            raise ValueError("'chunksize' needs to be an integer greater zero")
 
     # specify meta data
     if dtype is not None:
@@ -72,78 +98,51 @@ def loadCsv(
         flat_names, flat_types = _flatten_dype(dtype, sep=multicol_sep)
         pd_header = 0 if header else None
     else:
-        flat_types = None
-        flat_names = None
-        pd_header = 0 if header else 1
-
-    if header and flat_names is None:
         with open(infile, 'r') as f:
             line = f.readline().replace(os.linesep, '').replace(ignore, '')
             flat_names = line.replace('\n', '').split(sep)
+        flat_types = None
+        pd_header = 0
 
-    # laod using pandas
-    df = pandas.read_csv(
-        infile,
+    # select columns
+    pd_usecols = None
+    if usecols is not None:
+        usecols = list(usecols)
+        pd_usecols = []
+        for name in flat_names:
+            if name.split(multicol_sep)[0] in usecols:
+                pd_usecols.append(name)
+        if len(pd_usecols) == 0:
+            raise ValueError("none of the columns in 'usecols' found")
+        if dtype is not None:
+            dtype = np.dtype(nptools.dtype_subset(dtype, usecols))
+            flat_types = [dt for dt in flat_types if dt[0] in pd_usecols]
+
+    read_kwargs = dict(
         sep=sep,
-        dtype=flat_types,
         names=flat_names,
+        usecols=pd_usecols,
         header=pd_header,
         skiprows=0,
         skip_blank_lines=False,
-        **kwargs
     )
+    read_kwargs.update(kwargs)
 
     if dtype is None:
-        # collect nested attributes automatically
-        records = df.to_records()
-
-        # collect information on multi-columns
-        shape_dict = {}
-        for name in records.dtype.names:
-            v = name.split(multicol_sep)
-            dt = records.dtype[name]
-            if len(v) > 1:
-                name = v[0]
-                if name not in shape_dict:
-                    shape_dict[name] = int(v[1])
-                else:
-                    i = int(v[1])
-                    if i < 0:
-                        raise ValueError("multi-columns need to start with 1")
-                    shape_dict[name] = max(shape_dict[name], i)
-
-        if len(shape_dict) > 0:
-
-            # collect multicolumns
-            data_dict = {}
-            for name in records.dtype.names:
-                v = name.split(multicol_sep)
-                if len(v) > 1:
-                    key = v[0]
-                    if key not in data_dict:
-                        shape = (len(records), shape_dict[key])
-                        dt = records.dtype[name]
-                        data_dict[key] = np.empty(shape, dtype=dt)
-                    i = int(v[1]) - 1
-                    data_dict[key][:, i] = records[name]
-                else:
-                    data_dict[name] = records[name]
-            records = nptools.recarray(data_dict)
+        if chunksize is None:
+            df = pandas.read_csv(infile, **read_kwargs)
+            dtype = _infer_dtype(df, multicol_sep)
+            return _to_records(df, dtype, multicol_sep, proj)
+        reader = pandas.read_csv(infile, chunksize=chunksize, **read_kwargs)
+        return _iter_inferred_records(reader, multicol_sep, proj)
 
+    read_kwargs['dtype'] = dict(flat_types)
+    if chunksize is None:
+        df = pandas.read_csv(infile, **read_kwargs)
+        return _to_records(df, dtype, multicol_sep, proj)
     else:
-        data_dict = {}
-        i = 0
-        for key in dtype.names:
-            dt = dtype[key]
-            if len(dt.shape) > 0:
-                data_dict[key] = np.array(df.iloc[:, i:i + dt.shape[0]])
-                i = i + dt.shape[0]
-            else:
-                data_dict[key] = np.array(df.iloc[:, i], dtype=dt)
-                i = i + 1
-        records = nptools.recarray(data_dict, dtype=dtype)
-
-    return records
+        reader = pandas.read_csv(infile, chunksize=chunksize, **read_kwargs)
+        return _iter_records(reader, dtype, multicol_sep, proj)
 
 
 def writeCsv(data, outfile, sep=",", multicol_sep=".", **kwargs):
@@ -151,8 +150,9 @@ def writeCsv(data, outfile, sep=",", multicol_sep=".", **kwargs):
 
     Parameters
     ----------
-    data : array_like
-        Data to store.
+    data : array_like or iterable of array_like
+        Data to store. An iterable of record arrays of common data type, like
+        the chunks returned by `loadCsv`, is written chunk by chunk.
     outfile : string
         File to write the data to.
     sep : optional, Character
@@ -162,39 +162,167 @@ def writeCsv(data, outfile, sep=",", multicol_sep=".", **kwargs):
         the column name. For example, the column names 'normal.1', 'normal.2'
         indicate a two dimensional attribute 'normal'.
     \*\*kwargs : optional
-        Arguments passed to np.save_txt`
+        Arguments passed to `pandas.DataFrame.to_csv`.
 
     See Also
     --------
-    loadCsv, np.save_txt
+    loadCsv, pandas.DataFrame.to_csv
 
     Notes
     -----
     Limited type validation.
 
     """
-    if not isinstance(data, (np.recarray, np.ndarray)):
-        raise ValueError("'data' needs to be an numpy (record) array")
+    if isinstance(data, (np.recarray, np.ndarray)):
+        chunks = iter([data])
+    elif hasattr(data, '__iter__'):
+        chunks = iter(data)
+    else:
+        m = "'data' needs to be an numpy (record) array or an iterable of them"
+        raise ValueError(m)
     if not os.access(os.path.dirname(outfile), os.W_OK):
         raise IOError('File %s is not writable' % outfile)
 
-    # set column names
-    names = _flatten_dype(data.dtype, sep=multicol_sep)[0]
+    dtype = None
+    with open(outfile, 'w') as f:
+        for chunk in chunks:
+            if not isinstance(chunk, (np.recarray, np.ndarray)):
+                raise ValueError("'data' needs to be an numpy (record) array")
+            if dtype is None:
+                # set column names
+                dtype = chunk.dtype
+                names = _flatten_dype(dtype, sep=multicol_sep)[0]
+                f.write('# %s\n' % sep.join(names))
+            elif not chunk.dtype == dtype:
+                raise ValueError("all chunks need to have the same data type")
 
-    # unnest columns
-    data = nptools.unnest(data, deep=True)
-    data = list(zip(*data))
+            # unnest columns
+            columns = nptools.unnest(chunk, deep=True)
+            df = pandas.DataFrame(dict(zip(names, columns)), columns=names)
+            df.to_csv(f, sep=sep, header=False, index=False, **kwargs)
 
-    header = sep.join(names)
 
-    np.savetxt(
-        outfile,
-        data,
-        fmt="%s",
-        delimiter=sep,
-        header=header,
-        *kwargs
-    )
+def _iter_records(reader, dtype, multicol_sep, proj):
+    # Helper function to convert chunks of a pandas TextFileReader.
+    for df in reader:
+        yield _to_records(df, dtype, multicol_sep, proj)
+
+
+def _iter_inferred_records(reader, multicol_sep, proj):
+    # Helper function to convert chunks of a pandas TextFileReader to the
+    # data types derived from the first chunk.
+    dtype = None
+    for df in reader:
+        chunk_dtype = _infer_dtype(df, multicol_sep)
+        if dtype is None:
+            dtype = chunk_dtype
+        elif not chunk_dtype == dtype:
+            for name in dtype.names:
+                src = chunk_dtype[name].base
+                dst = dtype[name].base
+                if not np.can_cast(src, dst, casting='safe'):
+                    m = "values of column '%s' of type '%s' can not be " + \
+                        "converted to type '%s' derived from the first " + \
+                        "chunk, please specify 'dtype'"
+                    raise ValueError(m % (name, src, dst))
+        yield _to_records(df, dtype, multicol_sep, proj)
+
+
+def _infer_dtype(df, multicol_sep):
+    # Helper function to derive the data type of a pandas DataFrame. The
+    # index is added as a field, if the data has no field 'index'.
+    flat_types = [(str(name), df[name].dtype) for name in df.columns]
+    dtype = _nest_dtype(flat_types, multicol_sep)
+    if 'index' not in dtype.names:
+        dtype = np.dtype([('index', df.index.dtype)] + dtype.descr)
+    return dtype
+
+
+def _to_records(df, dtype, multicol_sep, proj):
+    # Helper function to convert a pandas DataFrame to a record array.
+    add_index = dtype.names[0] == 'index' and 'index' not in df.columns
+    block_dtype = dtype
+    if add_index:
+        block_dtype = np.dtype(
+            [(name, dtype[name]) for name in dtype.names[1:]])
+    flat_dtype = _numeric_base_dtype(block_dtype)
+    flat_names = _flatten_dype(block_dtype, sep=multicol_sep)[0]
+    if flat_dtype is not None and list(df.columns) == flat_names:
+        # fast path: single block conversion of pure numeric data
+        values = np.ascontiguousarray(df.values, dtype=flat_dtype)
+        block = values.view(block_dtype).reshape(len(df))
+        if add_index:
+            # the fields following the index are copied as raw bytes
+            records = np.recarray(len(df), dtype=dtype)
+            records['index'] = df.index.values
+            n = dtype.itemsize - block_dtype.itemsize
+            raw = records.view(np.ndarray).view(np.uint8)
+            raw = raw.reshape((len(df), dtype.itemsize))
+            raw[:, n:] = block.view(np.uint8).reshape(
+                (len(df), block_dtype.itemsize))
+        else:
+            records = block.view(np.recarray)
+    else:
+        records = np.recarray(len(df), dtype=dtype)
+        for name in dtype.names:
+            dt = dtype[name]
+            if name == 'index' and name not in df.columns:
+                records[name] = df.index.values
+            elif len(dt.shape) > 0:
+                columns = ["%s%s%i" % (name, multicol_sep, i + 1)
+                           for i in range(dt.shape[0])]
+                records[name] = df[columns].values
+            else:
+                records[name] = df[name].values
+
+    if proj is not None:
+        records = GeoRecords(proj, records)
+    return records
+
+
+def _numeric_base_dtype(dtype):
+    # Helper function to find a common numeric base type of all fields.
+    base_dtype = None
+    for name in dtype.names:
+        dt = dtype[name]
+        dt = dt.subdtype[0] if len(dt.shape) > 0 else dt
+        if base_dtype is None:
+            base_dtype = dt
+        elif not dt == base_dtype:
+            return None
+    if base_dtype is None or base_dtype.kind not in 'iuf':
+        return None
+    return base_dtype
+
+
+def _nest_dtype(flat_types, sep='.'):
+    # Helper function to collect multi-columns to a nested data type.
+    fields = []
+    lookup = {}
+    for name, dt in flat_types:
+        v = name.split(sep)
+        if len(v) > 1:
+            key = v[0]
+            i = int(v[1])
+            if i < 1:
+                raise ValueError("multi-columns need to start with 1")
+            if key in lookup:
+                field = fields[lookup[key]]
+                field[1] = np.promote_types(field[1], dt)
+                field[2] = max(field[2], i)
+            else:
+                lookup[key] = len(fields)
+                fields.append([key, np.dtype(dt), i])
+        else:
+            fields.append([name, np.dtype(dt), 0])
+
+    dtype = []
+    for name, dt, n in fields:
+        if n > 0:
+            dtype.append((name, dt, n))
+        else:
+            dtype.append((name, dt))
+    return np.dtype(dtype)
 
 
 def _flatten_dype(dtype, sep='.'):
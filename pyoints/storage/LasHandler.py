@@ -40,6 +40,7 @@ from .. import (
     projection,
     assertion,
     nptools,
+    profiling,
 )
 
 from .BaseGeoHandler import GeoFile
@@ -119,23 +120,15 @@ class LasReader(GeoFile):
     def corners(self):
         return Extent(self.extent[[0, 1, 3, 4]]).corners
 
+    @profiling.profile('storage.LasReader.load', points=len)
     def load(self, extent=None):
 
-        lasFile = laspy.file.File(self.file, mode='r')
-
-        # check point formats
-        if lasFile.header.data_format_id not in SUPPORTED_FORMATS:
-            m = "Only point formats %s supported yet, got %"
-            raise ValueError(
-                m %
-                (SUPPORTED_FORMATS, lasFile.header.data_format_id))
+        lasFile = self._open()
 
         date = lasFile.header.date
         scale = np.array(lasFile.header.scale, dtype=np.float64)
         offset = np.array(lasFile.header.offset, dtype=np.float64)
-        las_fields = [
-            str(dim.name.encode().decode()) for dim in lasFile.point_format
-        ]  # ugly workaround to get actual strings
+        las_fields = _las_fields(lasFile)
 
         points = lasFile.points['point'].copy().view(np.recarray)
 
@@ -157,60 +150,7 @@ class LasReader(GeoFile):
             sids = iext.intersection(ecoords.T)
             points = points[sids]
 
-        # much faster than accessing lasFile.x
-        coords = np.empty((len(points), 3), dtype=np.float64)
-        coords[:, 0] = points.X * scale[0] + offset[0]
-        coords[:, 1] = points.Y * scale[1] + offset[1]
-        coords[:, 2] = points.Z * scale[2] + offset[2]
-
-        # grep data
-        omit = ['X', 'Y', 'Z']
-        dtypes = []
-        dataDict = {'coords': coords}
-        for name in las_fields:
-
-            if name == 'flag_byte':
-                values = points.flag_byte
-                if np.any(values):
-                    dataDict['return_num'] = values % 8  # bits 0, 1, 2
-                    values = values // 8
-                if np.any(values):
-                    dataDict['num_returns'] = values % 8  # bits 3, 4, 5
-                    values = values // 8
-                if np.any(values):
-                    dataDict['scan_direction_flag'] = values % 2  # bit 6
-                    values = values // 2
-                if np.any(values):
-                    dataDict['edge_of_flight_line'] = values  # bit 7
-
-            elif name == 'raw_classification':
-                values = points.raw_classification
-                if np.any(values):
-                    dataDict['classification'] = values % 32  # bits 0 to 4
-                    values = values // 32
-                if np.any(values):
-                    dataDict['synthetic'] = values % 2  # bit 5
-                    values = values // 2
-                if np.any(values):
-                    dataDict['keypoint'] = values % 2  # bit 6
-                    values = values // 2
-                if np.any(values):
-                    dataDict['withheld'] = values  # bit 7
-
-            elif name not in omit:
-                values = points[name]
-                if np.any(values):
-                    dataDict[name] = values
-
-        # collect dtypes
-        available_dtypes = LasRecords.available_fields()
-        for name in dataDict.keys():
-            for descr in available_dtypes:
-                if descr[0] == name:
-                    dtypes.append(descr)
-
-        # create recarray
-        data = nptools.recarray(dataDict, dtype=dtypes)
+        data = _points_to_records(points, las_fields, scale, offset)
 
         if len(points) == 0:
             t = np.eye(4)
@@ -218,7 +158,128 @@ class LasReader(GeoFile):
             t = transformation.t_matrix(offset)
         return LasRecords(self.proj, data, T=t, date=date)
 
+    def load_chunks(self, chunksize=1000000):
+        """Loads the points chunk by chunk.
+
+        Parameters
+        ----------
+        chunksize : optional, positive int
+            Maximum number of points per chunk.
+
+        Yields
+        ------
+        LasRecords
+            Chunk of points. In contrast to `load`, fields which are zero
+            for all points are kept to provide a common data type for all
+            chunks.
+
+        See Also
+        --------
+        load
+
+        """
+        if not (isinstance(chunksize, int) and chunksize > 0):
+            raise ValueError("'chunksize' needs to be an integer greater zero")
 
+        lasFile = self._open()
+
+        date = lasFile.header.date
+        scale = np.array(lasFile.header.scale, dtype=np.float64)
+        offset = np.array(lasFile.header.offset, dtype=np.float64)
+        las_fields = _las_fields(lasFile)
+        t = transformation.t_matrix(offset)
+
+        try:
+            points = lasFile.points['point']
+            for i in range(0, len(points), chunksize):
+                chunk = points[i:i + chunksize].copy().view(np.recarray)
+                data = _points_to_records(
+                    chunk, las_fields, scale, offset, omit_empty=False)
+                yield LasRecords(self.proj, data, T=t, date=date)
+        finally:
+            lasFile.close()
+            del lasFile
+
+    def _open(self):
+        # open the file and check the point format
+        lasFile = laspy.file.File(self.file, mode='r')
+        if lasFile.header.data_format_id not in SUPPORTED_FORMATS:
+            m = "Only point formats %s supported yet, got %"
+            raise ValueError(
+                m %
+                (SUPPORTED_FORMATS, lasFile.header.data_format_id))
+        return lasFile
+
+
+def _las_fields(lasFile):
+    # ugly workaround to get actual strings
+    return [str(dim.name.encode().decode()) for dim in lasFile.point_format]
+
+
+def _points_to_records(points, las_fields, scale, offset, omit_empty=True):
+    # Helper function to convert raw LAS points to a record array. Fields
+    # with only zero values are omitted, if `omit_empty` is True.
+
+    # much faster than accessing lasFile.x
+    coords = np.empty((len(points), 3), dtype=np.float64)
+    coords[:, 0] = points.X * scale[0] + offset[0]
+    coords[:, 1] = points.Y * scale[1] + offset[1]
+    coords[:, 2] = points.Z * scale[2] + offset[2]
+
+    def keep(values):
+        return not omit_empty or np.any(values)
+
+    # grep data
+    omit = ['X', 'Y', 'Z']
+    dtypes = []
+    dataDict = {'coords': coords}
+    for name in las_fields:
+
+        if name == 'flag_byte':
+            values = points.flag_byte
+            if keep(values):
+                dataDict['return_num'] = values % 8  # bits 0, 1, 2
+                values = values // 8
+            if keep(values):
+                dataDict['num_returns'] = values % 8  # bits 3, 4, 5
+                values = values // 8
+            if keep(values):
+                dataDict['scan_direction_flag'] = values % 2  # bit 6
+                values = values // 2
+            if keep(values):
+                dataDict['edge_of_flight_line'] = values  # bit 7
+
+        elif name == 'raw_classification':
+            values = points.raw_classification
+            if keep(values):
+                dataDict['classification'] = values % 32  # bits 0 to 4
+                values = values // 32
+            if keep(values):
+                dataDict['synthetic'] = values % 2  # bit 5
+                values = values // 2
+            if keep(values):
+                dataDict['keypoint'] = values % 2  # bit 6
+                values = values // 2
+            if keep(values):
+                dataDict['withheld'] = values  # bit 7
+
+        elif name not in omit:
+            values = points[name]
+            if keep(values):
+                dataDict[name] = values
+
+    # collect dtypes
+    available_dtypes = LasRecords.available_fields()
+    for name in dataDict.keys():
+        for descr in available_dtypes:
+            if descr[0] == name:
+                dtypes.append(descr)
+
+    # create recarray
+    return nptools.recarray(dataDict, dtype=dtypes)
+
+
+@profiling.profile('storage.writeLas', points='geoRecords')
 def writeLas(geoRecords, outfile, point_format=3):
     """ Write a LAS file to disc.
 
@@ -108,11 +108,50 @@ class RasterReader(GeoFile):
 
     def load(self, extent=None):
         bands, T, proj = load_gdal(self.file, proj=self.proj, extent=extent)
-        shape = (bands.shape[0], bands.shape[1])
-        num_bands = bands.shape[2] if len(bands.shape) > 2 else 1
-        attr = np.recarray(shape, dtype=[('bands', bands.dtype, num_bands)])
-        attr.bands = bands
-        return grid.Grid(proj, attr, T)
+        return _bands_to_grid(bands, T, proj)
+
+    def iter_blocks(self, block_shape=None):
+        """Iterates over the raster block by block.
+
+        Parameters
+        ----------
+        block_shape : optional, array_like(int, shape=(2))
+            Desired number of rows and columns of the blocks. Ideally, a
+            multiple of the internal block shape of the raster file. If None,
+            the internal block shape is used.
+
+        Yields
+        ------
+        Grid
+            Raster tile of shape `block_shape` or smaller at the borders of
+            the raster.
+
+        See Also
+        --------
+        RasterWriter
+
+        """
+        gdalRaster = gdal.Open(self.file, gdal.GA_ReadOnly)
+
+        if block_shape is None:
+            cols, rows = gdalRaster.GetRasterBand(1).GetBlockSize()
+            block_shape = (rows, cols)
+        block_shape = assertion.ensure_shape(block_shape, dim=2)
+        if not np.all(block_shape > 0):
+            raise ValueError("'block_shape' needs to be greater zero")
+
+        rows, cols = self._shape
+        for row in range(0, rows, block_shape[0]):
+            for col in range(0, cols, block_shape[1]):
+                shape = (
+                    min(block_shape[0], rows - row),
+                    min(block_shape[1], cols - col)
+                )
+                bands = _read_window(gdalRaster, (row, col), shape)
+                T = _window_transform(self.t, (row, col))
+                yield _bands_to_grid(bands, T, self.proj)
+
+        del gdalRaster
 
 
 def load_gdal(filename, proj=None, extent=None):
@@ -157,11 +196,7 @@ def load_gdal(filename, proj=None, extent=None):
     if extent is not None:
         T, corner, shape = grid.extentinfo(T, extent)
 
-    bands = np.swapaxes(
-        gdalRaster.ReadAsArray(corner[1], corner[0], shape[1], shape[0]).T,
-        0,
-        1
-    )
+    bands = _read_window(gdalRaster, corner, shape)
     del gdalRaster
     return bands, T, proj
 
@@ -196,7 +231,7 @@ def write_gdal(
 
     See Also
     --------
-    writeRaster
+    writeRaster, RasterWriter
 
     """
     # validate input
@@ -215,48 +250,19 @@ def write_gdal(
     bands = image.astype(nptools.minimum_numeric_dtype(image))
     num_bands = 1 if len(bands.shape) == 2 else bands.shape[2]
 
-    driver = gdal.GetDriverByName(driver)
-    gdalRaster = driver.Create(
+    writer = RasterWriter(
         outfile,
-        bands.shape[1],
-        bands.shape[0],
-        num_bands,
-        numpy_to_gdal_dtype(bands.dtype)
+        bands.shape[:2],
+        T=T,
+        proj=proj,
+        num_bands=num_bands,
+        dtype=bands.dtype,
+        no_data=no_data,
+        driver=driver,
+        tiled=False
     )
-
-    # SetProjection
-    if proj is not None:
-        if not isinstance(proj, projection.Proj):
-            raise ValueError("'proj' needs to be an instance of Proj")
-        gdalRaster.SetProjection(proj.wkt)
-
-    # SetGeoTransform
-    if T is not None:
-        T = assertion.ensure_tmatrix(T, dim=2)
-        t = transformation.matrix_to_gdal(T)
-        gdalRaster.SetGeoTransform(t)
-
-    # set bands
-    if num_bands == 1:
-        band = gdalRaster.GetRasterBand(1)
-        if no_data is not None:
-            band.SetNoDataValue(no_data)
-        band.WriteArray(bands)
-        band.FlushCache()
-    else:
-        for i in range(num_bands):
-            band = gdalRaster.GetRasterBand(i + 1)
-            if no_data is not None:
-                band.SetNoDataValue(no_data)
-
-            band.WriteArray(bands[:, :, i])
-            band.FlushCache()
-            band = None
-            del band
-
-    gdalRaster.FlushCache()
-    gdalRaster = None
-    del gdalRaster
+    writer.write_array(bands, (0, 0))
+    writer.close()
 
 
 def writeRaster(raster, outfile, field='bands', no_data=None):
@@ -279,7 +285,7 @@ def writeRaster(raster, outfile, field='bands', no_data=None):
 
     See Also
     --------
-    writeTif
+    write_gdal, RasterWriter
 
     """
     if not isinstance(raster, grid.Grid):
@@ -295,3 +301,283 @@ def writeRaster(raster, outfile, field='bands', no_data=None):
     image = raster[field]
 
     write_gdal(image, outfile, T=raster.t, proj=raster.proj, no_data=no_data)
+
+
+class RasterWriter:
+    """Writes a raster to disc tile by tile. Only the tile currently written
+    is kept in memory, so the output raster might be much larger than the
+    available memory.
+
+    Parameters
+    ----------
+    outfile : String
+        File to save the raster to.
+    shape : array_like(int, shape=(2))
+        Number of rows and columns of the output raster.
+    T : optional, array_like(Number, shape=(3, 3))
+        Projection matrix of the output raster.
+    proj : optional, Proj
+        Projection to be used.
+    num_bands : optional, positive int
+        Number of raster bands.
+    dtype : optional, np.dtype
+        Numeric data type of the raster bands.
+    no_data : optional, Number
+        No data value to be used.
+    driver : optional, str
+        Gdal driver.
+    tiled : optional, bool
+        Indicates whether or not to create an internally tiled raster.
+        Currently only supported by the 'GTiff' driver.
+    block_shape : optional, array_like(int, shape=(2))
+        Number of rows and columns of the internal tiles.
+    compress : optional, str
+        Compression method like 'DEFLATE', 'LZW' or 'ZSTD'. Currently only
+        supported by the 'GTiff' driver.
+    overviews : optional, array_like(int)
+        Overview levels to build on closing the file, e.g. `[2, 4, 8, 16]`.
+    resampling : optional, str
+        Resampling method used to build the overviews.
+    options : optional, list of str
+        Additional gdal creation options.
+
+    Attributes
+    ----------
+    t : LocalSystem(Number, shape=(3, 3))
+        Transformation matrix of the output raster.
+    shape : tuple(int, int)
+        Number of rows and columns of the output raster.
+
+    Raises
+    ------
+    IOError
+
+    See Also
+    --------
+    RasterReader.iter_blocks, writeRaster
+
+    Examples
+    --------
+
+    Write a raster tile by tile.
+
+    >>> import os, tempfile
+    >>> from pyoints import projection, transformation, grid
+
+    >>> T = transformation.matrix(t=[100, 200], s=[2, -2])
+    >>> outfile = os.path.join(tempfile.mkdtemp(), 'tiled.tif')
+    >>> writer = RasterWriter(
+    ...     outfile, (300, 400), T, projection.Proj(), dtype=np.uint8,
+    ...     block_shape=(128, 128), compress='DEFLATE', overviews=[2, 4])
+    >>> for row in range(0, 300, 128):
+    ...     for col in range(0, 400, 128):
+    ...         shape = (min(128, 300 - row), min(128, 400 - col))
+    ...         rec = np.recarray(shape, dtype=[('bands', np.uint8)])
+    ...         rec.bands = row // 128 + col // 128
+    ...         tile_T = transformation.matrix(
+    ...             t=[100 + 2 * col, 200 - 2 * row], s=[2, -2])
+    ...         writer.write(grid.Grid(projection.Proj(), rec, tile_T))
+    >>> writer.close()
+
+    Read the raster block by block.
+
+    >>> reader = RasterReader(outfile)
+    >>> for tile in reader.iter_blocks((128, 256)):
+    ...     print((tile.shape, tile.bands.max()))
+    ((128, 256), 1)
+    ((128, 144), 3)
+    ((128, 256), 2)
+    ((128, 144), 4)
+    ((44, 256), 3)
+    ((44, 144), 5)
+
+    """
+
+    def __init__(
+            self,
+            outfile,
+            shape,
+            T=None,
+            proj=None,
+            num_bands=1,
+            dtype=float,
+            no_data=None,
+            driver='GTiff',
+            tiled=True,
+            block_shape=(256, 256),
+            compress=None,
+            overviews=None,
+            resampling='AVERAGE',
+            options=[]):
+
+        if not os.access(os.path.dirname(outfile), os.W_OK):
+            raise IOError('File %s is not writable' % outfile)
+        shape = assertion.ensure_shape(shape, dim=2)
+        if not (isinstance(num_bands, int) and num_bands > 0):
+            raise ValueError("'num_bands' needs to be an integer greater zero")
+        if no_data is not None and not isinstance(no_data, Number):
+            raise TypeError("'no_data' needs to be numeric")
+        if overviews is not None:
+            overviews = [int(level) for level in overviews]
+
+        options = list(options)
+        if tiled:
+            block_shape = assertion.ensure_shape(block_shape, dim=2)
+            options.extend([
+                'TILED=YES',
+                'BLOCKYSIZE=%i' % block_shape[0],
+                'BLOCKXSIZE=%i' % block_shape[1],
+            ])
+        if compress is not None:
+            options.append('COMPRESS=%s' % compress)
+
+        gdalDriver = gdal.GetDriverByName(driver)
+        self._gdalRaster = gdalDriver.Create(
+            outfile,
+            int(shape[1]),
+            int(shape[0]),
+            num_bands,
+            numpy_to_gdal_dtype(np.dtype(dtype)),
+            options=options
+        )
+
+        # SetProjection
+        if proj is not None:
+            if not isinstance(proj, projection.Proj):
+                raise ValueError("'proj' needs to be an instance of Proj")
+            self._gdalRaster.SetProjection(proj.wkt)
+
+        # SetGeoTransform
+        if T is not None:
+            T = transformation.LocalSystem(assertion.ensure_tmatrix(T, dim=2))
+            self._gdalRaster.SetGeoTransform(transformation.matrix_to_gdal(T))
+
+        if no_data is not None:
+            for i in range(num_bands):
+                self._gdalRaster.GetRasterBand(i + 1).SetNoDataValue(no_data)
+
+        self.t = T
+        self.shape = (int(shape[0]), int(shape[1]))
+        self._num_bands = num_bands
+        self._overviews = overviews
+        self._resampling = resampling
+
+    @property
+    def num_bands(self):
+        return self._num_bands
+
+    def write(self, raster, field='bands'):
+        """Writes a raster tile to the output raster. The position of the tile
+        is derived from its transformation matrix. Cells outside the output
+        raster are ignored.
+
+        Parameters
+        ----------
+        raster : Grid(shape=(rows, cols))
+            Two dimensional raster tile to write.
+        field : optional, str
+            Field considered as raster bands.
+
+        """
+        if not isinstance(raster, grid.Grid):
+            m = "'raster' needs to be of type 'Grid', got %s" % type(raster)
+            raise TypeError(m)
+        if not raster.dim == 2:
+            raise ValueError("'raster' needs to be two dimensional")
+        if self.t is None:
+            raise ValueError("output transformation matrix not set")
+        if not np.allclose(raster.t[:2, :2], self.t[:2, :2]):
+            raise ValueError("'raster' needs to have the same cell geometry")
+        if field not in raster.dtype.names:
+            raise ValueError("'raster' needs to have a field '%s'" % field)
+
+        origin = transformation.LocalSystem(self.t).to_global(raster.t.origin)
+        corner = np.round(origin).astype(int)[::-1]
+        self.write_array(raster[field], corner)
+
+    def write_array(self, image, corner):
+        """Writes an image tile to the output raster.
+
+        Parameters
+        ----------
+        image : np.ndarray(Number, shape=(rows, cols, k))
+            Image tile to write.
+        corner : array_like(int, shape=(2))
+            Row and column of the output raster corresponding to the first
+            cell of the image.
+
+        """
+        if not isinstance(image, np.ndarray):
+            m = "'image' needs to be an instance of 'np.ndarray', got %s"
+            raise TypeError(m % type(image))
+        if not len(image.shape) in (2, 3):
+            raise ValueError("'image' has an unexpected shape for a raster")
+        num_bands = 1 if len(image.shape) == 2 else image.shape[2]
+        if not num_bands == self._num_bands:
+            raise ValueError("number of bands does not match")
+        if self._gdalRaster is None:
+            raise IOError("raster has been closed already")
+
+        # clip to raster bounds
+        row, col = int(corner[0]), int(corner[1])
+        r0, c0 = max(0, -row), max(0, -col)
+        r1 = min(image.shape[0], self.shape[0] - row)
+        c1 = min(image.shape[1], self.shape[1] - col)
+        if r1 <= r0 or c1 <= c0:
+            return
+        image = image[r0:r1, c0:c1, ...]
+
+        for i in range(num_bands):
+            band = self._gdalRaster.GetRasterBand(i + 1)
+            data = image if num_bands == 1 else image[:, :, i]
+            band.WriteArray(data, xoff=col + c0, yoff=row + r0)
+            band = None
+
+    def close(self):
+        """Closes the file and builds the overviews, if requested."""
+        if self._gdalRaster is None:
+            return
+        self._gdalRaster.FlushCache()
+        if self._overviews is not None and len(self._overviews) > 0:
+            self._gdalRaster.BuildOverviews(self._resampling, self._overviews)
+        self._gdalRaster = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _read_window(gdalRaster, corner, shape):
+    # Helper function to read a raster window band by band.
+    num_bands = gdalRaster.RasterCount
+    bands = None
+    for i in range(num_bands):
+        band = gdalRaster.GetRasterBand(i + 1)
+        data = band.ReadAsArray(
+            int(corner[1]), int(corner[0]), int(shape[1]), int(shape[0]))
+        if num_bands == 1:
+            return data
+        if bands is None:
+            bands = np.empty((data.shape[0], data.shape[1], num_bands),
+                             dtype=data.dtype)
+        bands[:, :, i] = data
+    return bands
+
+
+def _window_transform(T, corner):
+    # Helper function to get the transformation matrix of a raster window.
+    origin = grid.keys_to_coords(T, [np.array(corner) - 0.5])[0, :]
+    t = np.copy(T)
+    t[:-1, 2] = origin
+    return t
+
+
+def _bands_to_grid(bands, T, proj):
+    # Helper function to convert image bands to a Grid.
+    shape = (bands.shape[0], bands.shape[1])
+    num_bands = bands.shape[2] if len(bands.shape) > 2 else 1
+    attr = np.recarray(shape, dtype=[('bands', bands.dtype, num_bands)])
+    attr.bands = bands
+    return grid.Grid(proj, attr, T)
@@ -27,8 +27,19 @@ from .. import projection
 from ..georecords import GeoRecords
 
 
-def create_random_GeoRecords(center=None, epsg=25832, dim=3, n=1000, scale=10):
-    # Create GeoRecords from scratch (for examples)
+def create_random_GeoRecords(
+        center=None,
+        epsg=25832,
+        dim=3,
+        n=1000,
+        scale=10,
+        seed=None,
+        chunksize=1000000):
+    # Create GeoRecords from scratch (for examples and benchmarks). Random
+    # values are drawn chunk by chunk to limit the memory overhead of large
+    # point clouds. If `seed` is given, a private random state is used.
+    rng = np.random if seed is None else np.random.RandomState(seed)
+
     dtype = [
         ('coords', np.float, dim),
         ('intensity', np.uint),
@@ -40,8 +51,12 @@ def create_random_GeoRecords(center=None, epsg=25832, dim=3, n=1000, scale=10):
     ]
     records = np.recarray(n, dtype=dtype)
 
-    records['coords'] = np.random.rand(n, dim) * scale
-    records['intensity'] = np.random.rand(n) * 255
+    for i in range(0, n, chunksize):
+        m = min(chunksize, n - i)
+        records['coords'][i:i + m] = rng.rand(m, dim) * scale
+    for i in range(0, n, chunksize):
+        m = min(chunksize, n - i)
+        records['intensity'][i:i + m] = rng.rand(m) * 255
     records['classification'] = 2
     records['classification'][records.coords[:, 2] > 0.1 * scale] = 3
     records['classification'][records.coords[:, 2] > 0.3 * scale] = 4
@@ -32,6 +32,7 @@ from numpy import (
 
 from . import (
     distance,
+    profiling,
 )
 from .assertion import (
     ensure_coords,
@@ -920,6 +921,7 @@ class LocalSystem(np.ndarray, object):
         return var / var.sum()
 
 
+@profiling.profile('transformation.eigen', points='coords')
 def eigen(coords):
     """Fit eigenvectors to coordinates.
 
@@ -20,6 +20,7 @@
 """
 
 import numpy as np
+from numbers import Integral
 
 from . import (
     assertion,
@@ -861,8 +862,7 @@ class Vector(object):
             return self.origin + k * self.vec
         else:
             ks = assertion.ensure_numvector(k)
-            v = np.array([self.vec * l for l in ks])
-            return v + self.origin
+            return np.outer(ks, self.vec) + self.origin
 
     def angles(self, deg=False):
         """Calculates the angles of the vector in relation to the coordinate
@@ -1252,7 +1252,10 @@ class Plane(object):
                 raise ValueError(m % ((self.dim - 1), len(k)))
             vec = (self.vec.T * k).sum(1)
         elif len(k.shape) == 2:
-            vec = np.array([(self.vec.T * l).sum(1) for l in k])
+            if not k.shape[1] == (self.dim - 1):
+                m = "'k' needs to have %i columns, got %i"
+                raise ValueError(m % ((self.dim - 1), k.shape[1]))
+            vec = np.dot(k, self.vec)
         else:
             raise ValueError("'k' needs to have a shape of (2) or (n, 2)")
         coords = self.origin + vec
@@ -1308,6 +1311,442 @@ class Plane(object):
         return "origin: %s; vec: %s" % (str(self.origin), vec_str)
 
 
+class VectorSet(object):
+    """Class to represent `m` vectors as arrays. The vectors are evaluated
+    simultaneously for batches of points.
+
+    Parameters
+    ----------
+    origins,vecs : array_like(Number, shape=(m, k))
+        The arrays `origins` and `vecs` define the locations and orientations
+        of `m` vectors in a `k` dimensional vector space.
+
+    Attributes
+    ----------
+    origins,targets,vecs : np.ndarray(Number, shape=(m, k))
+        Vector `i` starts at point `origins[i]` and points to `targets[i]`.
+    lengths : np.ndarray(Number, shape=(m))
+        Lengths of the vectors.
+    dim : positive int
+        Number of coordinate dimensions of the vectors.
+
+    Notes
+    -----
+    Evaluating `m` vectors for `n` points results in arrays of shape `(m, n)`.
+    To limit the memory required, the points can be processed in chunks.
+
+    See Also
+    --------
+    Vector, PlaneSet
+
+    Examples
+    --------
+
+    >>> vectors = VectorSet([(0, 0), (1, 1), (0, 2)], [(1, 0), (0, 2), (2, 2)])
+    >>> print(len(vectors))
+    3
+    >>> print(vectors[1])
+    origin: [1 1]; vec: [0 2]
+    >>> print_rounded(vectors.lengths)
+    [ 1.    2.    2.83]
+
+    Calculate the distances of some points to the vectors.
+
+    >>> coords = [(0, 0), (1, 2), (2, 2)]
+    >>> print_rounded(vectors.distance(coords))
+    [[ 0.    2.    2.  ]
+     [ 1.    0.    1.  ]
+     [ 1.41  0.71  1.41]]
+
+    Select the vector closest to a point.
+
+    >>> i = np.argmin(vectors.distance([(1, 2)])[:, 0])
+    >>> print(vectors[i])
+    origin: [1 1]; vec: [0 2]
+
+    Calculate the relative positions of the points in vector direction.
+
+    >>> print_rounded(vectors.k(coords))
+    [[ 0.    1.    2.  ]
+     [-0.5   0.5   0.5 ]
+     [-0.5   0.25  0.5 ]]
+
+    Get the coordinates of relative positions.
+
+    >>> print_rounded(vectors([1, 0.5, -1]))
+    [[ 1.  0.]
+     [ 1.  2.]
+     [-2.  0.]]
+
+    """
+
+    def __init__(self, origins, vecs):
+        origins = assertion.ensure_coords(origins)
+        vecs = assertion.ensure_coords(vecs, dim=origins.shape[1])
+        if not len(origins) == len(vecs):
+            m = "'origins' and 'vecs' need to have the same length"
+            raise ValueError(m)
+        self._origins = origins
+        self._vecs = vecs
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        """Creates a set of vectors from a list of `Vector` objects.
+
+        Parameters
+        ----------
+        vectors : list of Vector
+            Vectors to combine.
+
+        Returns
+        -------
+        VectorSet
+
+        """
+        origins = [vector.origin for vector in vectors]
+        vecs = [vector.vec for vector in vectors]
+        return cls(origins, vecs)
+
+    @property
+    def dim(self):
+        return self._origins.shape[1]
+
+    @property
+    def origins(self):
+        return self._origins
+
+    @property
+    def vecs(self):
+        return self._vecs
+
+    @property
+    def targets(self):
+        return self._origins + self._vecs
+
+    @property
+    def lengths(self):
+        return distance.norm(self._vecs)
+
+    def __len__(self):
+        return len(self._origins)
+
+    def __getitem__(self, i):
+        if isinstance(i, Integral):
+            return Vector(self._origins[i, :], self._vecs[i, :])
+        return VectorSet(self._origins[i, :], self._vecs[i, :])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def k(self, global_coords):
+        """Calculates the relative positions of points in the directions of
+        the vectors.
+
+        Parameters
+        ----------
+        global_coords : array_like(Number, shape=(n, k))
+            Represents `n` points of `k` dimensions.
+
+        Returns
+        -------
+        np.ndarray(Number, shape=(m, n))
+            Relative positions of the points for each vector.
+
+        See Also
+        --------
+        Vector.k
+
+        """
+        coords = assertion.ensure_coords(global_coords, dim=self.dim)
+        sq_lengths = (self._vecs ** 2).sum(1)
+        ov = (self._origins * self._vecs).sum(1)
+        return (np.dot(self._vecs, coords.T) - ov[:, None]) / \
+            sq_lengths[:, None]
+
+    def __call__(self, k):
+        """Converts relative positions in vector directions to global
+        coordinates.
+
+        Parameters
+        ----------
+        k : array_like(Number, shape=(m)) or array_like(Number, shape=(m, n))
+            Relative positions per vector.
+
+        Returns
+        -------
+        np.ndarray(Number, shape=(m, k)) or np.ndarray(Number, shape=(m, n, k))
+            Global coordinates.
+
+        """
+        k = assertion.ensure_numarray(k)
+        if not len(k) == len(self):
+            raise ValueError("'k' needs to have a length of %i" % len(self))
+        if len(k.shape) == 1:
+            return self._origins + k[:, None] * self._vecs
+        elif len(k.shape) == 2:
+            return self._origins[:, None, :] + \
+                k[:, :, None] * self._vecs[:, None, :]
+        else:
+            raise ValueError("'k' needs to have a shape of (m) or (m, n)")
+
+    def distance(self, global_coords):
+        """Calculates the distances between points and the vectors.
+
+        Parameters
+        ----------
+        global_coords : array_like(Number, shape=(n, k))
+            Represents `n` points of `k` dimensions.
+
+        Returns
+        -------
+        np.ndarray(Number, shape=(m, n))
+            Distances of the points to the lines defined by the vectors.
+
+        See Also
+        --------
+        Vector.distance
+
+        """
+        coords = assertion.ensure_coords(global_coords, dim=self.dim)
+
+        # center to reduce numerical errors of large coordinates
+        center = coords.mean(0) if len(coords) > 0 else np.zeros(self.dim)
+        coords = coords - center
+        origins = self._origins - center
+
+        # squared lengths of the projections to the vectors
+        proj = np.dot(self._vecs, coords.T)
+        proj -= (origins * self._vecs).sum(1)[:, None]
+        proj **= 2
+        proj /= (self._vecs ** 2).sum(1)[:, None]
+
+        # squared distances to the origins minus the projections (in place)
+        dists = np.dot(origins, coords.T)
+        dists *= -2
+        dists += (coords ** 2).sum(1)[None, :]
+        dists += (origins ** 2).sum(1)[:, None]
+        dists -= proj
+        np.maximum(dists, 0, out=dists)
+        return np.sqrt(dists, out=dists)
+
+
+class PlaneSet(object):
+    """Class to represent `m` hyperplanes as arrays. The planes are
+    evaluated simultaneously for batches of points.
+
+    Parameters
+    ----------
+    origins : array_like(Number, shape=(m, k))
+        Origins of the planes.
+    vecs : array_like(Number, shape=(m, k-1, k))
+        The `k`-1 vectors of each plane defining its orientation.
+
+    Attributes
+    ----------
+    origins : np.ndarray(Number, shape=(m, k))
+        Origins of the planes.
+    vecs : np.ndarray(Number, shape=(m, k-1, k))
+        Vectors defining the orientations of the planes.
+    normals : np.ndarray(Number, shape=(m, k))
+        Normalized normals of the planes.
+    dim : positive int
+        Number of coordinate dimensions of the planes.
+
+    Notes
+    -----
+    Evaluating `m` planes for `n` points results in arrays of shape `(m, n)`.
+    To limit the memory required, the points can be processed in chunks.
+
+    See Also
+    --------
+    Plane, VectorSet
+
+    Examples
+    --------
+
+    Create three planes from points.
+
+    >>> coords = [
+    ...     [(0, 0, 0), (1, 0, 0), (0, 1, 0)],
+    ...     [(0, 0, 1), (1, 0, 1), (0, 1, 1)],
+    ...     [(0, 0, 0), (0, 1, 0), (0, 0, 1)],
+    ... ]
+    >>> planes = PlaneSet.from_points(coords)
+    >>> print(len(planes))
+    3
+    >>> print(planes[2])
+    origin: [0 0 0]; vec: [0 1 0], [0 0 1]
+    >>> print_rounded(np.abs(planes.normals))
+    [[ 0.  0.  1.]
+     [ 0.  0.  1.]
+     [ 1.  0.  0.]]
+
+    Calculate the distances of some points to the planes.
+
+    >>> coords = [(0, 0, 0), (1, 2, 3), (-2, 0, 0.5)]
+    >>> print_rounded(planes.distance(coords))
+    [[ 0.   3.   0.5]
+     [ 1.   2.   0.5]
+     [ 0.   1.   2. ]]
+
+    Select the plane most distant to a point.
+
+    >>> i = np.argmax(planes.distance([(1, 2, 3)])[:, 0])
+    >>> print(planes[i])
+    origin: [0 0 0]; vec: [1 0 0], [0 1 0]
+
+    Get the coordinates of relative positions.
+
+    >>> print_rounded(planes([(1, 1), (2, 0), (0, 3)]))
+    [[1 1 0]
+     [2 0 1]
+     [0 0 3]]
+
+    """
+
+    def __init__(self, origins, vecs):
+        origins = assertion.ensure_coords(origins)
+        vecs = assertion.ensure_numarray(vecs)
+        m, dim = origins.shape
+        if not vecs.shape == (m, dim - 1, dim):
+            msg = "'vecs' needs to have a shape of (%i, %i, %i)"
+            raise ValueError(msg % (m, dim - 1, dim))
+        self._origins = origins
+        self._vecs = vecs
+
+    @classmethod
+    def from_planes(cls, planes):
+        """Creates a set of planes from a list of `Plane` objects.
+
+        Parameters
+        ----------
+        planes : list of Plane
+            Planes to combine.
+
+        Returns
+        -------
+        PlaneSet
+
+        """
+        origins = [plane.origin for plane in planes]
+        vecs = [plane.vec for plane in planes]
+        return cls(origins, vecs)
+
+    @classmethod
+    def from_points(cls, coords):
+        """Creates planes, each passing through `k` points.
+
+        Parameters
+        ----------
+        coords : array_like(Number, shape=(m, k, k))
+            Sets of `k` points of `k` dimensions. The first point of each set
+            defines the origin of a plane.
+
+        Returns
+        -------
+        PlaneSet
+
+        """
+        coords = assertion.ensure_numarray(coords)
+        if not (len(coords.shape) == 3 and
+                coords.shape[1] == coords.shape[2]):
+            raise ValueError("'coords' needs to have a shape of (m, k, k)")
+        origins = coords[:, 0, :]
+        vecs = coords[:, 1:, :] - origins[:, None, :]
+        return cls(origins, vecs)
+
+    @property
+    def dim(self):
+        return self._origins.shape[1]
+
+    @property
+    def origins(self):
+        return self._origins
+
+    @property
+    def vecs(self):
+        return self._vecs
+
+    @property
+    def normals(self):
+        if not hasattr(self, '_normals'):
+            # the right singular vector of the smallest singular value is
+            # orthogonal to the plane vectors
+            self._normals = np.linalg.svd(self._vecs)[2][:, -1, :]
+        return self._normals
+
+    def __len__(self):
+        return len(self._origins)
+
+    def __getitem__(self, i):
+        if isinstance(i, Integral):
+            return Plane(self._origins[i, :], *self._vecs[i, :, :])
+        return PlaneSet(self._origins[i, :], self._vecs[i, :, :])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __call__(self, k):
+        """Converts relative positions in the directions of the plane vectors
+        to global coordinates.
+
+        Parameters
+        ----------
+        k : array_like(Number, shape=(m, k-1))
+            Relative positions per plane. Alternatively an
+            array_like(Number, shape=(m, n, k-1)) provides `n` positions per
+            plane.
+
+        Returns
+        -------
+        np.ndarray(Number, shape=(m, k)) or np.ndarray(Number, shape=(m, n, k))
+            Global coordinates.
+
+        See Also
+        --------
+        Plane.__call__
+
+        """
+        k = assertion.ensure_numarray(k)
+        if not (len(k) == len(self) and k.shape[-1] == self.dim - 1):
+            m = "'k' needs to have a shape of (%i, %i) or (%i, n, %i)"
+            raise ValueError(m % (len(self), self.dim - 1,
+                                  len(self), self.dim - 1))
+        if len(k.shape) == 2:
+            return self._origins + np.einsum('ij,ijk->ik', k, self._vecs)
+        elif len(k.shape) == 3:
+            return self._origins[:, None, :] + \
+                np.einsum('inj,ijk->ink', k, self._vecs)
+        else:
+            raise ValueError("'k' needs to have a shape of (m, 2)")
+
+    def distance(self, global_coords):
+        """Calculates the distances between points and the planes.
+
+        Parameters
+        ----------
+        global_coords : array_like(Number, shape=(n, k))
+            Represents `n` points of `k` dimensions.
+
+        Returns
+        -------
+        np.ndarray(Number, shape=(m, n))
+            Distances of the points to the planes.
+
+        See Also
+        --------
+        Plane.distance
+
+        """
+        coords = assertion.ensure_coords(global_coords, dim=self.dim)
+        normals = self.normals
+        dists = np.dot(normals, coords.T)
+        dists -= (self._origins * normals).sum(1)[:, None]
+        return np.abs(dists, out=dists)
+
+
 def vector_surface_intersection(vec, surface, eps=0.001, max_iter=20):
     """Approximates the intersection point between a `k` dimensional vector
     and a `k` dimensional surface iteratively.
@@ -1325,6 +1764,10 @@ def vector_surface_intersection(vec, surface, eps=0.001, max_iter=20):
     coord : np.array_like(Number, shape=(k))
         Approximate intersection point between the vector and the surface.
 
+    See Also
+    --------
+    vectors_surface_intersection
+
     Examples
     --------
 
@@ -1346,6 +1789,80 @@ def vector_surface_intersection(vec, surface, eps=0.001, max_iter=20):
     """
     if not isinstance(vec, Vector):
         raise TypeError("'vec' needs to be an instance of Vector")
+    coords, _ = vectors_surface_intersection(
+        [vec.origin], [vec.vec], surface, eps=eps, max_iter=max_iter)
+    return coords[0, :]
+
+
+def vectors_surface_intersection(
+        origins,
+        vecs,
+        surface,
+        eps=0.001,
+        max_iter=20):
+    """Approximates the intersection points between `n` vectors and a `k`
+    dimensional surface iteratively.
+
+    Parameters
+    ----------
+    origins,vecs : array_like(Number, shape=(n, k))
+        Origins and orientations of `n` vectors in a `k` dimensional vector
+        space.
+    surface : callable
+        Surface model. The model needs to receive coordinates as an
+        argument and needs to return the distance to the surface.
+    eps : optional, positive Number
+        Maximum residual of a converged intersection point.
+    max_iter : optional, positive int
+        Maximum number of iterations.
+
+    Returns
+    -------
+    coords : np.ndarray(Number, shape=(n, k))
+        Approximate intersection points.
+    converged : np.ndarray(bool, shape=(n))
+        Indicates whether or not the approximation of an intersection point
+        has converged.
+
+    Notes
+    -----
+    In each iteration, the surface model is called once for all vectors,
+    which have not converged yet.
+
+    See Also
+    --------
+    vector_surface_intersection, vectors_raster_intersection
+
+    Examples
+    --------
+
+    >>> from pyoints import surface, interpolate
+
+    Create a callable surface object and some vectors.
+
+    >>> surface = surface.Surface(
+    ...         [(0, 0, 0), (0, 2, 0), (2, 1, 4)],
+    ...         method=interpolate.LinearInterpolator
+    ...     )
+    >>> origins = [(1, 1, -1), (0.5, 1, 3), (1, 1, 0)]
+    >>> vecs = [(0, 0, 1), (0, 0, -2), (0.2, 0, 1)]
+
+    Calculate the intersection points.
+
+    >>> coords, converged = vectors_surface_intersection(
+    ...     origins, vecs, surface)
+    >>> print_rounded(coords)
+    [[ 1.    1.    2.  ]
+     [ 0.5   1.    1.  ]
+     [ 1.67  1.    3.33]]
+    >>> print(converged)
+    [ True  True  True]
+
+    """
+    origins = assertion.ensure_coords(origins)
+    vecs = assertion.ensure_coords(vecs, dim=origins.shape[1])
+    if not len(vecs) == len(origins):
+        raise ValueError("'origins' and 'vecs' need to have the same length")
     if not hasattr(surface, '__call__'):
         raise ValueError("'surface' is not callable")
     if not (assertion.isnumeric(eps) and eps > 0):
@@ -1353,22 +1870,191 @@ def vector_surface_intersection(vec, surface, eps=0.001, max_iter=20):
     if not (isinstance(max_iter, int) and max_iter > 0):
         raise TypeError("'max_iter' needs to be an integer greater zero")
 
-    coord = np.copy(vec.target)
+    sq_lengths = (vecs ** 2).sum(1)
+    if np.any(sq_lengths == 0):
+        raise ValueError("'vecs' need to have a length greater zero")
+
+    coords = (origins + vecs).astype(float)
+    converged = np.zeros(len(coords), dtype=bool)
+    active = np.arange(len(coords))
 
     for i in range(max_iter):
+        if len(active) == 0:
+            break
+        c = coords[active, :]
+        h0 = np.ravel(surface(c))
 
-        h0 = surface([coord])
+        # check residuals
+        done = np.abs(h0 - c[:, -1]) < eps
+        converged[active[done]] = True
+        active = active[~done]
+        c = c[~done, :]
 
-        # check residual
-        if np.abs(h0 - coord[-1]) < eps:
-            break
+        # set new coordinates by projection to the vectors
+        c[:, -1] = h0[~done]
+        o = origins[active, :]
+        v = vecs[active, :]
+        k = ((c - o) * v).sum(1) / sq_lengths[active]
+        coords[active, :] = o + k[:, None] * v
 
-        # set new coordinate
-        coord[-1] = h0
-        k = vec.k([coord])[0]
-        coord = vec(k)
+    return coords, converged
 
-    return coord
+
+def vectors_raster_intersection(origins, vecs, raster, field='z'):
+    """Calculates the intersection points between `n` rays and a digital
+    elevation model by ray marching through the raster cells.
+
+    Parameters
+    ----------
+    origins,vecs : array_like(Number, shape=(n, 3))
+        Origins and directions of `n` rays in a three dimensional space.
+    raster : Grid
+        Two dimensional raster providing a surface height for each cell.
+    field : optional, str
+        Field of `raster` providing the heights. Cells with non-finite
+        heights are ignored.
+
+    Returns
+    -------
+    coords : np.ndarray(Number, shape=(n, 3))
+        Intersection points. If a ray does not hit the surface, the
+        coordinates are set to `np.nan`.
+    hit : np.ndarray(bool, shape=(n))
+        Indicates whether or not a ray hits the surface.
+
+    Notes
+    -----
+    Each cell is treated as a flat surface of constant height. A ray starts
+    at its origin and traverses the cells in the order of intersection. The
+    intersection point is the first point of a ray at or below the surface.
+    Thus, a ray might also hit the side of a cell. The cells are visited for
+    all rays simultaneously. Thus, the number of
+    iterations is limited by the number of cells crossed by a ray, and no
+    interpolation is required.
+
+    See Also
+    --------
+    vectors_surface_intersection
+
+    Examples
+    --------
+
+    >>> from pyoints import (
+    ...     grid,
+    ...     projection,
+    ...     transformation,
+    ... )
+
+    Create a digital elevation model of 4x5 cells.
+
+    >>> T = transformation.matrix(t=[0, 0], s=[1, 2])
+    >>> heights = np.array([
+    ...     [0, 0, 1, 1, 2],
+    ...     [0, 0, 1, 1, 2],
+    ...     [0, 0, 1, 1, 2],
+    ...     [0, 0, 1, 1, np.nan],
+    ... ])
+    >>> raster = grid.Grid(projection.Proj(), np.rec.fromarrays(
+    ...     [heights], names=['z']), T)
+
+    Calculate the intersection points of some rays.
+
+    >>> origins = [
+    ...     (0.5, 1, 5), (2.5, 1, 5), (-1, 7, 4.5), (1, 1, 5), (1, 1, 5)]
+    >>> vecs = [(0, 0, -1), (0, 0, -2), (1, 0, -1), (0, 0, 1), (10, 1, 0)]
+    >>> coords, hit = vectors_raster_intersection(origins, vecs, raster)
+    >>> print_rounded(coords)
+    [[ 0.5  1.   0. ]
+     [ 2.5  1.   1. ]
+     [ 2.5  7.   1. ]
+     [ nan  nan  nan]
+     [ nan  nan  nan]]
+    >>> print(hit)
+    [ True  True  True False False]
+
+    """
+    from .grid import Grid
+
+    origins = assertion.ensure_coords(origins, dim=3)
+    vecs = assertion.ensure_coords(vecs, dim=3)
+    if not len(vecs) == len(origins):
+        raise ValueError("'origins' and 'vecs' need to have the same length")
+    if not (isinstance(raster, Grid) and len(raster.shape) == 2):
+        raise TypeError("'raster' needs to be a two dimensional Grid")
+    if field not in raster.dtype.names:
+        raise ValueError("'raster' has no field '%s'" % field)
+
+    n = len(origins)
+    shape = np.array(raster.shape[::-1])
+    heights = raster[field].astype(float)
+
+    # rays in continuous cell space (x, y), the z axis is kept
+    u0 = raster.t.to_global(origins[:, :2])
+    du = raster.t.to_global(vecs[:, :2]) - raster.t.to_global(
+        np.zeros((n, 2)))
+    z0 = origins[:, 2]
+    dz = vecs[:, 2]
+
+    # clip the rays to the raster extent (slab method)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = 1.0 / du
+        t_a = (0 - u0) * inv
+        t_b = (shape - u0) * inv
+    t_a[du == 0] = -np.inf
+    t_b[du == 0] = np.inf
+    outside = (du == 0) & ((u0 < 0) | (u0 >= shape))
+    t_enter = np.max(np.vstack((np.minimum(t_a, t_b).T, np.zeros(n))), 0)
+    t_leave = np.min(np.maximum(t_a, t_b), 1)
+
+    coords = np.full((n, 3), np.nan)
+    hit = np.zeros(n, dtype=bool)
+    active = np.where((t_enter < t_leave) & ~np.any(outside, 1))[0]
+
+    # initialize the traversal
+    u = u0[active] + t_enter[active, None] * du[active]
+    step = np.sign(du[active]).astype(int)
+    cells = np.floor(u).astype(int)
+    cells = np.minimum(np.maximum(cells, 0), shape - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_delta = np.abs(inv[active])
+        t_max = (cells + (step > 0) - u0[active]) * inv[active]
+    t_max[step == 0] = np.inf
+    t_in = t_enter[active]
+
+    while len(active) > 0:
+        # check for an intersection within the current cells
+        t_out = np.minimum(t_max.min(1), t_leave[active])
+        h = heights[cells[:, 1], cells[:, 0]]
+        z = z0[active]
+        d = dz[active]
+        below = z + t_in * d <= h
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_hit = (h - z) / d
+        cross = (d < 0) & (t_hit >= t_in) & (t_hit <= t_out)
+        is_hit = np.isfinite(h) & (below | cross)
+        t_hit[below] = t_in[below]
+
+        ids = active[is_hit]
+        coords[ids, :] = origins[ids, :] + t_hit[is_hit, None] * vecs[ids, :]
+        hit[ids] = True
+
+        # move to the neighbouring cells
+        axis = np.argmin(t_max, 1)
+        rows = np.arange(len(active))
+        t_in = t_max[rows, axis]
+        cells[rows, axis] += step[rows, axis]
+        t_max[rows, axis] += t_delta[rows, axis]
+
+        keep = ~is_hit & np.isfinite(t_in) & (t_in < t_leave[active])
+        keep = keep & np.all((cells >= 0) & (cells < shape), 1)
+        active = active[keep]
+        cells = cells[keep]
+        step = step[keep]
+        t_delta = t_delta[keep]
+        t_max = t_max[keep]
+        t_in = t_in[keep]
+
+    return coords, hit
 
 
 def vector_plane_intersection(vec, plane):
@@ -63,11 +63,13 @@ def load_tests(loader, tests, ignore):
     tests.addTests(get_tests(pyoints.storage))
     tests.addTests(get_tests(pyoints.assertion))
     tests.addTests(get_tests(pyoints.assign))
+    tests.addTests(get_tests(pyoints.change))
     tests.addTests(get_tests(pyoints.classification))
     tests.addTests(get_tests(pyoints.clustering))
     tests.addTests(get_tests(pyoints.coords))
     tests.addTests(get_tests(pyoints.distance))
     tests.addTests(get_tests(pyoints.extent))
+    tests.addTests(get_tests(pyoints.features))
     tests.addTests(get_tests(pyoints.filters))
     tests.addTests(get_tests(pyoints.fit))
     tests.addTests(get_tests(pyoints.georecords))
@@ -77,8 +79,11 @@ def load_tests(loader, tests, ignore):
     tests.addTests(get_tests(pyoints.misc))
     tests.addTests(get_tests(pyoints.normals))
     tests.addTests(get_tests(pyoints.nptools))
+    tests.addTests(get_tests(pyoints.octree))
     tests.addTests(get_tests(pyoints.polar))
+    tests.addTests(get_tests(pyoints.profiling))
     tests.addTests(get_tests(pyoints.projection))
+    tests.addTests(get_tests(pyoints.ransac))
     tests.addTests(get_tests(pyoints.registration))
     tests.addTests(get_tests(pyoints.smoothing))
     tests.addTests(get_tests(pyoints.surface))